@@ -0,0 +1,21 @@
+#!/usr/bin/python3
+# Boards from 3x3 to 16x16 rooms: building the topology of the layout, then
+# for a game on it the move options of every position and the rendering of
+# the board. Every one of them should grow linearly with the number of rooms.
+from bench_utils import *
+
+from utils import *
+from gameboard import *
+
+REPEAT = 20
+
+logger = Logger(level=LOG_OFF)
+print("%-6s %8s %14s %14s %14s" % ("board","rooms","build (us)","options (us)","render (us)"))
+for dimension in [3,4,5,6,8,10,12,14,16]:
+	layout = getGridLayout(dimension)
+	build = timeit(lambda: BoardTopology(layout),REPEAT) / REPEAT
+	board = Gameboard(logger,getTopology(layout))
+	positions = board.rooms + board.passageways
+	options = timeit(lambda: [board.getChoices(position) for position in positions],REPEAT) / REPEAT
+	render = timeit(lambda: str(board),REPEAT) / REPEAT
+	print("%-6s %8d %14.1f %14.1f %14.1f" % ("%dx%d" % (dimension,dimension),dimension ** 2,build * 1e6,options * 1e6,render * 1e6))
@@ -0,0 +1,24 @@
+#!/usr/bin/python3
+# Polls the global payloads of a game the way a server with many
+# connections does: one encoded payload per connection per cycle
+from bench_utils import *
+
+from utils import encodePayload
+
+CYCLES = 2000
+CONNECTIONS = 10 # 6 players plus spectators
+
+g = startedGame(6)
+
+def uncached():
+	for idx in range(0,CONNECTIONS):
+		encodePayload(g.buildGamestate())
+		encodePayload(g.gameboard.getGameboard())
+
+def cached():
+	for idx in range(0,CONNECTIONS):
+		g.getGamestateEncoded()
+		g.getGameboardEncoded()
+
+report("build and encode per connection",CYCLES * CONNECTIONS,timeit(uncached,CYCLES))
+report("cached encoded payloads",CYCLES * CONNECTIONS,timeit(cached,CYCLES))
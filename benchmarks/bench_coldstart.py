@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+# Cold start of a fresh worker process: the import time of the backend
+# (python -X importtime) and the time to the first Game, then to the
+# first cycle sent to its players. Every run is a new interpreter.
+from bench_utils import *
+
+import statistics
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)),'..')
+RUNS = 20
+
+# Run in a new interpreter, prints the milliseconds spent on each step
+# and the slow to import modules that got loaded along the way
+CHILD = """
+import sys, time
+start = time.perf_counter()
+import game
+imported = time.perf_counter()
+g = game.Game(game.Logger(level=game.LOG_OFF),seed=1)
+created = time.perf_counter()
+loaded = [m for m in ["json","re","threading","queue","random"] if m in sys.modules]
+for idx in range(0,4):
+	g.addPlayer("player%d" % idx)
+	g.selectSuspect("player%d" % idx,game.SUSPECTS[idx])
+g.startGame()
+g.getCycle()
+cycled = time.perf_counter()
+print((imported - start) * 1e3,(created - imported) * 1e3,(cycled - created) * 1e3,",".join(loaded))
+"""
+
+# Returns the wall time of running the arguments in a new interpreter,
+# along with its stdout and stderr
+def run(args):
+	start = time.perf_counter()
+	done = subprocess.run([sys.executable] + args,cwd=ROOT,capture_output=True,text=True)
+	return time.perf_counter() - start, done.stdout, done.stderr
+
+# Returns a dictionary module -> (self, cumulative) microseconds, from
+# the report of python -X importtime
+def importTimes(stderr):
+	ret = {}
+	for line in stderr.splitlines():
+		if line.startswith("import time:") and "|" in line and "self" not in line:
+			own, total, name = line[len("import time:"):].split("|")
+			ret[name.strip()] = (int(own),int(total))
+	return ret
+
+run(["-c","import game"]) # compiles the .pyc files
+
+bare, steps, walls, imports = [], [], [], []
+for idx in range(0,RUNS):
+	bare.append(run(["-c","pass"])[0] * 1e3)
+	elapsed, out, err = run(["-c",CHILD])
+	walls.append(elapsed * 1e3)
+	steps.append(out.split())
+	imports.append(importTimes(run(["-X","importtime","-c","import game"])[2]))
+
+print("%-40s %8.2f ms" % ("interpreter start (python -c pass)",statistics.median(bare)))
+print("%-40s %8.2f ms" % ("worker to first cycle (wall)",statistics.median(walls)))
+print("%-40s %8.2f ms" % ("import game",statistics.median(float(s[0]) for s in steps)))
+print("%-40s %8.2f ms" % ("first Game()",statistics.median(float(s[1]) for s in steps)))
+print("%-40s %8.2f ms" % ("4 players, startGame, first getCycle",statistics.median(float(s[2]) for s in steps)))
+print("%-40s %8s" % ("slow modules loaded by the first Game",steps[-1][3] if len(steps[-1]) > 3 else "none"))
+print("import time of the backend modules, median self / cumulative:")
+names = [name for name in imports[-1] if name in ("game","utils","globals","gameboard","players","cards","journal","snapshot","instruments")]
+for name in sorted(names,key=lambda name: -statistics.median(times[name][1] for times in imports)):
+	own = statistics.median(times[name][0] for times in imports)
+	total = statistics.median(times[name][1] for times in imports)
+	print("  %-12s %8.0f us %8.0f us" % (name,own,total))
@@ -0,0 +1,22 @@
+#!/usr/bin/python3
+# Compares the nine-call server loop against a single getCycle()
+from bench_utils import *
+
+CYCLES = 2000
+
+def nineCalls(g):
+	g.getGamestate()
+	g.getGameboard()
+	g.getPlayerstates()
+	g.getMoveOptions()
+	g.getSuggestionOptions()
+	g.getAccusationOptions()
+	g.getChecklists()
+	g.getCardlists()
+	g.getMessages()
+
+for numPlayers in [2,4,6]:
+	g = startedGame(numPlayers)
+	report("nine calls (%d players)" % numPlayers,CYCLES,timeit(lambda: nineCalls(g),CYCLES))
+	report("getCycle (%d players)" % numPlayers,CYCLES,timeit(lambda: g.getCycle(),CYCLES))
+	report("getCycle deltaOnly (%d players)" % numPlayers,CYCLES,timeit(lambda: g.getCycle(deltaOnly=True),CYCLES))
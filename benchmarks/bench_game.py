@@ -0,0 +1,223 @@
+#!/usr/bin/python3
+# Times every public sender and processor of Game at 2 to 6 players in
+# every phase of the game, and checks the results against the baselines.
+#   python3 bench_game.py                    run, write results.json, compare
+#   python3 bench_game.py --update-baseline  run and store the baselines
+#   python3 bench_game.py --instrument       time the instrumented methods
+# Exits with 1 if a method got slower than its baseline by more than the
+# threshold.
+from bench_utils import *
+
+import argparse
+import json
+import statistics
+
+from game import Game
+from globals import *
+from utils import Logger
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS = os.path.join(HERE,"results.json")
+BASELINES = os.path.join(HERE,"baselines.json")
+THRESHOLD = 0.5		# allowed slowdown against the baseline
+SLACK = 1.0			# allowed slowdown in microseconds, below the timer jitter
+ROUNDS = 10
+PASSES = 5			# the machine slows down in bursts, every method is
+					# timed once per pass and keeps its best pass
+SENDER_REPS = 2000
+PROCESSOR_REPS = 500
+PLAYER_COUNTS = [2,3,4,5,6]
+PHASES = ["INITIAL","STARTED","SUGGESTION"]
+
+QUIET = Logger(level=LOG_OFF)
+
+# Returns a game in the phase:
+# - INITIAL    : every player but the last has a suspect
+# - STARTED    : the game started, the first player has the turn
+# - SUGGESTION : the player with the turn must make a suggestion
+def phaseGame(phase,numPlayers):
+	g = Game(QUIET,seed=numPlayers)
+	for idx in range(0,numPlayers):
+		g.addPlayer("player%d" % idx)
+		if phase != "INITIAL" or idx < numPlayers - 1:
+			g.selectSuspect("player%d" % idx,SUSPECTS[idx])
+	if phase == "INITIAL":
+		return g
+	g.startGame()
+	while phase == "SUGGESTION" and g.playerlist.getCurrentPlayer().state != PLAYER_SUGGEST:
+		player = g.playerlist.getCurrentPlayer()
+		options = g.gameboard.getMoveOptions(player)
+		rooms = [option for option in options if option.isRoom()]
+		if len(rooms) > 0:
+			g.selectMove(player.getID(),rooms[0].getName())
+		elif len(options) > 0:
+			g.selectMove(player.getID(),options[0].getName())
+		else:
+			g.passTurn(player.getID())
+	return g
+
+# Returns the id of the player with the turn
+def current(g):
+	return g.playerlist.getCurrentPlayer().getID()
+
+# Returns the name of a move the player with the turn can make
+def anyMove(g):
+	return g.gameboard.getMoveOptions(g.playerlist.getCurrentPlayer())[0].getName()
+
+# Proposes a suggestion on behalf of the player with the turn, returns
+# the arguments disproving it: the first card of the defender that
+# counters it, if any
+def suggested(g):
+	g.proposeSuggestion(current(g),"Colonel Mustard","Rope")
+	defender = g.playerlist.getCurrentPlayer()
+	cards = g.cardmanager.catalog.getNames(g.cardmanager.getHandMask(defender) & g.suggestion.mask)
+	if len(cards) > 0:
+		return (defender.getID(),cards[0],None,False)
+	return (defender.getID(),None,None,True)
+
+# Returns the arguments of the last player picking a suspect
+def lastSuspect(g):
+	return (g.playerlist.getPlayers()[-1].getID(),g.playerlist.getAvailableCharacters()[0])
+
+# Lets the last player pick a suspect, so that the game may start
+def ready(g):
+	g.selectSuspect(*lastSuspect(g))
+	return ()
+
+# Every processor of each phase, along with a function preparing a fresh
+# game of the phase and returning the arguments of the call
+PROCESSORS = {
+	"INITIAL" : {
+		"addPlayer"          : lambda g: ("newcomer",),
+		"selectSuspect"      : lastSuspect,
+		"startGame"          : ready,
+		"removePlayer"       : lambda g: ("player0",)
+	},
+	"STARTED" : {
+		"selectMove"         : lambda g: (current(g),anyMove(g)),
+		"passTurn"           : lambda g: (current(g),),
+		"startSuggestion"    : lambda g: (current(g),),
+		"startAccusation"    : lambda g: (current(g),),
+		"proposeAccusation"  : lambda g: (current(g),"Colonel Mustard","Rope","Hall"),
+		"removePlayer"       : lambda g: ("player1",)
+	},
+	"SUGGESTION" : {
+		"proposeSuggestion"  : lambda g: (current(g),"Colonel Mustard","Rope"),
+		"disproveSuggestion" : suggested,
+		"proposeAccusation"  : lambda g: (current(g),"Colonel Mustard","Rope","Hall")
+	}
+}
+
+SENDERS = ["getGamestate","getGameboard","getPlayerstates","getMoveOptions","getSuggestionOptions",
+	"getAccusationOptions","getChecklists","getCardlists","getMessages","getCycle"]
+
+# Returns the time of a call in microseconds, the best mean over a few
+# rounds of back to back calls
+def timeRepeated(call,reps):
+	best = None
+	for idx in range(0,ROUNDS):
+		elapsed = timeit(call,max(1,reps // ROUNDS))
+		if best == None or elapsed < best:
+			best = elapsed
+	return best / max(1,reps // ROUNDS) * 1e6
+
+# Returns the time of a call in microseconds, timing every call on its
+# own so that the untimed <prepare> may run in between. The fastest
+# tenth of the calls is the least disturbed by the rest of the machine,
+# its slowest call is the result.
+def timeCalls(prepare,call,reps):
+	samples = []
+	for idx in range(0,reps):
+		args = prepare()
+		start = time.perf_counter()
+		call(*args)
+		samples.append(time.perf_counter() - start)
+	samples.sort()
+	return samples[len(samples) // 10] * 1e6
+
+# Returns a game restored from the snapshot, instrumented if asked
+def restored(snapshot,instrument):
+	g = Game.restore(snapshot,QUIET)
+	if instrument:
+		g.enableInstruments()
+	return g
+
+# Returns a dictionary "phase/players/method" -> microseconds
+def runSuite(senderReps=SENDER_REPS,processorReps=PROCESSOR_REPS,passes=PASSES,instrument=False):
+	results = {}
+	for idx in range(0,passes):
+		for key, value in runPass(senderReps // passes,processorReps // passes,instrument).items():
+			results[key] = min(value,results.get(key,value))
+	return results
+
+# Times every method once, see runSuite()
+def runPass(senderReps,processorReps,instrument):
+	results = {}
+	for phase in PHASES:
+		for numPlayers in PLAYER_COUNTS:
+			snapshot = phaseGame(phase,numPlayers).snapshot()
+
+			# Senders are polled over and over on the same game
+			g = restored(snapshot,instrument)
+			for method in SENDERS:
+				results["%s/%d/%s" % (phase,numPlayers,method)] = timeRepeated(getattr(g,method),senderReps)
+
+			# Processors change the game, every call gets a fresh one
+			for method in sorted(PROCESSORS[phase].keys()):
+				def prepare():
+					g = restored(snapshot,instrument)
+					return (g,) + tuple(PROCESSORS[phase][method](g))
+				def call(g,*args):
+					getattr(g,method)(*args)
+				results["%s/%d/%s" % (phase,numPlayers,method)] = timeCalls(prepare,call,processorReps)
+	return results
+
+# Returns the median ratio of the results to their baselines: how much
+# slower the machine is than when the baselines were taken, assuming
+# most methods did not change
+def machineFactor(results,baselines):
+	ratios = [results[key] / baselines[key] for key in results if baselines.get(key,0) > 0]
+	return statistics.median(ratios) if len(ratios) > 0 else 1.0
+
+# Returns the list of (key, result, baseline) that regressed, the
+# baselines are scaled by <factor> first
+def compare(results,baselines,threshold,slack=SLACK,factor=1.0):
+	ret = []
+	for key in sorted(results.keys()):
+		baseline = baselines.get(key)
+		if baseline != None and results[key] > baseline * factor * (1.0 + threshold) + slack:
+			ret.append((key,results[key],baseline))
+	return ret
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Times every public method of Game")
+	parser.add_argument("--output",default=RESULTS,help="where the JSON results are written")
+	parser.add_argument("--baselines",default=BASELINES)
+	parser.add_argument("--threshold",type=float,default=THRESHOLD,help="allowed slowdown, 0.5 is 50%%")
+	parser.add_argument("--update-baseline",action="store_true",help="store the results as the new baselines")
+	parser.add_argument("--quick",action="store_true",help="a tenth of the repetitions")
+	parser.add_argument("--instrument",action="store_true",help="turn on the instruments of every game")
+	parser.add_argument("--absolute",action="store_true",help="do not scale the baselines to the speed of the machine")
+	args = parser.parse_args()
+
+	scale = 10 if args.quick else 1
+	results = runSuite(SENDER_REPS // scale,PROCESSOR_REPS // scale,instrument=args.instrument)
+	for key in sorted(results.keys()):
+		print("%-45s %10.2f us/op" % (key,results[key]))
+	with open(args.output,"w") as f:
+		json.dump({"unit":"us/op","results":results},f,indent=1,sort_keys=True)
+
+	if args.update_baseline:
+		with open(args.baselines,"w") as f:
+			json.dump(results,f,indent=1,sort_keys=True)
+		print("baselines updated: %s" % args.baselines)
+	elif os.path.exists(args.baselines):
+		with open(args.baselines) as f:
+			baselines = json.load(f)
+		factor = 1.0 if args.absolute else machineFactor(results,baselines)
+		print("machine factor: %.2f" % factor)
+		regressions = compare(results,baselines,args.threshold,SLACK,factor)
+		for key, result, baseline in regressions:
+			print("REGRESSION %-45s %10.2f us/op, baseline %.2f" % (key,result,baseline))
+		print("%d regressions over %d methods (threshold %d%%)" % (len(regressions),len(results),args.threshold * 100))
+		sys.exit(1 if len(regressions) > 0 else 0)
@@ -0,0 +1,21 @@
+#!/usr/bin/python3
+# Overhead of the instruments on the public Game methods
+from bench_utils import *
+
+from globals import *
+from utils import Logger
+
+CALLS = 20000
+
+# Two games in the same state, one instrumented
+plain = startedGame(4,Logger(level=LOG_OFF),seed=1)
+instrumented = startedGame(4,Logger(level=LOG_OFF),seed=1)
+instrumented.enableInstruments()
+
+for method in ["getGamestate","getMoveOptions","getCycle"]:
+	for label, g in [("plain",plain),("instrumented",instrumented)]:
+		report("%s %s" % (method,label),CALLS,timeit(getattr(g,method),CALLS))
+
+# A processor rejecting the call, which goes through handleGameException
+for label, g in [("plain",plain),("instrumented",instrumented)]:
+	report("passTurn (rejected) %s" % label,CALLS,timeit(lambda: g.passTurn("nobody"),CALLS))
@@ -0,0 +1,27 @@
+#!/usr/bin/python3
+# Per-cycle cost of logging, switched off versus at the debug level
+from bench_utils import *
+
+from globals import *
+from utils import Logger, getLogSink
+
+CYCLES = 2000
+
+# The nine-call loop logs for every player on every cycle
+def nineCalls(g):
+	g.getGamestate()
+	g.getGameboard()
+	g.getPlayerstates()
+	g.getMoveOptions()
+	g.getSuggestionOptions()
+	g.getAccusationOptions()
+	g.getChecklists()
+	g.getCardlists()
+	g.getMessages()
+
+for label, level in [("off",LOG_OFF),("info",LOG_INFO),("debug",LOG_DEBUG)]:
+	for numPlayers in [2,6]:
+		g = startedGame(numPlayers,Logger(level=level))
+		elapsed = timeit(lambda: nineCalls(g),CYCLES)
+		report("nine calls, logging %s (%d players)" % (label,numPlayers),CYCLES,elapsed)
+		getLogSink().flush()
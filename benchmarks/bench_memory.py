@@ -0,0 +1,38 @@
+#!/usr/bin/python3
+# Memory held by idle games, measured with tracemalloc
+from bench_utils import *
+
+import gc
+import tracemalloc
+
+from globals import *
+from utils import Logger
+
+GAMES = 500
+
+# Returns the bytes allocated per game by <build>, and the top allocation
+# sites, after the games are built and garbage is collected
+def bytesPerGame(build):
+	games = []
+	gc.collect()
+	tracemalloc.start(1)
+	before = tracemalloc.take_snapshot()
+	for idx in range(0,GAMES):
+		games.append(build(idx))
+	gc.collect()
+	after = tracemalloc.take_snapshot()
+	tracemalloc.stop()
+	stats = after.compare_to(before,"lineno")
+	return sum(stat.size_diff for stat in stats) / float(GAMES), stats[:8]
+
+# Builds the shared topology and catalogs before measuring
+startedGame(2,Logger(level=LOG_OFF))
+
+logger = Logger(level=LOG_OFF)
+for numPlayers in [2,6]:
+	size, top = bytesPerGame(lambda idx: startedGame(numPlayers,logger,seed=idx))
+	print("started %d player game: %8.0f bytes" % (numPlayers,size))
+print("top allocations of a 6 player game:")
+for stat in top:
+	frame = stat.traceback[0]
+	print("  %8.0f bytes  %s:%d" % (stat.size_diff / float(GAMES),os.path.basename(frame.filename),frame.lineno))
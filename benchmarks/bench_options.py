@@ -0,0 +1,18 @@
+#!/usr/bin/python3
+# Builds the option menus of every player, the way each cycle does
+from bench_utils import *
+
+from globals import *
+
+CYCLES = 5000
+
+g = startedGame(6)
+players = g.playerlist.getPlayers()
+room = g.gameboard.getRoom("Kitchen")
+
+def menus():
+	for player in players:
+		g.buildSuggestionOptions(player,room)
+		g.buildAccusationOptions(player)
+
+report("option menus (6 players)",CYCLES,timeit(menus,CYCLES))
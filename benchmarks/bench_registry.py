@@ -0,0 +1,36 @@
+#!/usr/bin/python3
+# Throughput of the GameRegistry at 10k live games
+from bench_utils import *
+
+from registry import GameRegistry
+
+LIVE_GAMES = 10000
+
+registry = GameRegistry()
+
+# Create
+ids = []
+elapsed = timeit(lambda: ids.append(registry.createGame()),LIVE_GAMES)
+report("createGame",LIVE_GAMES,elapsed)
+
+# Lookup
+def lookup():
+	for gameId in ids:
+		registry.getGame(gameId)
+elapsed = timeit(lookup)
+report("getGame (%d live)" % len(registry),LIVE_GAMES,elapsed)
+
+# Dispatch a processor and a sender to every game
+def dispatch():
+	for gameId in ids:
+		registry.dispatch(gameId,"addPlayer","Bob")
+		registry.dispatch(gameId,"getGamestate")
+elapsed = timeit(dispatch)
+report("dispatch addPlayer+getGamestate",LIVE_GAMES * 2,elapsed)
+
+# Retire
+def retire():
+	for gameId in ids:
+		registry.retireGame(gameId)
+elapsed = timeit(retire)
+report("retireGame",LIVE_GAMES,elapsed)
@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+# Replays full games from their journals
+from bench_utils import *
+
+from game import Game
+from globals import *
+from journal import Journal
+from utils import Logger
+
+GAMES = 500
+
+journals = []
+actions = 0
+for seed in range(0,GAMES):
+	g = playRandomGame(startedGame(4,Logger(level=LOG_OFF),seed),seed)
+	journals.append(g.journal.encode())
+	actions += len(g.journal)
+print("%d games, %.1f actions per game, %.0f bytes per journal" % (GAMES,actions / float(GAMES),sum(map(len,journals)) / float(GAMES)))
+
+decoded = []
+report("Journal.decode",GAMES,timeit(lambda: decoded.extend(Journal.decode(data) for data in journals)))
+
+# The replayed games are dropped right away, keeping them all would time
+# the garbage collector too
+def replayAll(messages):
+	for journal in decoded:
+		Game.replay(journal,messages=messages)
+def decodeReplayAll():
+	for data in journals:
+		Game.replay(Journal.decode(data),messages=False)
+report("Game.replay (full games)",GAMES,timeit(lambda: replayAll(True)))
+report("Game.replay (no messages)",GAMES,timeit(lambda: replayAll(False)))
+report("decode + replay (no messages)",GAMES,timeit(decodeReplayAll))
+report("Journal.encode",GAMES,timeit(lambda: [journal.encode() for journal in decoded]))
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+# Route planning on boards from 3x3 to 16x16 rooms: building the distance
+# table of the topology, then planning the next move between random
+# positions with some passageways occupied. A breadth first search of
+# the whole board around the occupied passageways is the reference.
+from bench_utils import *
+
+import random
+
+from gameboard import *
+
+QUERIES = 2000
+OCCUPIED = 6
+
+print("%-6s %10s %14s %14s %14s" % ("board","positions","table (ms)","plan (us)","full bfs (us)"))
+for dimension in [3,5,8,12,16]:
+	topology = BoardTopology(getGridLayout(dimension))
+	table = timeit(topology.getDistances)
+
+	rng = random.Random(dimension)
+	positions = topology.rooms + topology.passageways
+	queries = []
+	for idx in range(0,QUERIES):
+		occupants = [()] * len(topology.positions)
+		for pway in rng.sample(topology.passageways,OCCUPIED):
+			occupants[pway.id] = ("someone",)
+		queries.append((rng.choice(positions),rng.choice(topology.rooms),occupants))
+
+	plan = timeit(lambda: [topology.planRoute(start,target,occupants) for start, target, occupants in queries])
+
+	# Distances from the start to everything around the occupied
+	# passageways, the work of a planner without the table
+	def fullSearch(start,occupants):
+		levels = {start.id : 0}
+		frontier = [start]
+		while len(frontier) > 0:
+			following = []
+			for position in frontier:
+				for neighbour in topology.neighbours[position.id]:
+					if neighbour.id not in levels and not (neighbour.isPassageWay() and len(occupants[neighbour.id]) > 0):
+						levels[neighbour.id] = levels[position.id] + 1
+						following.append(neighbour)
+			frontier = following
+		return levels
+	bfs = timeit(lambda: [fullSearch(start,occupants) for start, target, occupants in queries])
+
+	print("%-6s %10d %14.2f %14.2f %14.2f" % ("%dx%d" % (dimension,dimension),len(positions),table * 1e3,
+		plan / QUERIES * 1e6,bfs / QUERIES * 1e6))
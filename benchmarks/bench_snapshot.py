@@ -0,0 +1,23 @@
+#!/usr/bin/python3
+# Takes and restores snapshots of games at every stage of play
+from bench_utils import *
+
+from game import Game
+from utils import Logger
+from globals import LOG_OFF
+
+GAMES = 200
+
+# Snapshot every game after a random number of actions
+snapshots = []
+games = []
+for idx in range(0,GAMES):
+	g = startedGame(3 + idx % 4,Logger(level=LOG_OFF),seed=idx)
+	playRandomGame(g,idx,maxActions=idx % 60)
+	games.append(g)
+	snapshots.append(g.snapshot())
+print("%d games, %.0f bytes per snapshot (max %d)" % (GAMES,sum(map(len,snapshots)) / float(GAMES),max(map(len,snapshots))))
+
+report("Game.snapshot",GAMES,timeit(lambda: [g.snapshot() for g in games]))
+logger = Logger(level=LOG_OFF)
+report("Game.restore",GAMES,timeit(lambda: [Game.restore(data,logger) for data in snapshots]))
@@ -0,0 +1,63 @@
+# this is not a benchmark
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+
+# Runs func <repeat> times and returns the elapsed wall time in seconds
+def timeit(func,repeat=1):
+	start = time.perf_counter()
+	for idx in range(0,repeat):
+		func()
+	return time.perf_counter() - start
+
+# Prints a single result line: label, operation count, throughput and latency
+def report(label,count,elapsed):
+	rate = count / elapsed if elapsed > 0 else float("inf")
+	usec = (elapsed / count) * 1e6 if count > 0 else 0.0
+	print("%-40s %10d ops %14.0f ops/s %10.2f us/op" % (label,count,rate,usec))
+
+# Returns a Game with <numPlayers> players that has been started
+def startedGame(numPlayers,logger=None,seed=None):
+	from game import Game
+	from globals import SUSPECTS
+	g = Game(logger,seed)
+	for idx in range(0,numPlayers):
+		g.addPlayer("player%d" % idx)
+		g.selectSuspect("player%d" % idx,SUSPECTS[idx])
+	g.startGame()
+	return g
+
+# Plays a started game with random legal actions until it ends or
+# <maxActions> actions were taken. Returns the game.
+def playRandomGame(g,seed,maxActions=1000):
+	import random
+	from globals import SUSPECTS, WEAPONS, STATE_END, PLAYER_DEFEND, PLAYER_SUGGEST
+	rng = random.Random(seed)
+	casefile = g.cardmanager.casefile
+	for step in range(0,maxActions):
+		if g.state == STATE_END:
+			break
+		player = g.playerlist.getCurrentPlayer()
+		playerId = player.getID()
+		if player.state == PLAYER_DEFEND:
+			cards = g.cardmanager.catalog.getNames(g.cardmanager.getHandMask(player) & g.suggestion.mask)
+			if len(cards) > 0:
+				g.disproveSuggestion(playerId,rng.choice(cards),None,False)
+			else:
+				g.disproveSuggestion(playerId,None,None,True)
+		elif player.state == PLAYER_SUGGEST:
+			g.proposeSuggestion(playerId,rng.choice(SUSPECTS),rng.choice(WEAPONS))
+		elif rng.random() < 0.02:
+			if rng.random() < 0.5:
+				g.proposeAccusation(playerId,casefile.suspectCard.name,casefile.weaponCard.name,casefile.roomCard.name)
+			else:
+				g.proposeAccusation(playerId,rng.choice(SUSPECTS),rng.choice(WEAPONS),casefile.roomCard.name)
+		else:
+			options = g.gameboard.getMoveOptions(player)
+			if len(options) > 0:
+				g.selectMove(playerId,rng.choice(options).getName())
+			else:
+				g.passTurn(playerId)
+	return g
@@ -12,20 +12,120 @@
 
 from utils import *
 from globals import *
-import random
-from datetime import datetime
-random.seed(datetime.now())	
+import os
+
+# Returns a fresh 64 bit seed for a game's random number generator
+def newSeed():
+	return int.from_bytes(os.urandom(8),"big")
+
+# Numbers every card of the game and maps sets of cards to int bitmasks.
+# Card <id> is bit (1 << id) of a mask, ids follow the order of CARDS
+# (suspects, rooms, weapons). Hands, checklists, the case file and
+# suggestions are all held as masks, the string lists sent to the
+# clients are derived from them.
+# Names that are not in the catalog map to the empty mask.
+class CardCatalog:
+	def __init__(self,suspects=SUSPECTS,rooms=ROOMS,weapons=WEAPONS):
+		self.names = list(suspects) + list(rooms) + list(weapons)
+		self.ids = {}			# name -> id
+		for idx in range(0,len(self.names)):
+			self.ids[self.names[idx]] = idx
+		self.suspectMask = self.getMask(suspects)
+		self.roomMask = self.getMask(rooms)
+		self.weaponMask = self.getMask(weapons)
+		self.allMask = (1 << len(self.names)) - 1
+		self.accusationMenu = None	# see getAccusationMenu()
+		self.suggestionMenus = {}	# room name -> suggestion menu
+
+	# Returns the bit of the card, 0 if the name is not a card
+	def getBit(self,name):
+		idx = self.ids.get(name)
+		return 0 if idx == None else (1 << idx)
+
+	# Returns the mask of a list of card names
+	def getMask(self,names):
+		mask = 0
+		for name in names:
+			mask |= self.getBit(name)
+		return mask
+
+	# Returns the mask of a suspect, weapon and room triple. A name that
+	# is not a card of its category is left out of the mask.
+	def getTripleMask(self,suspect,weapon,room):
+		return (self.getBit(suspect) & self.suspectMask) \
+			| (self.getBit(weapon) & self.weaponMask) \
+			| (self.getBit(room) & self.roomMask)
+
+	# Returns the list of card names in the mask, in catalog order
+	def getNames(self,mask):
+		ret = []
+		while mask:
+			low = mask & -mask
+			ret.append(self.names[low.bit_length() - 1])
+			mask ^= low
+		return ret
+
+	# Returns a dictionary of the suspects, weapons and rooms in the mask
+	def getChecklist(self,mask):
+		return {
+			"suspects" : self.getNames(mask & self.suspectMask),
+			"weapons"  : self.getNames(mask & self.weaponMask),
+			"rooms"    : self.getNames(mask & self.roomMask)
+		}
+
+	# Returns the accusation menu, every suspect, weapon and room.
+	# The menu is shared, see FrozenDict.
+	def getAccusationMenu(self):
+		if self.accusationMenu == None:
+			self.accusationMenu = self.buildMenu(self.roomMask)
+		return self.accusationMenu
+
+	# Returns the suggestion menu of a player in the room, every suspect
+	# and weapon but only that room. The menu is shared, see FrozenDict.
+	def getSuggestionMenu(self,room):
+		menu = self.suggestionMenus.get(room)
+		if menu == None:
+			menu = self.buildMenu(self.getBit(room))
+			self.suggestionMenus[room] = menu
+		return menu
+
+	def buildMenu(self,roomMask):
+		return FrozenDict([
+			("suspects" , tuple(self.getNames(self.suspectMask))),
+			("weapons"  , tuple(self.getNames(self.weaponMask))),
+			("rooms"    , tuple(self.getNames(roomMask)))
+		])
+
+# Returns the number of cards in a mask
+def countCards(mask):
+	return bin(mask).count("1")
+
+# The catalog of the default CARDS
+DEFAULT_CATALOG = None
+
+# Returns the catalog of the default CARDS, building it on first use
+def getCardCatalog():
+	global DEFAULT_CATALOG
+	if DEFAULT_CATALOG == None:
+		DEFAULT_CATALOG = CardCatalog()
+	return DEFAULT_CATALOG
 
 # Defines a Card object
 # A card may either be a:
 # - suspect
 # - room
 # - weapon
+# If an owner index (owner -> list of Cards) is given, the card keeps it
+# up to date when it is assigned.
 class Card:
-	def __init__(self,name,logger):
-		self.logger = logger
+	__slots__ = ("name","owner","hands","catalog","bit")
+
+	def __init__(self,name,hands=None,catalog=None):
 		self.name = name
 		self.owner = CARD_UNASSIGNED # Note this is assigned to a player or casefile object
+		self.hands = hands
+		self.catalog = getCardCatalog() if catalog == None else catalog
+		self.bit = self.catalog.getBit(name)
 	
 	def __str__(self):
 		return str(self.name)
@@ -38,6 +138,11 @@ class Card:
 			raise BackException("you cannot reassign cards in this game")
 		else:
 			self.owner = owner
+			if self.hands != None:
+				if owner in self.hands:
+					self.hands[owner].append(self)
+				else:
+					self.hands[owner] = [self]
 
 	def getOwner(self):
 		return self.owner
@@ -47,15 +152,15 @@ class Card:
 
 	# Returns True if the card is SUSPECT type
 	def isSuspect(self):
-		return self.name in SUSPECTS
+		return (self.bit & self.catalog.suspectMask) != 0
 	
 	# Returns True if the card is WEAPON type
 	def isWeapon(self):
-		return self.name in WEAPONS
+		return (self.bit & self.catalog.weaponMask) != 0
 		
 	# Returns True if the card is ROOM type
 	def isRoom(self):
-		return self.name in ROOMS
+		return (self.bit & self.catalog.roomMask) != 0
 		
 
 # Manages all cards that are held in the game
@@ -63,20 +168,30 @@ class Card:
 # card is stored in this object.
 # There shall always be one CardManager in a Game
 # instance.
-# Cards are stored in dictionary that contain:
-# key: the name of the card
-# value: either
-#     - the <playerId> of the person holding the card
+# Every card knows its owner, either:
+#     - the Player holding the card
+#     - the CaseFile
 #     - "UNASSIGNED"
-#     - "CASE_FILE"
+# The cards are also indexed by owner, so a hand is found without
+# scanning the deck. Hands never change once the game has started.
 #
 class CardManager:
 	# Generates the cards based on the global CARDS 
 	# All card are unassigned initially
-	def __init__(self,logger):
+	# All the randomness of the game comes from <rng>, a random.Random
+	# owned by the game, so that a game can be replayed from its seed.
+	# Given a <seed> instead, the random.Random is only created when the
+	# cards are dealt (see getRng()), a game that never starts has none.
+	def __init__(self,logger,catalog=None,rng=None,seed=None):
 		self.casefile = None
 		self.logger = logger
+		self.rng = rng
+		self.seed = newSeed() if seed == None else seed
+		self.catalog = getCardCatalog() if catalog == None else catalog
 		self.cards = []
+		self.hands = {}			# owner -> list of Cards, maintained by Card.assignTo()
+		self.handNames = {}		# owner -> list of card names, built from hands on demand
+		self.handMasks = {}		# owner -> mask of the hand, built from hands on demand
 		self.generateCards()
 	
 	def __str__(self):
@@ -89,17 +204,42 @@ class CardManager:
 		return ret
 	
 	# Returns a list of cards that are assigned to the player
+	# The list belongs to the index and must not be modified
 	def getCards(self,player):
-		playerCards = []
-		for card in self.cards:
-			if card.getOwner() == player:
-				playerCards.append(card)
-		return playerCards
-	
+		return self.hands.get(player,[])
+
+	# Returns a list of the names of the cards assigned to the player
+	# The list is cached and must not be modified
+	def getCardNames(self,player):
+		cards = self.hands.get(player,[])
+		names = self.handNames.get(player)
+		if names == None or len(names) != len(cards):
+			names = [card.getName() for card in cards]
+			self.handNames[player] = names
+		return names
+
+	# Returns the mask of the cards assigned to the player (see CardCatalog)
+	def getHandMask(self,player):
+		cards = self.hands.get(player,[])
+		mask = self.handMasks.get(player)
+		if mask == None or countCards(mask) != len(cards):
+			mask = 0
+			for card in cards:
+				mask |= card.bit
+			self.handMasks[player] = mask
+		return mask
+
+	# Returns the random number generator, seeding it on first use
+	def getRng(self):
+		if self.rng == None:
+			import random
+			self.rng = random.Random(self.seed)
+		return self.rng
+
 	# Generates the deck of cards set to their initial values
 	def generateCards(self):
-		for name in CARDS:
-			self.cards.append(Card(name,self.logger))
+		for name in self.catalog.names:
+			self.cards.append(Card(name,self.hands,self.catalog))
 	
 	# Picks out 3 random cards from the deck from each category
 	# to load up the case file
@@ -121,15 +261,16 @@ class CardManager:
 				room_pool.append(card)
 		
 		# TODO probably want to validate the randomness of this
-		candidate_suspect = suspect_pool[random.randrange(len(suspect_pool))]
-		candidate_weapon = weapon_pool[random.randrange(len(weapon_pool))]
-		candidate_room = room_pool[random.randrange(len(room_pool))]
+		rng = self.getRng()
+		candidate_suspect = suspect_pool[rng.randrange(len(suspect_pool))]
+		candidate_weapon = weapon_pool[rng.randrange(len(weapon_pool))]
+		candidate_room = room_pool[rng.randrange(len(room_pool))]
 		
 		if (candidate_suspect == None) or (candidate_weapon == None) or (candidate_room == None):
 			raise BackException("could not load the case file... might be another issue")
 		else:
-			self.logger.log("loading up the case file with: %s, %s, %s" % (str(candidate_suspect),str(candidate_weapon),str(candidate_room)))
-			self.casefile = CaseFile(candidate_suspect,candidate_weapon,candidate_room,self.logger)
+			self.logger.info("loading up the case file with: %s, %s, %s",candidate_suspect,candidate_weapon,candidate_room)
+			self.casefile = CaseFile(candidate_suspect,candidate_weapon,candidate_room)
 			# Make sure to change the states of the cards that were loaded
 			candidate_suspect.assignTo(self.casefile)
 			candidate_weapon.assignTo(self.casefile)
@@ -146,18 +287,12 @@ class CardManager:
 	# Information about who holds the cards are held in this datastructure
 	def assign(self,playerlist):
 		# This approach is similar to how we hand out cards in real life,
-		# since this is only ran once when the game begins, I don't care
-		# about the complexity of this algorithm
-		availCards = self.getAvailableCards() # why doesn't python have do-while loops?
+		# shuffle the deck once and deal it around the table
+		availCards = self.getAvailableCards()
+		self.getRng().shuffle(availCards)
 		players = playerlist.getPlayers()
-		idx = 0 # players index
-		while len(availCards) > 0:
-			# Pick a random card from the available cards pool and assign it
-			# a player in a round table fashion
-			availCards[random.randrange(len(availCards))].assignTo(players[idx])
-			
-			idx = (idx + 1) % len(players) # wrap around
-			availCards = self.getAvailableCards()
+		for idx in range(0,len(availCards)):
+			availCards[idx].assignTo(players[idx % len(players)])
 		
 # Defines the CaseFile object in the game.
 # There shall only be one CaseFile per instance of a game.
@@ -166,12 +301,16 @@ class CardManager:
 # - suspect
 # - weapon
 # - room
+# The three cards are also held as a mask of the card catalog.
 class CaseFile:
-	def __init__(self,suspectCard,weaponCard,roomCard,logger):
-		self.logger = logger
+	__slots__ = ("suspectCard","weaponCard","roomCard","catalog","mask")
+
+	def __init__(self,suspectCard,weaponCard,roomCard):
 		self.suspectCard = suspectCard
 		self.weaponCard = weaponCard
 		self.roomCard = roomCard
+		self.catalog = suspectCard.catalog
+		self.mask = self.catalog.getTripleMask(suspectCard.name,weaponCard.name,roomCard.name)
 
 	def __str__(self):
 		return "Case file"
@@ -180,6 +319,10 @@ class CaseFile:
 	# matches the values set in the case file.
 	# False otherwise.
 	def checkAccusation(self,suspect, weapon, room):
+		# Cards that are not in the catalog (ie. a custom case file)
+		# can only be compared by name
+		if countCards(self.mask) == 3:
+			return self.catalog.getTripleMask(suspect,weapon,room) == self.mask
 		ret = True
 		if (self.suspectCard.name != suspect):
 			ret = False
@@ -20,22 +20,102 @@ from globals import *
 from gameboard import *
 from players import *
 from cards import *
+from journal import *
+from snapshot import *
+from instruments import *
+
+# Does nothing, stands in for the methods a replay skips (see Game.replay())
+def ignore(*args):
+	pass
 
 # Defines the Game object, the primary interface to the game instance
 class Game:
 
 	# Generates the game object.
 	# This must be intialized before any requests or signals are in process
-	def __init__(self):
+	# A logger may be provided to tag the log of the game with context
+	# fields (see GameRegistry), otherwise the game creates its own.
+	# The game owns its random number generator. Given the same seed and
+	# the same actions, two games play out exactly the same. If no seed
+	# is given a fresh one is drawn; it is kept in self.seed either way.
+	# With <autoDisprove>, suggestions are defended by the first player in
+	# turn order that can disprove them, and the game disproves them on
+	# his behalf when he has a single card to show (see settleSuggestion()).
+	# A BoardLayout may be given to play on another board than the classic
+	# one (see getGridLayout()), its rooms are the room cards of the game.
+	def __init__(self,logger=None,seed=None,autoDisprove=False,layout=None):
 		# Create the logger object per game instance, shared amongst all children objects
-		self.logger = Logger()
+		self.logger = Logger() if logger == None else logger
+		self.seed = newSeed() if seed == None else seed
+		self.autoDisprove = autoDisprove
+		self.layout = layout
+		self.logger.info("game seed: %d",self.seed)
 	
-		self.playerlist = PlayerList(self.logger)
-		self.gameboard = Gameboard(self.logger)
-		self.cardmanager = CardManager(self.logger)
+		topology = getTopology(layout)
+		self.playerlist = PlayerList(self.logger,topology.getCatalog())
+		self.gameboard = Gameboard(self.logger,topology)
+		self.cardmanager = CardManager(self.logger,topology.getCatalog(),seed=self.seed)
 		self.state = STATE_INITIAL
 		self.suggestion = None # this is the current suggestion object in play
 		self.accusation = None # this is the current accusation object in play
+		self.tracker = DirtyTracker() # versions of the targeted payloads, see touch()
+		self.journal = Journal(self.seed,autoDisprove,layout) # every action processed, see replay()
+		self.broadcasts = {} # channel -> cached global payload, see getBroadcast()
+		self.instruments = None # see enableInstruments()
+
+	# Rebuilds a game from its Journal by processing every action again.
+	# The replayed game does not log anything unless a logger is given.
+	# Nothing is touched nor journaled while replaying: the first cycle of
+	# a new game sends everything anyway, and its journal is the one
+	# replayed. The actions that raised in the game are journaled too,
+	# they raise again and are skipped. Without <messages> the players are
+	# not messaged either, the replayed game has no message pending (ie. to
+	# check or recover the state of a game that has no clients).
+	@staticmethod
+	def replay(journal,logger=None,messages=True):
+		g = Game(Logger(level=LOG_OFF) if logger == None else logger,journal.seed,journal.autoDisprove,journal.layout)
+		g.touch = ignore
+		g.journal.record = ignore
+		if not messages:
+			g.handleGameException = ignore
+		processors = [getattr(g,name) for name in JOURNAL_ACTIONS]
+		for entry in journal.entries:
+			try:
+				processors[entry[0]](*entry[1:])
+			except Exception:
+				# The action raised in the journaled game as well, after
+				# the same changes: that game went on, so does this one
+				pass
+		del g.touch
+		del g.journal.record
+		if not messages:
+			del g.handleGameException
+			g.playerlist.resetMessages()
+		g.journal.entries = list(journal.entries)
+		return g
+
+	# Returns the state of the game in the compact binary form of
+	# snapshot.py. The messages still pending for the clients are part of
+	# it, what was already sent is not.
+	def snapshot(self):
+		return writeSnapshot(self)
+
+	# Rebuilds a game from a snapshot. Every payload of the restored game
+	# is dirty, so its first cycle sends everything. Its journal only
+	# holds the actions processed after the restore.
+	@staticmethod
+	def restore(data,logger=None):
+		g = Game(logger,**getSnapshotOptions(data))
+		readSnapshot(g,data)
+		return g
+
+	# Turns on the instrumentation of the public methods of this game and
+	# returns its GameInstruments. Games are not instrumented by default.
+	def enableInstruments(self):
+		if self.instruments == None:
+			self.instruments = GameInstruments()
+			self.instruments.attach(self)
+		return self.instruments
 
 	# Debugger printout
 	def __str__(self):
@@ -55,6 +135,12 @@ class Game:
 	# Updates the turn of the player at the given moment.
 	def updateTurnStatus(self):
 		self.turnStatus = self.gameboard.updateTurnStatus()
+
+	# Marks the targeted payloads of the channels as changed for the player,
+	# or for every player if no playerId is given. Processors must call this
+	# for everything they may mutate, the senders rely on it to set DIRTY.
+	def touch(self,channels,playerId=None):
+		self.tracker.bump(channels,playerId)
 	
 	
 	########################################################################
@@ -63,33 +149,24 @@ class Game:
 	# This dictionary will be sent to all players at the same signal cycle.
 	########################################################################
 	# Returns a Dictionary. The same dictionary is sent to ALL players
+	# It is cached until a processor touches CHANNEL_GAMESTATE and must
+	# not be modified.
 	def getGamestate(self):
-		currentPlayer = self.playerlist.getCurrentPlayer()
-		currentPlayerId = "No current player, game has not started" if currentPlayer == None else currentPlayer.getID()
+		return self.getBroadcast(CHANNEL_GAMESTATE,self.buildGamestate)[1]
 
-		suggestionDict = {}
-		if self.suggestion != None:
-			suggestionDict["suspect"] = self.suggestion.suspect
-			suggestionDict["weapon"] = self.suggestion.weapon
-			suggestionDict["room"] = self.suggestion.room
-
-		ret = {
-				"currentPlayerId"     : currentPlayerId,
-				"turnStatus"          : self.state,
-				"availableCharacters" : self.playerlist.getAvailableCharacters(),
-				"characters_in_game"  : self.playerlist.getCharactersInGame(),
-				"suggestion"          : suggestionDict,
-				"game_has_begun"      : (self.state != STATE_INITIAL)
-			}
-			
-		# Revert state back to MOVE (unless a suggestion action is called)
-		# self.state = STATE_MOVE
-		
-		return ret
-	
 	# Returns a Dictionary. The same dictionary is sent to ALL players
+	# It is cached until a processor touches CHANNEL_GAMEBOARD and must
+	# not be modified.
 	def getGameboard(self):
-		return self.gameboard.getGameboard()
+		return self.getBroadcast(CHANNEL_GAMEBOARD,self.gameboard.getGameboard)[1]
+
+	# Returns getGamestate() encoded as JSON bytes, encoded once per change
+	def getGamestateEncoded(self):
+		return self.getBroadcastEncoded(CHANNEL_GAMESTATE,self.buildGamestate)
+
+	# Returns getGameboard() encoded as JSON bytes, encoded once per change
+	def getGameboardEncoded(self):
+		return self.getBroadcastEncoded(CHANNEL_GAMEBOARD,self.gameboard.getGameboard)
 
 	# When a game exception is thrown, do not crash, instead alert the current
 	# user that the choice is invalid
@@ -101,8 +178,10 @@ class Game:
 		if gexc.player == "all":
 			for player in self.playerlist.getPlayers():
 				player.updateMessage(gexc.msg)
+			self.touch([CHANNEL_MESSAGES])
 		else:
 			gexc.player.updateMessage(gexc.msg)
+			self.touch([CHANNEL_MESSAGES],gexc.player.getID())
 	
 	
 	########################################################################
@@ -113,146 +192,280 @@ class Game:
 	# - dirty    : True if the message has been updated between cycles
 	# - payload  : a dictionary containing the essential information that
 	#              target will need.
+	# If <deltaOnly> is True, the entries that are not dirty are skipped
+	# altogether, their payloads are not even built.
 	########################################################################
 	
 	# Returns a list of Dictionaries that are sent to each player
-	def getPlayerstates(self):
+	def getPlayerstates(self,deltaOnly=False):
 		# Data preprocessing is needed
 		data = []
-		for elem in self.playerlist.getPlayerstates():
-			data.append({PLAYER_ID:elem[PLAYER_ID],DIRTY:True,PAYLOAD:elem})
+		for player in self.playerlist.getPlayers():
+			dirty = self.tracker.check(CHANNEL_PLAYERSTATES,player.getID())
+			if dirty or not deltaOnly:
+				data.append({PLAYER_ID:player.getID(),DIRTY:dirty,PAYLOAD:player.getState()})
 		return data
 		
 	# Returns a list of Dictionaries that are sent to each player
-	def getMoveOptions(self):
+	def getMoveOptions(self,deltaOnly=False):
 		# Data preprocessing is needed
 		data = []
 		for player in self.playerlist.getPlayers():
 			# Don't allow the player to move if they need to suggest
 			if player.state != PLAYER_SUGGEST:
-				moveOptions = self.gameboard.getMoveOptions(player)
-				moveOptStr = []
-				for option in moveOptions:
-					moveOptStr.append(option.getName())
-				data.append({PLAYER_ID:player.playerId,DIRTY:True,PAYLOAD:moveOptStr})
+				dirty = self.tracker.check(CHANNEL_MOVE_OPTIONS,player.getID())
+				if dirty or not deltaOnly:
+					moveOptStr = self.buildMoveOptions(player,self.gameboard.getPlayerLoc(player))
+					data.append({PLAYER_ID:player.playerId,DIRTY:dirty,PAYLOAD:moveOptStr})
 		return data
 
 	# Returns a list of Dictionaries that are sent to each player
-	def getSuggestionOptions(self):
+	def getSuggestionOptions(self,deltaOnly=False):
 		# If a player is at a room, he can make a suggestion
 		data = []
 		if (self.state != STATE_INITIAL):
 			allPlayers = self.playerlist.getPlayers()
 			for player in allPlayers:
-				self.logger.log("getting suggestions options for %s" % player)
+				self.logger.debug("getting suggestions options for %s",player)
 				# A player can only suggest, if he can suggest
 				if (player.state == PLAYER_SUGGEST):
-					#accusePlayerOptions = []
-					accuseOptions = []
-					
-					# trust no one, not even yourself
-					for s in SUSPECTS:
-						accuseOptions.append(s)
-					
-					'''
-					# under the fifth amendment, you are protected against self-incrimination
-					for s in SUSPECTS:
-						if (player.getSuspect() != s):
-							accuseOptions.append(s)
-					'''
-					'''
-					for p in allPlayers:
-						if (p != player):
-							accusePlayerOptions.append(p)
-					# get the suspect names, not player id
-					accuseOptions = list(map(lambda p : p.getSuspect(), accusePlayerOptions))
-					'''
-					# get all weapons
-					weaponOptions = WEAPONS
-					
-					# only get the room the player is currently at
-					if self.gameboard.getPlayerLoc(player).isPassageWay():
-						raise BackException("you cannot suggest in a passageway")
-					roomOptions = [self.gameboard.getPlayerLoc(player).getName()]
-					payload = {"suspects":accuseOptions,"weapons":weaponOptions,"rooms":roomOptions}
-					data.append({PLAYER_ID:player.playerId,DIRTY:True,PAYLOAD:payload})
+					dirty = self.tracker.check(CHANNEL_SUGGESTION_OPTIONS,player.getID())
+					if dirty or not deltaOnly:
+						payload = self.buildSuggestionOptions(player,self.gameboard.getPlayerLoc(player))
+						data.append({PLAYER_ID:player.playerId,DIRTY:dirty,PAYLOAD:payload})
 		return data
 		
 	# Returns a list of Dictionaries that are sent to each player
-	def getAccusationOptions(self):
+	def getAccusationOptions(self,deltaOnly=False):
 		# If a player is at a room, he can make a suggestion
 		data = []
 		if (self.state != STATE_INITIAL):
 			allPlayers = self.playerlist.getPlayers()
 			for player in allPlayers:
-				self.logger.log("getting accusation options for %s" % player)
-				# A player can accuse at anytime
-				#accusePlayerOptions = []
-				accuseOptions = []
-				
-				# trust no one, not even yourself
-				for s in SUSPECTS:
-					accuseOptions.append(s)
-					
-				'''
-				# under the fifth amendment, you are protected against self-incrimination
-				for s in SUSPECTS:
-					if (player.getSuspect() != s):
-						accuseOptions.append(s)
-				'''
-				'''
-				for p in allPlayers:
-					if (p != player):
-						accusePlayerOptions.append(p)
-				# get the suspect names, not player id
-				accuseOptions = list(map(lambda p : p.getSuspect(), accusePlayerOptions))
-				'''
-				# get all weapons
-				weaponOptions = WEAPONS
-				
-				# get all rooms
-				roomOptions = ROOMS
-				
-				payload = {"suspects":accuseOptions,"weapons":weaponOptions,"rooms":roomOptions}
-				data.append({PLAYER_ID:player.playerId,DIRTY:True,PAYLOAD:payload})
+				self.logger.debug("getting accusation options for %s",player)
+				dirty = self.tracker.check(CHANNEL_ACCUSATION_OPTIONS,player.getID())
+				if dirty or not deltaOnly:
+					payload = self.buildAccusationOptions(player)
+					data.append({PLAYER_ID:player.playerId,DIRTY:dirty,PAYLOAD:payload})
 		return data
 		
 	# Returns a list of Dictionaries that are sent to each player
-	def getChecklists(self):
+	def getChecklists(self,deltaOnly=False):
 		data = []
 		for player in self.playerlist.getPlayers():
-			checklist = player.getChecklist()
-			data.append({PLAYER_ID:player.getID(),DIRTY:True,PAYLOAD:checklist})
+			dirty = self.tracker.check(CHANNEL_CHECKLISTS,player.getID())
+			if dirty or not deltaOnly:
+				checklist = player.getChecklist()
+				data.append({PLAYER_ID:player.getID(),DIRTY:dirty,PAYLOAD:checklist})
 		return data
 		
 	# Returns a list of Dictionaries that are sent to each player
-	def getCardlists(self):
+	def getCardlists(self,deltaOnly=False):
 		data = []
 		for player in self.playerlist.getPlayers():
-			# I heard you like one-liners (converts the card object into their string representation)
-			cards = list(map(lambda c: str(c), self.cardmanager.getCards(player)))
-			data.append({PLAYER_ID:player.getID(),DIRTY:True,PAYLOAD:{"cardList":cards}})
+			dirty = self.tracker.check(CHANNEL_CARDLISTS,player.getID())
+			if dirty or not deltaOnly:
+				data.append({PLAYER_ID:player.getID(),DIRTY:dirty,PAYLOAD:self.buildCardlist(player)})
 		return data
 		
 	# Returns a list of Dictionaries that are sent to each player
-	def getMessages(self):
+	# Messages are reset once sent, so a player that just got a message
+	# is dirty again on the next cycle to clear it.
+	def getMessages(self,deltaOnly=False):
 		data = []
 		for player in self.playerlist.getPlayers():
-			message,color = player.getMessage()
-			data.append({PLAYER_ID:player.getID(),DIRTY:True,PAYLOAD:{"message":message,"color":color}})
+			self.buildMessage(player,data,deltaOnly)
 		self.playerlist.resetMessages()
 		return data
 
+	# Returns a Dictionary holding everything sent on one signal cycle,
+	# computed in a single pass over the players. The result is the same
+	# as calling the nine senders one after another:
+	# - gamestate, gameboard : the global payloads, see getGamestate()
+	#                          and getGameboard()
+	# - one key per targeted channel (see CHANNELS) holding the list
+	#   the matching targeted sender returns
+	def getCycle(self,deltaOnly=False):
+		tracker = self.tracker
+		started = (self.state != STATE_INITIAL)
+		playerstates = []
+		moveOptions = []
+		suggestionOptions = []
+		accusationOptions = []
+		checklists = []
+		cardlists = []
+		messages = []
+		
+		for player in self.playerlist.getPlayers():
+			playerId = player.getID()
+			loc = self.gameboard.getPlayerLoc(player)
+			
+			dirty = tracker.check(CHANNEL_PLAYERSTATES,playerId)
+			if dirty or not deltaOnly:
+				playerstates.append({PLAYER_ID:playerId,DIRTY:dirty,PAYLOAD:player.getState()})
+			
+			if player.state != PLAYER_SUGGEST:
+				dirty = tracker.check(CHANNEL_MOVE_OPTIONS,playerId)
+				if dirty or not deltaOnly:
+					moveOptions.append({PLAYER_ID:playerId,DIRTY:dirty,PAYLOAD:self.buildMoveOptions(player,loc)})
+			
+			if started:
+				if player.state == PLAYER_SUGGEST:
+					dirty = tracker.check(CHANNEL_SUGGESTION_OPTIONS,playerId)
+					if dirty or not deltaOnly:
+						suggestionOptions.append({PLAYER_ID:playerId,DIRTY:dirty,PAYLOAD:self.buildSuggestionOptions(player,loc)})
+				dirty = tracker.check(CHANNEL_ACCUSATION_OPTIONS,playerId)
+				if dirty or not deltaOnly:
+					accusationOptions.append({PLAYER_ID:playerId,DIRTY:dirty,PAYLOAD:self.buildAccusationOptions(player)})
+			
+			dirty = tracker.check(CHANNEL_CHECKLISTS,playerId)
+			if dirty or not deltaOnly:
+				checklists.append({PLAYER_ID:playerId,DIRTY:dirty,PAYLOAD:player.getChecklist()})
+			
+			dirty = tracker.check(CHANNEL_CARDLISTS,playerId)
+			if dirty or not deltaOnly:
+				cardlists.append({PLAYER_ID:playerId,DIRTY:dirty,PAYLOAD:self.buildCardlist(player)})
+			
+			self.buildMessage(player,messages,deltaOnly)
+		self.playerlist.resetMessages()
+		
+		return {
+				"gamestate"                : self.getGamestate(),
+				"gameboard"                : self.getGameboard(),
+				CHANNEL_PLAYERSTATES       : playerstates,
+				CHANNEL_MOVE_OPTIONS       : moveOptions,
+				CHANNEL_SUGGESTION_OPTIONS : suggestionOptions,
+				CHANNEL_ACCUSATION_OPTIONS : accusationOptions,
+				CHANNEL_CHECKLISTS         : checklists,
+				CHANNEL_CARDLISTS          : cardlists,
+				CHANNEL_MESSAGES           : messages
+			}
+
+	########################################################################
+	# GLOBAL PAYLOAD BUILDERS
+	# The global payloads are built once per change of their channel and
+	# cached along with their JSON encoding, so that polling between
+	# moves costs a lookup.
+	########################################################################
+
+	# Builds the payload of getGamestate()
+	def buildGamestate(self):
+		currentPlayer = self.playerlist.getCurrentPlayer()
+		currentPlayerId = "No current player, game has not started" if currentPlayer == None else currentPlayer.getID()
+
+		suggestionDict = {}
+		if self.suggestion != None:
+			suggestionDict["suspect"] = self.suggestion.suspect
+			suggestionDict["weapon"] = self.suggestion.weapon
+			suggestionDict["room"] = self.suggestion.room
+
+		ret = {
+				"currentPlayerId"     : currentPlayerId,
+				"turnStatus"          : self.state,
+				"availableCharacters" : list(self.playerlist.getAvailableCharacters()),
+				"characters_in_game"  : self.playerlist.getCharactersInGame(),
+				"suggestion"          : suggestionDict,
+				"game_has_begun"      : (self.state != STATE_INITIAL)
+			}
+			
+		# Revert state back to MOVE (unless a suggestion action is called)
+		# self.state = STATE_MOVE
+		
+		return ret
+
+	# Disproves the suggestion in play on behalf of its defender when he
+	# has nothing to choose: he cannot disprove it, or has a single card
+	# to show. Only used with autoDisprove.
+	def settleSuggestion(self):
+		defender = self.playerlist.getCurrentPlayer()
+		mask = self.suggestion.getDisproval(defender)
+		if countCards(mask) > 1:
+			return
+		card = None
+		if mask == 0:
+			self.suggestion.accuser.message = "Nobody can disprove your suggestion!"
+		else:
+			card = self.cardmanager.catalog.getNames(mask)[0]
+		self.playerlist.endSuggestion(defender,card,self.suggestion,self.gameboard,self.cardmanager.casefile,mask == 0)
+		self.suggestion = None
+		self.state = STATE_STARTED
+
+	# Returns the cache entry [epoch, payload, encoded payload] of the
+	# broadcast channel, rebuilding the payload with <build> if a processor
+	# touched the channel since it was built
+	def getBroadcast(self,channel,build):
+		epoch = self.tracker.getEpoch(channel)
+		entry = self.broadcasts.get(channel)
+		if entry == None or entry[0] != epoch:
+			entry = [epoch,build(),None]
+			self.broadcasts[channel] = entry
+		return entry
+
+	# Returns the encoded payload of the broadcast channel
+	def getBroadcastEncoded(self,channel,build):
+		entry = self.getBroadcast(channel,build)
+		if entry[2] == None:
+			entry[2] = encodePayload(entry[1])
+		return entry[2]
+
+	########################################################################
+	# TARGETED PAYLOAD BUILDERS
+	# Build the payload of a single player, shared between the targeted
+	# senders and getCycle(). The location of the player is passed in so
+	# that it is only looked up once per cycle.
+	########################################################################
+
+	# Returns the list of location names the player can move to
+	def buildMoveOptions(self,player,loc):
+		moveOptStr = []
+		for option in self.gameboard.getMoveOptions(player,loc):
+			moveOptStr.append(option.getName())
+		return moveOptStr
+
+	# Returns the suggestion menu of a player that must suggest
+	# The menu is shared by every player in the room and must not be modified
+	def buildSuggestionOptions(self,player,loc):
+		# trust no one, not even yourself: every suspect may be suggested
+		# only get the room the player is currently at
+		if loc.isPassageWay():
+			raise BackException("you cannot suggest in a passageway")
+		return self.cardmanager.catalog.getSuggestionMenu(loc.getName())
+
+	# Returns the accusation menu of a player
+	# The menu is shared by every player and must not be modified
+	def buildAccusationOptions(self,player):
+		# A player can accuse at anytime, anyone, with anything, anywhere
+		return self.cardmanager.catalog.getAccusationMenu()
+
+	# Returns the list of card names held by the player
+	def buildCardlist(self,player):
+		return {"cardList":self.cardmanager.getCardNames(player)}
+
+	# Appends the message entry of the player to data. The caller must
+	# reset the messages once every player has been visited.
+	def buildMessage(self,player,data,deltaOnly):
+		dirty = self.tracker.check(CHANNEL_MESSAGES,player.getID())
+		message,color = player.getMessage()
+		if dirty or not deltaOnly:
+			data.append({PLAYER_ID:player.getID(),DIRTY:dirty,PAYLOAD:{"message":message,"color":color}})
+		if message != "":
+			self.touch([CHANNEL_MESSAGES],player.getID())
+
 	########################################################################
 	# PUBLIC INTERFACE METHODS PROCESSORS
 	########################################################################
 	def addPlayer(self,playerId):
+		self.journal.record(ACTION_ADD_PLAYER,playerId)
+		self.touch([CHANNEL_GAMESTATE])
 		try:
 			self.playerlist.addPlayer(playerId)
 		except GameException as gexc:
 			self.handleGameException(gexc)
 		
 	def selectSuspect(self,playerId,suspect):
+		self.journal.record(ACTION_SELECT_SUSPECT,playerId,suspect)
+		self.touch([CHANNEL_PLAYERSTATES],playerId)
+		self.touch([CHANNEL_GAMESTATE])
 		try:
 			self.playerlist.selectPlayerSuspect(playerId,suspect)
 		except GameException as gexc:
@@ -271,6 +484,8 @@ class Game:
 	# - no other players will join
 	# - the CardManager is properly initialized
 	def startGame(self):
+		self.journal.record(ACTION_START_GAME)
+		self.touch(CHANNELS + BROADCAST_CHANNELS)
 		try:
 			# Validate if all players are ready to play
 			self.playerlist.validatePlayers()
@@ -286,9 +501,7 @@ class Game:
 			
 			# Once the cards are assigned, we check off the checklists for all players
 			for player in self.playerlist.getPlayers():
-				cards = self.cardmanager.getCards(player)
-				for card in cards:
-					player.updateChecklist(card.getName())
+				player.updateChecklistMask(self.cardmanager.getHandMask(player))
 
 			# Assign the starting positions of all the players
 			self.gameboard.intializePlayers(self.playerlist)
@@ -304,6 +517,10 @@ class Game:
 		
 		
 	def selectMove(self,playerId,choice):
+		self.journal.record(ACTION_SELECT_MOVE,playerId,choice)
+		# Moving changes the occupancy of the board, which changes everyone's options
+		self.touch([CHANNEL_MOVE_OPTIONS] + BROADCAST_CHANNELS)
+		self.touch(PLAYER_STATE_CHANNELS + [CHANNEL_MESSAGES],playerId)
 		try:
 			player = self.playerlist.getPlayer(playerId)
 			# Must validate that it is the current player's turn
@@ -325,6 +542,8 @@ class Game:
 		pass # NOT USED
 		
 	def passTurn(self,playerId):
+		self.journal.record(ACTION_PASS_TURN,playerId)
+		self.touch([CHANNEL_GAMESTATE])
 		try:
 			currentPlayer = self.playerlist.getCurrentPlayer()
 			# A pass turn signal must be 
@@ -337,6 +556,7 @@ class Game:
 				self.playerlist.nextCurrentPlayer()
 				
 				newCurrentPlayer = self.playerlist.getCurrentPlayer()
+				self.touch(PLAYER_STATE_CHANNELS,newCurrentPlayer.getID())
 				moveOptions = self.gameboard.getMoveOptions(newCurrentPlayer)
 				if len(moveOptions) > 0:
 					newCurrentPlayer.state = PLAYER_MOVE
@@ -350,10 +570,18 @@ class Game:
 	
 	# Enables the game's suggestion state
 	def startSuggestion(self,playerId):
+		self.journal.record(ACTION_START_SUGGESTION,playerId)
+		self.touch([CHANNEL_GAMESTATE])
 		self.state = STATE_SUGGESTION
 	
 	# The player suggests an accused player
 	def proposeSuggestion(self,playerId,suspect,weapon):
+		self.journal.record(ACTION_PROPOSE_SUGGESTION,playerId,suspect,weapon)
+		# Every player is locked and messaged, the suspect is moved
+		self.touch(PLAYER_STATE_CHANNELS + [CHANNEL_MESSAGES] + BROADCAST_CHANNELS)
+		if self.autoDisprove:
+			# The suggestion may be disproved right away
+			self.touch([CHANNEL_CHECKLISTS])
 		try:
 			# Get the location of the current player, since that
 			# is what will be used in a suggestion
@@ -361,15 +589,20 @@ class Game:
 			room = self.gameboard.getPlayerLoc(currentPlayer).getName()
 			
 			# Store a suggestion object in memory
-			self.suggestion = Suggestion(currentPlayer,suspect,weapon,room,self.logger)
+			self.suggestion = Suggestion(currentPlayer,suspect,weapon,room,self.logger,self.cardmanager.catalog)
 			
 			# Do the actions associated with a suggestion
-			self.playerlist.makeSuggestion(self.suggestion,self.gameboard)
+			self.playerlist.makeSuggestion(self.suggestion,self.gameboard,self.cardmanager,self.autoDisprove)
+			if self.autoDisprove:
+				self.settleSuggestion()
 		except GameException as gexc:
 			self.handleGameException(gexc)
 	
 	# NOTE Argument type is redundant, card can be derived by the gamestate because that is trivial	
 	def disproveSuggestion(self,playerId,card,type,cannotDisprove):
+		self.journal.record(ACTION_DISPROVE_SUGGESTION,playerId,card,type,cannotDisprove)
+		# Every player is released, the accuser may see a new card
+		self.touch(PLAYER_STATE_CHANNELS + [CHANNEL_MESSAGES,CHANNEL_CHECKLISTS] + BROADCAST_CHANNELS)
 		try:
 			targetPlayer = self.playerlist.getPlayer(playerId)
 			
@@ -386,22 +619,20 @@ class Game:
 
 	# Enables the game accusation state
 	def startAccusation(self,playerId):
+		self.journal.record(ACTION_START_ACCUSATION,playerId)
+		self.touch([CHANNEL_GAMESTATE])
 		self.state = STATE_ACCUSATION
 	
 	def proposeAccusation(self,playerId,suspect_,weapon,room):
+		self.journal.record(ACTION_PROPOSE_ACCUSATION,playerId,suspect_,weapon,room)
+		self.touch(PLAYER_STATE_CHANNELS + [CHANNEL_MESSAGES,CHANNEL_GAMESTATE])
 		try:
 			accuser = self.playerlist.getPlayer(playerId)
-			suspect = self.playerlist.getPlayerBySuspect(suspect_)
-		
-			# If the accusation is to a NPC
-			if suspect == None:
-				for fp in self.playerlist.fakePlayers:
-					if fp.getSuspect() == suspect_:
-						suspect = fp
-						break
+			# The accused may be a NPC
+			suspect = self.playerlist.getPlayerBySuspect2(suspect_)
 		
 			# The player calls an accusation and an accusation object is built
-			self.accusation = Accusation(accuser,suspect.getSuspect(),weapon,room,self.logger)
+			self.accusation = Accusation(accuser,suspect.getSuspect(),weapon,room,self.logger,self.cardmanager.catalog)
 			
 			# Validate against the casefile
 			isCorrect = self.accusation.checkCasefile(self.cardmanager.casefile)
@@ -426,7 +657,7 @@ class Game:
 			# If the accusation is false, the game resumes
 			# - the accuser loses the game, and may not proceed
 			else:
-				accuser.state = PLAYER_LOSE
+				self.playerlist.losePlayer(accuser)
 				accuser.message = "Sorry! you lost (shhh... keep this a secret: it is %s)" % str(self.accusation)
 				# The game is thrown back to normal
 				self.state = STATE_STARTED
@@ -434,11 +665,7 @@ class Game:
 				self.playerlist.nextCurrentPlayer()
 				
 				# So if there is only one player left, he wins by default
-				numPlayersLeft = 0
-				for p in self.playerlist.getPlayers():
-					if p.state != PLAYER_LOSE:
-						numPlayersLeft += 1
-				if numPlayersLeft == 1:
+				if len(self.playerlist.getPlayersInPlay()) == 1:
 					self.playerlist.getCurrentPlayer().message = "CONGRATULATIONS, YOU WON! But since you did not figure out the culprit, it shall be a mystery..."
 					self.state = STATE_END
 		
@@ -453,6 +680,9 @@ class Game:
 		
 	# Gracefully remove the player from the game
 	def removePlayer(self,playerId):
+		self.journal.record(ACTION_REMOVE_PLAYER,playerId)
 		target = self.playerlist.removePlayer(playerId)
 		self.gameboard.removePlayer(target)
+		self.tracker.forget(playerId)
+		self.touch([CHANNEL_MOVE_OPTIONS] + BROADCAST_CHANNELS)
 
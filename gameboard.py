@@ -12,131 +12,438 @@
 
 from utils import *
 from globals import *
+from cards import *
+import struct
 
-# A board is constructed of a 3x3 grid of rooms
+# Binary form of a BoardLayout, see BoardLayout.encode(). All integers are
+# big endian: number of rooms (u16) and their names (str), number of
+# secret passages (u8) and their room index pairs (u16 each), number of
+# starting passageways (u8) and their room index pairs (u16 each).
+# A str is its utf-8 length (u16) and bytes.
+LAYOUT_U8 = struct.Struct(">B")
+LAYOUT_U16 = struct.Struct(">H")
+LAYOUT_PAIR = struct.Struct(">HH")
+
+# Everything that makes a board: the names of the rooms of the square
+# grid, row by row, the secret passages as pairs of room names and the
+# starting passageway of every suspect as a pair of room indices, in the
+# order of SUSPECTS. The defaults are the classic board of globals.py.
+# A layout is given to a Game for a board variant (see getGridLayout()),
+# it never changes once made and two equal layouts share their topology.
+class BoardLayout:
+	def __init__(self,rooms=ROOMS,secretPassages=SECRET_PASSAGES,initial=INITIAL):
+		self.rooms = tuple(rooms)
+		self.secretPassages = tuple([(roomA,roomB) for roomA, roomB in secretPassages])
+		self.initial = tuple([(roomA,roomB) for roomA, roomB in initial])
+
+	def __eq__(self,other):
+		return isinstance(other,BoardLayout) and self.getKey() == other.getKey()
+
+	def __hash__(self):
+		return hash(self.getKey())
+
+	def getKey(self):
+		return (self.rooms,self.secretPassages,self.initial)
+
+	# Returns the layout in its binary form
+	def encode(self):
+		ids = {}
+		chunks = [LAYOUT_U16.pack(len(self.rooms))]
+		for idx in range(0,len(self.rooms)):
+			ids[self.rooms[idx]] = idx
+			data = self.rooms[idx].encode("utf-8")
+			chunks.append(LAYOUT_U16.pack(len(data)))
+			chunks.append(data)
+		chunks.append(LAYOUT_U8.pack(len(self.secretPassages)))
+		for roomA, roomB in self.secretPassages:
+			if roomA not in ids or roomB not in ids:
+				raise BackException("secret passage %s-%s is not between two rooms of the board" % (roomA,roomB))
+			chunks.append(LAYOUT_PAIR.pack(ids[roomA],ids[roomB]))
+		chunks.append(LAYOUT_U8.pack(len(self.initial)))
+		for roomA, roomB in self.initial:
+			chunks.append(LAYOUT_PAIR.pack(roomA,roomB))
+		return b"".join(chunks)
+
+	# Returns the BoardLayout encoded in <data> at <offset> and the offset
+	# of the first byte after it
+	@staticmethod
+	def decode(data,offset=0):
+		count, = LAYOUT_U16.unpack_from(data,offset)
+		offset += LAYOUT_U16.size
+		rooms = []
+		for idx in range(0,count):
+			length, = LAYOUT_U16.unpack_from(data,offset)
+			offset += LAYOUT_U16.size
+			rooms.append(data[offset:offset + length].decode("utf-8"))
+			offset += length
+		secretPassages = []
+		count, = LAYOUT_U8.unpack_from(data,offset)
+		offset += LAYOUT_U8.size
+		for idx in range(0,count):
+			roomA, roomB = LAYOUT_PAIR.unpack_from(data,offset)
+			offset += LAYOUT_PAIR.size
+			secretPassages.append((rooms[roomA],rooms[roomB]))
+		initial = []
+		count, = LAYOUT_U8.unpack_from(data,offset)
+		offset += LAYOUT_U8.size
+		for idx in range(0,count):
+			initial.append(LAYOUT_PAIR.unpack_from(data,offset))
+			offset += LAYOUT_PAIR.size
+		return BoardLayout(rooms,secretPassages,initial), offset
+
+# The classic layout of globals.py
+DEFAULT_LAYOUT = BoardLayout()
+
+# Returns the layout of a <dimension> x <dimension> board. Its rooms are
+# named after their column letter and row number ("Room A1" is the top
+# left corner). Unless given, the secret passages join the opposite
+# corners, as on the classic board, and the suspects start on
+# passageways spread evenly around the edge of the board.
+def getGridLayout(dimension,secretPassages=None,initial=None):
+	if dimension < 3 or dimension > 26:
+		raise BackException("grid boards go from 3x3 to 26x26 rooms")
+	rooms = []
+	for y in range(0,dimension):
+		for x in range(0,dimension):
+			rooms.append("Room %s%d" % (chr(ord("A") + x),y + 1))
+
+	if secretPassages == None:
+		last = dimension - 1
+		secretPassages = [
+			(rooms[0],rooms[last * dimension + last]),
+			(rooms[last],rooms[last * dimension])
+		]
+
+	if initial == None:
+		# The passageways along the edge, clockwise from the top left corner
+		edge = []
+		for x in range(0,dimension - 1):
+			edge.append((x,x + 1))
+		for y in range(0,dimension - 1):
+			edge.append((y * dimension + dimension - 1,(y + 1) * dimension + dimension - 1))
+		for x in range(dimension - 1,0,-1):
+			edge.append(((dimension - 1) * dimension + x - 1,(dimension - 1) * dimension + x))
+		for y in range(dimension - 1,0,-1):
+			edge.append(((y - 1) * dimension,y * dimension))
+		initial = [edge[(idx * len(edge)) // len(SUSPECTS)] for idx in range(0,len(SUSPECTS))]
+
+	return BoardLayout(rooms,secretPassages,initial)
+
+# The layout of the board: the rooms, the passageways between them, the
+# secret passages and the passageway every suspect starts in.
+# A topology is built once per BoardLayout (see getTopology()) and
+# shared read-only by every Gameboard of that layout. Rooms and
+# PassageWays therefore MUST NOT hold anything specific to a game, the
+# players occupying them are tracked by the Gameboard.
+# Everything is indexed by dictionaries, building a topology takes time
+# linear in the number of rooms.
+class BoardTopology:
+	def __init__(self,layout=None):
+		self.layout = DEFAULT_LAYOUT if layout == None else layout
+		names = self.layout.rooms
+
+		# Validate the given rooms
+		if len(names) == 0:
+			raise BackException("you cannot have a board game with no rooms")
+		self.dimension = int(round(len(names) ** (1/float(2))))
+		if self.dimension ** 2 != len(names):
+			raise BackException("invalid number of rooms provided in the layout")
+
+		# Add the rooms to the board
+		rooms = []
+		roomsByName = {}
+		self.roomsByCoor = {}	# (x,y) -> Room
+		for idx in range(0,len(names)):
+			x_coordinate = int(idx % self.dimension)
+			y_coordinate = int(idx / self.dimension)
+			room = Room(names[idx],x_coordinate,y_coordinate)
+			rooms.append(room)
+			roomsByName[room.name] = room
+			self.roomsByCoor[(x_coordinate,y_coordinate)] = room
+
+		# Add the passageways to the board, one per pair of adjacent rooms
+		passageways = []
+		self.passagewaysByRooms = {}	# frozenset of the two Rooms -> PassageWay
+		for room in rooms:
+			for x_delta, y_delta in [(-1,0),(0,-1),(0,1),(1,0)]: # exclude corners and origin
+				candidateRoom = self.roomsByCoor.get((room.getX() + x_delta, room.getY() + y_delta))
+				if candidateRoom != None:
+					key = frozenset((room,candidateRoom))
+					if key not in self.passagewaysByRooms:
+						pway = PassageWay(room,candidateRoom)
+						passageways.append(pway)
+						self.passagewaysByRooms[key] = pway
+
+		# Add the super secret passages
+		for destA, destB in self.layout.secretPassages:
+			if destA not in roomsByName or destB not in roomsByName:
+				raise BackException("secret passage %s-%s is not between two rooms of the board" % (destA,destB))
+			roomsByName[destA].addSecretPassage(roomsByName[destB])
+			roomsByName[destB].addSecretPassage(roomsByName[destA])
+
+		self.rooms = tuple(rooms)
+		self.roomNames = frozenset(names)
+		self.passageways = tuple(passageways)
+		self.initial = Room("INITIAL",-1,-1) # Singleton initial player starting space
+
+		# Every position is numbered by its index in positions
+		self.positions = self.rooms + self.passageways + (self.initial,)
+		self.locsByName = {}	# name -> Room or PassageWay (INITIAL included)
+		for idx in range(0,len(self.positions)):
+			self.positions[idx].id = idx
+			self.positions[idx].freeze()
+			self.locsByName[self.positions[idx].getName()] = self.positions[idx]
+		if len(self.locsByName) != len(self.positions):
+			raise BackException("the names of the rooms of the layout are not unique")
+
+		# The opening passageway of every suspect
+		if len(self.layout.initial) != len(SUSPECTS):
+			raise BackException("the layout must give a starting passageway to each of the %d suspects" % len(SUSPECTS))
+		self.initialPassageways = {}	# suspect -> PassageWay
+		for idx in range(0,len(SUSPECTS)):
+			roomAidx, roomBidx = self.layout.initial[idx]
+			if max(roomAidx,roomBidx) >= len(rooms):
+				raise BackException("the starting passageway of %s is off the board" % SUSPECTS[idx])
+			pway = self.passagewaysByRooms.get(frozenset((self.rooms[roomAidx],self.rooms[roomBidx])))
+			if pway == None:
+				raise BackException("%s must start between two adjacent rooms" % SUSPECTS[idx])
+			self.initialPassageways[SUSPECTS[idx]] = pway
+		if len(set(self.initialPassageways.values())) != len(SUSPECTS):
+			raise BackException("two suspects start in the same passageway")
+
+		# The positions one move away from every position, by position id,
+		# in the order of Gameboard.getChoices(). INITIAL has none, the
+		# opening move of a suspect is in initialPassageways.
+		self.neighbours = []
+		for position in self.positions:
+			if position is self.initial:
+				self.neighbours.append(())
+			elif position.isPassageWay():
+				self.neighbours.append(position.choices)
+			elif position.secretpassage != None:
+				self.neighbours.append(position.passageways + (position.secretpassage,))
+			else:
+				self.neighbours.append(position.passageways)
+
+		# Width of the cells of the rendered board, see Gameboard.__str__()
+		self.cellWidth = max([len(name) for name in (list(names) + SUSPECTS)])
+		self.catalog = None	# see getCatalog()
+		self.distances = None	# see getDistances()
+
+	# Returns the card catalog of the games played on this board, its
+	# rooms are the rooms of the board. The classic board uses the
+	# default catalog.
+	def getCatalog(self):
+		if self.catalog == None:
+			if self.layout == DEFAULT_LAYOUT:
+				self.catalog = getCardCatalog()
+			else:
+				self.catalog = CardCatalog(SUSPECTS,self.layout.rooms,WEAPONS)
+		return self.catalog
+
+	# Returns the table of the number of moves between every two positions
+	# of an empty board, through the passageways and the secret passages:
+	# getDistances()[a.id][b.id]. The table is built on first use, with a
+	# breadth first search from every position. INITIAL is left out, its
+	# row is None and its column holds None.
+	def getDistances(self):
+		if self.distances == None:
+			distances = []
+			for source in self.positions:
+				distances.append(None if source is self.initial else tuple(self.getLevels(source)))
+			self.distances = distances
+		return self.distances
+
+	# Returns the number of moves from the Room or PassageWay <start> to
+	# <target> on an empty board
+	def getDistance(self,start,target):
+		return self.getDistances()[start.id][target.id]
+
+	# Returns the number of moves from <source> to every position, by
+	# position id. Positions that cannot be reached are None.
+	def getLevels(self,source):
+		levels = [None] * len(self.positions)
+		levels[source.id] = 0
+		frontier = [source]
+		depth = 0
+		while len(frontier) > 0:
+			depth += 1
+			following = []
+			for position in frontier:
+				for neighbour in self.neighbours[position.id]:
+					if levels[neighbour.id] == None:
+						levels[neighbour.id] = depth
+						following.append(neighbour)
+			frontier = following
+		return levels
+
+	# Returns (next position, number of moves) of a shortest way from the
+	# Room or PassageWay <start> to <target> that does not go through an
+	# occupied PassageWay. <occupants> is indexed by position id, a
+	# PassageWay is occupied when its entry is not empty (see
+	# Gameboard.occupants). Returns (None, 0) at the target and
+	# (None, None) when every way is blocked.
+	# The shortest ways of the empty board are tried first, following the
+	# distance table down to the target, which only looks at the positions
+	# along them. The search widens to the whole board only when all of
+	# them are blocked.
+	def planRoute(self,start,target,occupants):
+		if start is target:
+			return None, 0
+		if target is self.initial or (target.isPassageWay() and len(occupants[target.id]) > 0):
+			return None, None
+		toTarget = self.getDistances()[target.id]
+		neighbours = self.neighbours
+
+		# Depth first along the shortest ways, each step one move closer
+		seen = set((start.id,))
+		stack = [(start,None)]
+		while len(stack) > 0:
+			position, move = stack.pop()
+			closer = toTarget[position.id] - 1
+			for neighbour in neighbours[position.id]:
+				if toTarget[neighbour.id] != closer or neighbour.id in seen:
+					continue
+				if neighbour.isPassageWay() and len(occupants[neighbour.id]) > 0:
+					continue
+				if neighbour is target:
+					return (neighbour if move == None else move), toTarget[start.id]
+				seen.add(neighbour.id)
+				stack.append((neighbour,neighbour if move == None else move))
+
+		# Every shortest way is blocked, breadth first around the occupied
+		# passageways. moves holds the first move toward every position reached.
+		moves = {start.id : None}
+		frontier = [start]
+		depth = 0
+		while len(frontier) > 0:
+			depth += 1
+			following = []
+			for position in frontier:
+				for neighbour in neighbours[position.id]:
+					if neighbour.id in moves:
+						continue
+					if neighbour.isPassageWay() and len(occupants[neighbour.id]) > 0:
+						continue
+					moves[neighbour.id] = neighbour if position is start else moves[position.id]
+					if neighbour is target:
+						return moves[neighbour.id], depth
+					following.append(neighbour)
+			frontier = following
+		return None, None
+
+# The topologies of the process, by BoardLayout
+TOPOLOGIES = {}
+
+# Returns the topology of the layout (the classic board if None),
+# building it on first use
+def getTopology(layout=None):
+	layout = DEFAULT_LAYOUT if layout == None else layout
+	topology = TOPOLOGIES.get(layout)
+	if topology == None:
+		topology = BoardTopology(layout)
+		TOPOLOGIES[layout] = topology
+	return topology
+
+# Occupancy of every empty position, shared by all the boards
+NO_OCCUPANTS = ()
+
+# A board is constructed of a square grid of rooms, 3x3 on the classic board
 # Every room is connected to room that is directly North, South, East or West of it.
 # There are no diagonal connection between rooms.
 # On a corner room, there is a secret passage that connects to the opposite
 # corner room relative to the board. Therefore, there are only 4 rooms that have
-# secret passages.
+# secret passages. Board variants may place them elsewhere (see BoardLayout).
+# The layout itself is the shared BoardTopology, the Gameboard only holds
+# which players occupy which position.
 class Gameboard:
-	def __init__(self,logger):
+	def __init__(self,logger,topology=None):
 		self.logger = logger
+		self.topology = getTopology() if topology == None else topology
+		self.dimension = self.topology.dimension
 		# Observe that Rooms are captured, hallways must be accounted in
 		# the player's location field
-		self.rooms = []
-		self.passageways = []
-		self.initial = Room("INITIAL",-1,-1,self.logger) # Singleton initial player starting space
-		
-		# Validate the given rooms
-		if len(ROOMS) == 0:
-			raise BackendException("you cannot have a board game with no ROOMS")
-		self.dimension = int(len(ROOMS) ** (1/float(2)))
-		if self.dimension ** 2 != len(ROOMS):
-			raise BackendException("invalid number of rooms provided in ROOMS")
-		
-		# Add the rooms to the board
-		self.logger.log("Generating Rooms")
-		for idx in range(0,len(ROOMS)):
-			x_coordinate = int(idx % self.dimension)
-			y_coordinate = int(idx / self.dimension)
-			self.rooms.append(Room(ROOMS[idx],x_coordinate,y_coordinate,self.logger))
-		for room in self.rooms:
-			self.logger.log("Room generated: %s" % room)
-		
-		# Add the passageways to the board
-		self.logger.log("Generating Passageways")
-		for room in self.rooms:
-			x_coordinate = room.getX()
-			y_coordinate = room.getY()
-			delta_range = [-1,0,1]
-			for x_delta in delta_range:
-				for y_delta in delta_range:
-					if abs(x_delta) != abs(y_delta): # exclude corners and origin
-						candidateRoom = self.getRoomByCoor(x_coordinate + x_delta, y_coordinate + y_delta)
-						candidatePWay = None
-						if candidateRoom != room and candidateRoom != None:
-							candidatePWay = PassageWay(room,candidateRoom,self.logger)
-						if (candidatePWay != None) and (candidatePWay not in self.passageways):
-							self.logger.log("Adding passageway: %s" % candidatePWay)
-							self.passageways.append(candidatePWay)
-		for pway in self.passageways:
-			self.logger.log("Passageway generated: %s" % pway)
-			
-		# Add the super secret passages
-		for secret in SECRET_PASSAGES:
-			destA, destB = secret
-			destA = self.getRoom(destA)
-			destB = self.getRoom(destB)
-			self.logger.log("Adding secret passages %s <-> %s" % (destA, destB))
-			destA.addSecretPassage(destB)
-			destB.addSecretPassage(destA)
-	
+		self.rooms = self.topology.rooms
+		self.passageways = self.topology.passageways
+		self.initial = self.topology.initial
+
+		# list of Player instances that occupy each position, indexed by position id
+		# A PassageWay is occupied by at most one Player
+		# Empty positions share NO_OCCUPANTS until a player is placed there
+		self.occupants = [NO_OCCUPANTS] * len(self.topology.positions)
+		self.playerLocs = {}	# Player -> Room or PassageWay the player occupies
+								# MUST be consistent with occupants
+
+	# The lines are joined once at the end, the rendering takes time
+	# linear in the size of the board
 	def __str__(self):
-		ret = ""
-		bufferspace = 0
-		for name in (ROOMS + SUSPECTS):
-			bufferspace = bufferspace if len(name) < bufferspace else len(name)
-		
+		width = self.topology.cellWidth
+		border = "-" * ((width * self.dimension) + self.dimension + 1) # printout ----- border
+		lines = []
+
 		# Visual output of the Board Rooms
 		for y in range(0, self.dimension):
-			for idx in range(0,(bufferspace*self.dimension) + self.dimension + 1):
-				ret += "-" # printout ----- border
-			ret += "\n"
-			
+			lines.append(border)
+			rooms = [self.getRoomByCoor(x,y) for x in range(0, self.dimension)]
+
 			# Printout the room name
-			for x in range(0, self.dimension):
-				ret += "|"
-				ret += self.getRoomByCoor(x,y).name
-				for idx in range(0,bufferspace - len(self.getRoomByCoor(x,y).name)):
-					ret += " " # padding
-			ret += "|"
-			ret += "\n"
-
-			# Printout the suspect names within the room
+			lines.append("|" + "|".join([room.name.ljust(width) for room in rooms]) + "|")
+
+			# Printout the suspect names within the room, or empty rows
 			for rowIdx in range(0,len(SUSPECTS)):
-				for x in range(0, self.dimension):
-					players = self.getRoomByCoor(x,y).getPlayers()
-					ret += "|"
-					if rowIdx < len(players):
-						ret += players[rowIdx].suspect
-						for idx in range(0,bufferspace - len(players[rowIdx].suspect)):
-							ret += " " # name row
-					else:
-						for idx in range(0,bufferspace):
-							ret += " " # empty row
-				ret += "|"
-				ret += "\n"
-		
-		for idx in range(0,(bufferspace*self.dimension) + self.dimension + 1):
-			ret += "-" # printout ----- border
-		ret += "\n"
-		
+				cells = []
+				for room in rooms:
+					players = self.getPlayers(room)
+					cells.append((players[rowIdx].suspect if rowIdx < len(players) else "").ljust(width))
+				lines.append("|" + "|".join(cells) + "|")
+		lines.append(border)
+
 		# Printout the Passageways
 		for pway in self.passageways:
-			ret += str(pway) + " "
-			ret += "(%s, %s)" % (pway.roomA, pway.roomB)
-			ret += ": "
-			for player in pway.getPlayers():
-				ret += str(player)
-			ret += "\n"
-
-		for idx in range(0,(bufferspace*self.dimension) + self.dimension + 1):
-			ret += "-" # printout ----- border
-		ret += "\n"
-		
-		return ret
-	
-	# Returns a list of all Rooms and Passageways
+			players = "".join([str(player) for player in self.getPlayers(pway)])
+			lines.append("%s (%s, %s): %s" % (pway,pway.roomA,pway.roomB,players))
+		lines.append(border)
+
+		return "\n".join(lines) + "\n"
+
+	# Returns a tuple of all Rooms and Passageways, INITIAL included
 	def getAllPositions(self):
-		return (self.rooms + self.passageways + [self.initial])
-	
+		return self.topology.positions
+
 	# Initializes players to their starting positions
 	def intializePlayers(self,playerlist):
 		for player in playerlist.getPlayers():
-			self.initial.addPlayer(player)
+			self.placePlayer(player,self.initial)
 		for player in playerlist.fakePlayers:
-			self.initial.addPlayer(player)
+			self.placePlayer(player,self.initial)
+		if DEBUG:
+			self.checkPlayerLocs()
+
+	# Puts the player at the position, removing him from wherever he was
+	# This is the only place where the occupancy of a position may change
+	def placePlayer(self,player,dest):
+		start = self.playerLocs.get(player)
+		if start != None:
+			self.occupants[start.id].remove(player)
+		if self.occupants[dest.id] is NO_OCCUPANTS:
+			self.occupants[dest.id] = []
+		self.occupants[dest.id].append(player)
+		self.playerLocs[player] = dest
+
+	# Sanity check of the player location index against the occupancy
+	# of every position. Raises a BackException if they disagree.
+	def checkPlayerLocs(self):
+		seen = 0
+		for position in self.getAllPositions():
+			players = self.getPlayers(position)
+			if position.isPassageWay() and len(players) > 1:
+				raise BackException("%s is occupied by %d players" % (position,len(players)))
+			for player in players:
+				if self.playerLocs.get(player) is not position:
+					raise BackException("%s is in %s but indexed at %s" % (player,position,self.playerLocs.get(player)))
+				seen += 1
+		if seen != len(self.playerLocs):
+			raise BackException("player location index holds %d players, the board holds %d" % (len(self.playerLocs),seen))
 
 	# Returns a dictionary.
 	# Contains keys that are named after every possible location on the board include INITIAL
@@ -145,70 +452,108 @@ class Gameboard:
 	def getGameboard(self):
 		ret = {}
 		for position in self.getAllPositions():
-			players = position.getPlayers()
 			suspects = []
-			for player in players:
+			for player in self.occupants[position.id]:
 				suspects.append(player.getSuspect())
 			ret[position.getName()] = suspects
 		return ret
-	
+
 	# Returns a list of Player(s) at the specified location
 	# Argument <position> is a string name
 	# If there is one player, a singleton list is returned
 	# If there is no player, an empty list is returned
 	def getPlayer(self,position):
-		ret = None
-		# Search though rooms
-		for room in self.rooms:
-			if room.name == position:
-				ret = room.getPlayer()
-		
-		if ret == None:
-			# Search through passageways
-			for passway in self.passageways:
-				if room.name == room.getPlayer():
-					ret = passway.getPlayer()
-		return ret
-	
+		loc = self.getLoc(position)
+		return [] if loc == None else list(self.getPlayers(loc))
+
+	# Returns the list of Players occupying the Room or PassageWay
+	# The list is owned by the board and must not be modified
+	def getPlayers(self,position):
+		return self.occupants[position.id]
+
+	# Returns (next position, number of moves) of a shortest way for the
+	# player to the Room or PassageWay <target>, around the passageways
+	# occupied right now (see BoardTopology.planRoute()). From INITIAL the
+	# way starts with the opening passageway of the player.
+	# Returns (None, 0) at the target and (None, None) when every way is
+	# blocked or the player is not on the board.
+	def planRoute(self,player,target):
+		start = self.playerLocs.get(player)
+		if start == None or target == None:
+			return None, None
+		if start is self.initial and target is not start:
+			opening = self.determineInitPassageway(player)
+			move, turns = self.topology.planRoute(opening,target,self.occupants)
+			return (None, None) if turns == None else (opening, turns + 1)
+		return self.topology.planRoute(start,target,self.occupants)
+
+	# Returns true if the player is at the Room or PassageWay
+	def hasPlayer(self,position,player):
+		return self.playerLocs.get(player) is position
+
+	# A Room may be occupied by an unlimited amount of players,
+	# a PassageWay by only one.
+	# Returns True if no other player may enter the position
+	def isOccupied(self,position):
+		return position.isPassageWay() and len(self.occupants[position.id]) > 0
+
 	# Returns the Room or PassageWay of the player,
 	# If the player does not exist in the board (neither Hallway, PassageWay or Initial),
 	# then None is returned
 	def getPlayerLoc(self,player):
-		ret = None
-		for position in self.getAllPositions():
-			if position.hasPlayer(player):
-				ret = position
-				break # this might cause issues down the line
+		return self.playerLocs.get(player)
+
+	# Returns only valid choices that the player can go to from the position
+	# From a Room, the free passageways and the secret passage are valid.
+	# From a PassageWay, both of its rooms are valid, since they can be
+	# occupied by any number of people.
+	def getChoices(self,position):
+		self.logger.debug("getting choices for %s",position)
+		if position.isPassageWay():
+			return position.choices
+		ret = []
+		for pway in position.passageways:				# See if the passageway is valid
+			if len(self.occupants[pway.id]) == 0:		# Add to the list of options
+				ret.append(pway)
+		if position.secretpassage != None:
+			ret.append(position.secretpassage)			# Add the secret passage if possible
 		return ret
-	
+
+	# Returns True if dest is one of getChoices(start), without building the list
+	def canMoveTo(self,start,dest):
+		if dest == None:
+			return False
+		if start.isPassageWay():
+			return (dest is start.roomA) or (dest is start.roomB)
+		if dest is start.secretpassage:
+			return True
+		return (dest in start.passageways) and (len(self.occupants[dest.id]) == 0)
+
 	# Returns list of Location objects that the player can go to at the current position
 	# If the player does not exist on the board, (not in Hallways, Passageways or Initial)
 	# Then an empty list is returned
 	# Note that the return is always an list of objects
-	def getMoveOptions(self,player):
+	# The current location of the player may be given if it is already known
+	def getMoveOptions(self,player,current_loc=None):
 		ret = None
-		current_loc = self.getPlayerLoc(player)
+		if current_loc == None:
+			current_loc = self.getPlayerLoc(player)
 		# Find all possible locations the player can go
 		# There is a special exception to players that are currently in their initial positions
 		if current_loc == self.initial:
 			ret = [self.determineInitPassageway(player)]	# Return the singleton list of one passageway
 		elif current_loc != None:
-			ret = current_loc.getChoices()
+			ret = self.getChoices(current_loc)
 		else:
 			ret = []										# This only occurs if the game has not started
 		return ret
-	
+
 	# Should only be called when a player is at his intial position
 	# We determine what passageway the player will go to as his
 	# opening move
 	def determineInitPassageway(self,player):
-		idx = SUSPECTS.index(player.getSuspect())		# Reference the player's index position
-		roomAidx, roomBidx = INITIAL[idx]				# Map the index tot he INITIAL tuple
-		roomA = self.getRoom(ROOMS[roomAidx])			# Find the referenced rooms
-		roomB = self.getRoom(ROOMS[roomBidx])
-		passageway = self.getPassageway(roomA,roomB)
-		return passageway
-	
+		return self.topology.initialPassageways[player.getSuspect()]
+
 	# Returns True iff the movement is valid from one location to another
 	# This is based on the state of succeeding location and the current player's state
 	# There is an edge case for the initial starting position
@@ -216,110 +561,99 @@ class Gameboard:
 		# Check if the player is not locked
 		if player.state == PLAYER_LOCKED:
 			raise GameException(player, "cannot move right now")
-	
+
 		if start == self.initial:
 			return self.determineInitPassageway(player) == dest
 		else:
-			return dest in start.getChoices()
-	
+			return self.canMoveTo(start,dest)
+
 	# Moves the player to the associated room of choice if possible
 	# The force parameter shall only be used if the player needs to
-	# be moved because of a suggestion. If a suggestion is made to 
+	# be moved because of a suggestion. If a suggestion is made to
 	# the player, the player must move to the room of the suggestion
 	def movePlayer(self,player,choiceName,force=False):
 		start = self.getPlayerLoc(player)
 		dest = self.getLoc(choiceName)
-	
+
 		if force:
-		
+
 			# Move the player to the next location without validation
-			self.logger.log("Forcefully moving %s from %s to %s" % (str(player),start.getName(),dest.getName()))
-			start.removePlayer(player)
-			dest.addPlayer(player)
-		
+			self.logger.info("Forcefully moving %s from %s to %s",player,start,dest)
+			self.placePlayer(player,dest)
+
 		elif self.validMove(player,start,dest):
-		
+
 			# Move the player to the next location
-			self.logger.log("Moving %s from %s to %s" % (str(player),start.getName(),dest.getName()))
-			start.removePlayer(player)
-			dest.addPlayer(player)
-			
+			self.logger.info("Moving %s from %s to %s",player,start,dest)
+			self.placePlayer(player,dest)
+
 			# If the player had just moved to a room, he MUST make a suggestion
 			if (dest.isRoom()):
 				player.state = PLAYER_SUGGEST
 				player.message = "MAKE A SUGGESTION! ...plz"
-				
+
 			# If the player had just moved into a hallway
 			else:
 				player.state = PLAYER_IN_PLAY
 		else:
 			GameException(player,"Invalid move")
+		if DEBUG:
+			self.checkPlayerLocs()
 
 	# Removes the player from the gameboard
+	# Nothing happens if the player is not on the board
 	def removePlayer(self,player):
-		pass
+		loc = self.playerLocs.pop(player,None)
+		if loc != None:
+			self.occupants[loc.id].remove(player)
+		if DEBUG:
+			self.checkPlayerLocs()
 
 	# Returns Room or Passageway based on the name of the location
+	# If no location has the name, None is returned
 	def getLoc(self,name):
-		target = None
-		for loc in self.getAllPositions():
-			if loc.getName() == name:
-				target = loc
-				break
-		return target
+		return self.topology.locsByName.get(name)
 
 	# Returns the room on the board that matches the given name
+	# If no room has the name, None is returned
 	def getRoom(self,name):
-		target = None
-		for room in self.rooms:
-			if room.getName() == name:
-				target = room
-				break
+		target = self.topology.locsByName.get(name)
+		if target != None and not target.isRoom():
+			target = None
 		return target
 
 	# Returns the Room instance at a specified coordinate
 	# If the coordinates are invalid (ie. out of bounds), then None is returned
 	def getRoomByCoor(self,x_coordinate,y_coordinate):
-		target = None
-		# validate coordinate
-		if (not (x_coordinate < self.dimension and y_coordinate < self.dimension
-				and x_coordinate >= 0 and y_coordinate >= 0)):
-			self.logger.log("invalid coordinates given for Gameboard:getRoom()")
-		for room in self.rooms:
-			if (room.X == x_coordinate and room.Y == y_coordinate):
-				target = room
-		return target
-	
+		return self.topology.roomsByCoor.get((x_coordinate,y_coordinate))
+
 	# Returns the associated passageway between the given room on the board
+	# If the rooms are not adjacent, None is returned
 	def getPassageway(self,roomA,roomB):
-		target = None
-		for pway in self.passageways:
-			if pway.isPassageWayFor(roomA,roomB):
-				target = pway
-				break
-		return target
-	
+		return self.topology.passagewaysByRooms.get(frozenset((roomA,roomB)))
+
 	# Returns all Room instances on the board
 	def getRooms(self):
 		return self.rooms
-		
+
+# A Room of the board topology, shared by every game
 class Room:
-	def __init__(self,name,X,Y,logger):
-		self.logger = logger
+	__slots__ = ("id","name","X","Y","secretpassage","passageways")
+
+	def __init__(self,name,X,Y):
+		self.id = None		# index of the Room in BoardTopology.positions
 		self.name = name
 		self.X = X
 		self.Y = Y
 		self.secretpassage = None # A Room, so far, there can only be one secret passage per room
 		self.passageways = []
-		self.players = [] 	# list of Player instances that currently occupy the Room
-							# MUST be consistent with Player location
-							
+
 	def __str__(self):
 		return self.name
 
 	def isRoom(self):
 		return True
-		
+
 	def isPassageWay(self):
 		return False
 
@@ -329,70 +663,39 @@ class Room:
 	def getY(self):
 		return self.Y
 
-	# Defines the name of the room
-	def setName(self,name):
-		self.name = name
-		
 	def getName(self):
 		return self.name
-		
+
 	# Adds a connecting passageway
 	def addPassageway(self,passageway):
 		if passageway not in self.passageways:
-			self.logger.log("Adding passageway %s to room %s" % (passageway, self.name))
 			self.passageways.append(passageway)
-		else:
-			self.logger.log("Could not add passageway %s to room %s" % (passageway, self.name))
-		
+
 	# A Secret Passage is basically a Room
 	def addSecretPassage(self,room):
 		self.secretpassage = room
-		
-	# A Room may be occupied by an unlimited amount of players
-	def isOccupied(self):
-		return False
-	
-	# Returns only valid choices that the player can go to from this room
-	def getChoices(self):
-		self.logger.log("getting choices for %s" % self.getName())
-		ret = []
-		for pway in self.passageways:			# See if the passageway is valid
-			if (not pway.isOccupied()):			# Add to the list of options
-				ret.append(pway)
-		if self.secretpassage != None:
-			ret.append(self.secretpassage)		# Add the secret passage if possible
-		return ret
-	
-	def addPlayer(self,player):
-		self.logger.log("adding %s to %s" % (player,self.name))
-		self.players.append(player)
-	
-	# Returns a list of all Players in the Room
-	def getPlayers(self):
-		return self.players
-	
-	# Returns true if the player is within the Room
-	def hasPlayer(self,player):
-		return player in self.players
-		
-	def removePlayer(self,player):
-		self.players.remove(player) # TODO GameException verification
+
+	# Called once the topology is built, the connections may no longer change
+	def freeze(self):
+		self.passageways = tuple(self.passageways)
 
 # Connects two adjacent rooms
 class PassageWay:
-	def __init__(self,roomA,roomB,logger):
-		self.logger = logger
+	__slots__ = ("id","roomA","roomB","name","choices")
+
+	def __init__(self,roomA,roomB):
+		self.id = None		# index of the PassageWay in BoardTopology.positions
 		self.roomA = roomA
 		self.roomB = roomB
 		self.name = self.setName()
-		self.player = None # Only one player can occupy a PassageWay
+		self.choices = (roomA,roomB) # A PassageWay always leads to both of its rooms
 		# Once a passage way in generated, it needs to associate the rooms with it
 		self.roomA.addPassageway(self)
 		self.roomB.addPassageway(self)
-	
+
 	def __str__(self):
 		return self.name
-	
+
 	# Passageways are bi-directional
 	def __eq__(self,other):
 		ret = True
@@ -401,13 +704,16 @@ class PassageWay:
 		elif self.name != other.name:
 			ret = False
 		return ret
-	
+
+	def __hash__(self):
+		return hash(self.name)
+
 	def isRoom(self):
 		return False
-		
+
 	def isPassageWay(self):
 		return True
-	
+
 	def isPassageWayFor(self,roomA,roomB):
 		ret = False
 		if (self.roomA == roomA) and (self.roomB == roomB):
@@ -415,14 +721,7 @@ class PassageWay:
 		elif (self.roomB == roomA) and (self.roomA == roomB):
 			ret = True
 		return ret
-	
-	# Returns all valid movement choices based on this Hallways's position
-	# Note that the Player can go to any room, since they can be occupied by any
-	# number of people
-	def getChoices(self):
-		self.logger.log("getting choices for %s" % self.getName())
-		return [self.roomA, self.roomB]
-	
+
 	# Defines a the name of the passageway.
 	# This is a lazy approach, we sort the names
 	# alphabetically and concat to this string:
@@ -439,32 +738,10 @@ class PassageWay:
 		else:
 			ret = "%s-%s" % (room2,room1)
 		return ret
-	
+
 	def getName(self):
 		return self.name
-	
-	# Returns True if a Player is occupying a Hallway
-	# Only one Player can occupy a Hallway
-	def isOccupied(self):
-		return self.player != None
-	
-	def addPlayer(self,player):
-		self.player = player # TODO GameException verification
-	
-	# Returns a singleton list of the Player that are
-	# in the Hallway (really a misnomer)
-	def getPlayers(self):
-		return [self.player] if self.player != None else []
-		
-	# Returns true if the player is within the Hallway
-	def hasPlayer(self,player):
-		return player == self.player
-	
-	# Removes the Player from the Hallway.
-	# Returns the Player that was removed
-	# If there was no Player, returns None
-	def removePlayer(self,player):
-		player = self.player
-		self.player = None
-		return player # TODO GameException validation
-	
\ No newline at end of file
+
+	# Called once the topology is built, nothing to do for a PassageWay
+	def freeze(self):
+		pass
@@ -14,12 +14,42 @@
 # ADMINISTRATION
 ################################################################################
 LOG_FILE='/opt/clueless/log/backend.log'
+LOG_MAX_BYTES=16*1024*1024			# The log is rotated once it grows past this size
+LOG_BACKUPS=4						# Number of rotated logs kept (backend.log.1 ... backend.log.4)
+LOG_BATCH=512						# Maximum number of records written per flush
+
+# Log levels, a Logger drops every message below its level
+LOG_DEBUG=10
+LOG_INFO=20
+LOG_WARNING=30
+LOG_ERROR=40
+LOG_OFF=100							# Nothing is logged
+LOG_LEVEL=LOG_INFO					# Default level of new Loggers
+LOG_LEVEL_NAMES={LOG_DEBUG:"DEBUG",LOG_INFO:"INFO",LOG_WARNING:"WARNING",LOG_ERROR:"ERROR"}
 DEBUG=False 						# Set to false before deployment!
 PLAYER_ID='playerId'
 DIRTY='dirty'
 PAYLOAD='payload'
 LOCATION='location'
 
+# Channels of the targeted senders, used for tracking which payloads
+# have changed between cycles
+CHANNEL_PLAYERSTATES = 'playerstates'
+CHANNEL_MOVE_OPTIONS = 'moveOptions'
+CHANNEL_SUGGESTION_OPTIONS = 'suggestionOptions'
+CHANNEL_ACCUSATION_OPTIONS = 'accusationOptions'
+CHANNEL_CHECKLISTS = 'checklists'
+CHANNEL_CARDLISTS = 'cardlists'
+CHANNEL_MESSAGES = 'messages'
+CHANNELS = [CHANNEL_PLAYERSTATES,CHANNEL_MOVE_OPTIONS,CHANNEL_SUGGESTION_OPTIONS,
+			CHANNEL_ACCUSATION_OPTIONS,CHANNEL_CHECKLISTS,CHANNEL_CARDLISTS,CHANNEL_MESSAGES]
+# Channels whose payload depends on the state of the player
+PLAYER_STATE_CHANNELS = [CHANNEL_PLAYERSTATES,CHANNEL_MOVE_OPTIONS,CHANNEL_SUGGESTION_OPTIONS]
+# Channels of the global senders, the payload is the same for every player
+CHANNEL_GAMESTATE = 'gamestate'
+CHANNEL_GAMEBOARD = 'gameboard'
+BROADCAST_CHANNELS = [CHANNEL_GAMESTATE,CHANNEL_GAMEBOARD]
+
 ################################################################################
 # GAME VARIABLES
 ################################################################################
@@ -64,6 +94,8 @@ ROOMS = [	'Study', 'Hall', 'Lounge',
 # Miss Scarlet is set to the first index due to precedence before everyone else
 SUSPECTS = ['Miss Scarlet','Colonel Mustard','Mrs White','Mr Green','Mrs Peacock','Professor Plum']
 INITIAL  = [(1,2),(2,5),(7,8),(6,7),(3,6),(0,3)] # These are based on indices on the ROOMS, ordered the same a SUSPECTS
+# Position of every suspect in the turn order
+TURN_ORDER = dict((suspect,idx) for idx, suspect in enumerate(SUSPECTS))
 
 # String list of weapons
 WEAPONS = ['Candlestick','Knife','Lead Pipe','Revolver','Rope','Wrench']
@@ -0,0 +1,208 @@
+#!/usr/bin/python3
+################################################################################
+# File:            instruments.py
+# Subcomponent:    Clueless/Backend
+# Language:        python3
+# Author:          Nate Lao (nlao1@jh.edu)
+# Date Created:    10/18/2026
+# Description:
+#			Opt-in instrumentation of the public Game methods: call counts,
+#			error counts and latency histograms, as a stats dictionary or in
+#			the Prometheus text exposition format. Instruments are attached
+#			per game (see Game.enableInstruments()) by wrapping its methods,
+#			a game without instruments runs the plain methods.
+#
+################################################################################
+
+import bisect
+import time
+
+from utils import *
+from globals import *
+
+# Every public interface method of Game
+GAME_INTERFACE = [
+	# senders
+	"getGamestate",
+	"getGameboard",
+	"getGamestateEncoded",
+	"getGameboardEncoded",
+	"getPlayerstates",
+	"getMoveOptions",
+	"getSuggestionOptions",
+	"getAccusationOptions",
+	"getChecklists",
+	"getCardlists",
+	"getMessages",
+	"getCycle",
+	# processors
+	"addPlayer",
+	"selectSuspect",
+	"enteredGame",
+	"startGame",
+	"selectMove",
+	"selectCard",
+	"passTurn",
+	"startSuggestion",
+	"proposeSuggestion",
+	"disproveSuggestion",
+	"startAccusation",
+	"proposeAccusation",
+	"disproveAccusation",
+	"removePlayer",
+	"snapshot"
+]
+
+# Upper bounds of the latency histogram buckets in nanoseconds, the last
+# bucket has no bound
+LATENCY_BUCKETS = [1000,2000,5000,10000,20000,50000,100000,200000,500000,
+	1000000,2000000,5000000,10000000,20000000,50000000,100000000]
+
+PROMETHEUS_PREFIX = "clueless_game"
+
+# Counters and latency histogram of one method
+class MethodStats:
+	def __init__(self):
+		self.calls = 0
+		self.gameErrors = 0		# GameException handled by the game
+		self.backErrors = 0		# BackException raised to the caller
+		self.totalNs = 0
+		self.maxNs = 0
+		self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+	# Records one call that took <elapsed> nanoseconds
+	def observe(self,elapsed):
+		self.calls += 1
+		self.totalNs += elapsed
+		if elapsed > self.maxNs:
+			self.maxNs = elapsed
+		self.buckets[bisect.bisect_left(LATENCY_BUCKETS,elapsed)] += 1
+
+	def merge(self,other):
+		self.calls += other.calls
+		self.gameErrors += other.gameErrors
+		self.backErrors += other.backErrors
+		self.totalNs += other.totalNs
+		self.maxNs = max(self.maxNs,other.maxNs)
+		for idx in range(0,len(self.buckets)):
+			self.buckets[idx] += other.buckets[idx]
+
+	# Returns the latency at the quantile in nanoseconds: the upper bound
+	# of the bucket it falls in, the slowest call for the last bucket
+	def getQuantile(self,quantile):
+		if self.calls == 0:
+			return 0
+		rank = quantile * self.calls
+		seen = 0
+		for idx in range(0,len(LATENCY_BUCKETS)):
+			seen += self.buckets[idx]
+			if seen >= rank:
+				return min(LATENCY_BUCKETS[idx],self.maxNs)
+		return self.maxNs
+
+	# Returns the stats as a dictionary, latencies in microseconds
+	def getStats(self):
+		return {
+			"calls"      : self.calls,
+			"gameErrors" : self.gameErrors,
+			"backErrors" : self.backErrors,
+			"meanUs"     : self.totalNs / 1000.0 / self.calls if self.calls > 0 else 0.0,
+			"p50Us"      : self.getQuantile(0.50) / 1000.0,
+			"p99Us"      : self.getQuantile(0.99) / 1000.0,
+			"maxUs"      : self.maxNs / 1000.0
+		}
+
+# The instruments of a game, or the aggregate of several games.
+# attach() wraps the public methods of a game with instance attributes
+# that time the call. A GameException is handled inside the game, so it
+# is counted by wrapping handleGameException() and charged to the method
+# being run. A BackException escapes the method and is counted on its way
+# out. A method called by another one (ie. getGamestate by getCycle) is
+# counted on its own too.
+class GameInstruments:
+	def __init__(self):
+		self.methods = {}		# method name -> MethodStats
+		self.running = []		# names of the methods being run, innermost last
+
+	# Returns the MethodStats of the method, creating them if needed
+	def getMethod(self,name):
+		stats = self.methods.get(name)
+		if stats == None:
+			stats = MethodStats()
+			self.methods[name] = stats
+		return stats
+
+	# Wraps the public methods of the game
+	def attach(self,game):
+		for name in GAME_INTERFACE:
+			setattr(game,name,self.wrap(name,getattr(game,name)))
+		handle = game.handleGameException
+		def handleGameException(gexc):
+			if len(self.running) > 0:
+				self.getMethod(self.running[-1]).gameErrors += 1
+			return handle(gexc)
+		game.handleGameException = handleGameException
+
+	# Returns the timed version of the method
+	def wrap(self,name,method):
+		stats = self.getMethod(name)
+		running = self.running
+		clock = time.perf_counter_ns
+		observe = stats.observe
+		def timed(*args,**kwargs):
+			running.append(name)
+			start = clock()
+			try:
+				return method(*args,**kwargs)
+			except BackException:
+				stats.backErrors += 1
+				raise
+			finally:
+				observe(clock() - start)
+				running.pop()
+		return timed
+
+	# Adds the counters of other instruments to these
+	def merge(self,other):
+		for name in other.methods:
+			self.getMethod(name).merge(other.methods[name])
+
+	# Returns a dictionary method name -> dictionary of stats (see
+	# MethodStats.getStats()), for the methods that were called
+	def getStats(self):
+		ret = {}
+		for name in sorted(self.methods.keys()):
+			if self.methods[name].calls > 0:
+				ret[name] = self.methods[name].getStats()
+		return ret
+
+	# Returns the instruments in the Prometheus text exposition format
+	def getPrometheus(self):
+		names = [name for name in sorted(self.methods.keys()) if self.methods[name].calls > 0]
+		lines = []
+		lines.append("# HELP %s_calls_total Calls of the public Game methods." % PROMETHEUS_PREFIX)
+		lines.append("# TYPE %s_calls_total counter" % PROMETHEUS_PREFIX)
+		for name in names:
+			lines.append('%s_calls_total{method="%s"} %d' % (PROMETHEUS_PREFIX,name,self.methods[name].calls))
+		lines.append("# HELP %s_errors_total Errors raised by the public Game methods." % PROMETHEUS_PREFIX)
+		lines.append("# TYPE %s_errors_total counter" % PROMETHEUS_PREFIX)
+		for name in names:
+			lines.append('%s_errors_total{method="%s",type="GameException"} %d' % (PROMETHEUS_PREFIX,name,self.methods[name].gameErrors))
+			lines.append('%s_errors_total{method="%s",type="BackException"} %d' % (PROMETHEUS_PREFIX,name,self.methods[name].backErrors))
+		lines.append("# HELP %s_latency_seconds Latency of the public Game methods." % PROMETHEUS_PREFIX)
+		lines.append("# TYPE %s_latency_seconds histogram" % PROMETHEUS_PREFIX)
+		for name in names:
+			stats = self.methods[name]
+			seen = 0
+			for idx in range(0,len(LATENCY_BUCKETS)):
+				seen += stats.buckets[idx]
+				lines.append('%s_latency_seconds_bucket{method="%s",le="%g"} %d' % (PROMETHEUS_PREFIX,name,LATENCY_BUCKETS[idx] / 1e9,seen))
+			lines.append('%s_latency_seconds_bucket{method="%s",le="+Inf"} %d' % (PROMETHEUS_PREFIX,name,stats.calls))
+			lines.append('%s_latency_seconds_sum{method="%s"} %.9f' % (PROMETHEUS_PREFIX,name,stats.totalNs / 1e9))
+			lines.append('%s_latency_seconds_count{method="%s"} %d' % (PROMETHEUS_PREFIX,name,stats.calls))
+		lines.append("# HELP %s_latency_quantile_seconds Latency quantiles estimated from the histogram." % PROMETHEUS_PREFIX)
+		lines.append("# TYPE %s_latency_quantile_seconds gauge" % PROMETHEUS_PREFIX)
+		for name in names:
+			for quantile in [0.5,0.99]:
+				lines.append('%s_latency_quantile_seconds{method="%s",quantile="%g"} %.9f' % (PROMETHEUS_PREFIX,name,quantile,self.methods[name].getQuantile(quantile) / 1e9))
+		return "\n".join(lines) + "\n"
@@ -0,0 +1,225 @@
+#!/usr/bin/python3
+################################################################################
+# File:            journal.py
+# Subcomponent:    Clueless/Backend
+# Language:        python3
+# Author:          Nate Lao (nlao1@jh.edu)
+# Date Created:    10/18/2026
+# Description:
+#			Contains the action journal of a game. Every action a Game
+#			processes is appended to its journal along with the seed of the
+#			game, which is enough to rebuild the game exactly (see
+#			Game.replay()). Journals encode to a compact binary form to be
+#			stored for crash recovery or moved between workers.
+#
+################################################################################
+
+import struct
+
+from utils import *
+from globals import *
+from gameboard import BoardLayout
+
+# Opcodes of the journaled actions, each one is the index of the Game
+# processor it replays in JOURNAL_ACTIONS
+ACTION_ADD_PLAYER          = 0
+ACTION_SELECT_SUSPECT      = 1
+ACTION_START_GAME          = 2
+ACTION_SELECT_MOVE         = 3
+ACTION_PASS_TURN           = 4
+ACTION_START_SUGGESTION    = 5
+ACTION_PROPOSE_SUGGESTION  = 6
+ACTION_DISPROVE_SUGGESTION = 7
+ACTION_START_ACCUSATION    = 8
+ACTION_PROPOSE_ACCUSATION  = 9
+ACTION_REMOVE_PLAYER       = 10
+JOURNAL_ACTIONS = [
+	"addPlayer",
+	"selectSuspect",
+	"startGame",
+	"selectMove",
+	"passTurn",
+	"startSuggestion",
+	"proposeSuggestion",
+	"disproveSuggestion",
+	"startAccusation",
+	"proposeAccusation",
+	"removePlayer"
+]
+
+# Binary layout, all integers are big endian:
+#   header : magic "CLJ", version (u8), seed (u64), flags (u8), number of
+#            entries (u32). Version 1 journals have no flags.
+#   flags  : JOURNAL_AUTO_DISPROVE if the game disproves suggestions,
+#            JOURNAL_LAYOUT if the game is played on another board than
+#            the classic one
+#   layout : the BoardLayout of the game (see BoardLayout.encode()), only
+#            with JOURNAL_LAYOUT
+#   strings: number of strings (u16), then every string as its utf-8
+#            length (u16) and bytes. Every player id, card and location
+#            named by the entries is stored once, in the order of its
+#            first use.
+#   codes  : the entries, as a run of u16 codes to the end of the data:
+#            opcode, number of arguments, then a code per argument.
+#            The codes of the arguments are ARG_NONE, ARG_FALSE, ARG_TRUE,
+#            or ARG_STR + the index of the string.
+# Version 2 journals have no string table, their entries are opcode (u8),
+# number of arguments (u8) and, for every argument, a tag (u8) followed
+# by a length (u16) and utf-8 bytes for strings.
+JOURNAL_MAGIC = b"CLJ"
+JOURNAL_VERSION = 3
+JOURNAL_HEADER = struct.Struct(">3sBQBI")
+JOURNAL_HEADER_V1 = struct.Struct(">3sBQI")
+JOURNAL_AUTO_DISPROVE = 0x01
+JOURNAL_LAYOUT = 0x02
+JOURNAL_ENTRY = struct.Struct(">BB")
+JOURNAL_STRLEN = struct.Struct(">H")
+JOURNAL_MAX_CODE = 0xFFFF
+ARG_NONE  = 0
+ARG_FALSE = 1
+ARG_TRUE  = 2
+ARG_STR   = 3
+
+# Ordered list of the actions a game processed.
+# Every entry is a tuple (opcode, arguments...) where the arguments are
+# those of the Game processor, as given by the caller. Actions that were
+# rejected with a GameException are journaled too: some of them still
+# change the game (ie. the defense counter of a suggestion), and they
+# are rejected the same way on replay.
+# The journal also holds the settings of the game given to Game().
+class Journal:
+	def __init__(self,seed,autoDisprove=False,layout=None):
+		self.seed = seed
+		self.autoDisprove = autoDisprove
+		self.layout = layout
+		self.entries = []
+
+	def __len__(self):
+		return len(self.entries)
+
+	def __iter__(self):
+		return iter(self.entries)
+
+	# Appends an action to the journal. Only strings, None and booleans
+	# can be journaled: any other argument raises a BackException and the
+	# action is not recorded, so that the journal can always be encoded.
+	def record(self,action,*args):
+		for arg in args:
+			if not (arg is None or arg is True or arg is False or isinstance(arg,str)):
+				raise BackException("cannot journal argument %r" % (arg,))
+		self.entries.append((action,) + args)
+
+	# Returns the journal in its binary form
+	def encode(self):
+		flags = JOURNAL_AUTO_DISPROVE if self.autoDisprove else 0
+		if self.layout != None:
+			flags |= JOURNAL_LAYOUT
+		chunks = [JOURNAL_HEADER.pack(JOURNAL_MAGIC,JOURNAL_VERSION,self.seed,flags,len(self.entries))]
+		if self.layout != None:
+			chunks.append(self.layout.encode())
+
+		codes = []
+		strings = {}	# string -> its code
+		for entry in self.entries:
+			codes.append(entry[0])
+			codes.append(len(entry) - 1)
+			for arg in entry[1:]:
+				if arg is None:
+					codes.append(ARG_NONE)
+				elif arg is False:
+					codes.append(ARG_FALSE)
+				elif arg is True:
+					codes.append(ARG_TRUE)
+				elif isinstance(arg,str):
+					code = strings.get(arg)
+					if code == None:
+						code = ARG_STR + len(strings)
+						if code > JOURNAL_MAX_CODE:
+							raise BackException("too many strings to journal")
+						strings[arg] = code
+					codes.append(code)
+				else:
+					raise BackException("cannot journal argument %r" % (arg,))
+
+		# The strings are numbered in the order they were inserted
+		chunks.append(JOURNAL_STRLEN.pack(len(strings)))
+		for string in strings:
+			data = string.encode("utf-8")
+			chunks.append(JOURNAL_STRLEN.pack(len(data)))
+			chunks.append(data)
+		chunks.append(struct.pack(">%dH" % len(codes),*codes))
+		return b"".join(chunks)
+
+	# Returns the Journal held in the binary form <data>
+	@staticmethod
+	def decode(data):
+		magic, version = data[0:3], data[3]
+		if magic != JOURNAL_MAGIC or version not in (1,2,JOURNAL_VERSION):
+			raise BackException("not a version %d game journal" % JOURNAL_VERSION)
+		if version == 1:
+			magic, version, seed, count = JOURNAL_HEADER_V1.unpack_from(data,0)
+			flags = 0
+			offset = JOURNAL_HEADER_V1.size
+		else:
+			magic, version, seed, flags, count = JOURNAL_HEADER.unpack_from(data,0)
+			offset = JOURNAL_HEADER.size
+		layout = None
+		if flags & JOURNAL_LAYOUT:
+			layout, offset = BoardLayout.decode(data,offset)
+		journal = Journal(seed,(flags & JOURNAL_AUTO_DISPROVE) != 0,layout)
+		if version < 3:
+			journal.entries = decodeEntriesV2(data,offset,count)
+			return journal
+
+		# The value of every code, ARG_STR onwards are the strings
+		values = [None,False,True]
+		numStrings, = JOURNAL_STRLEN.unpack_from(data,offset)
+		offset += JOURNAL_STRLEN.size
+		for idx in range(0,numStrings):
+			length, = JOURNAL_STRLEN.unpack_from(data,offset)
+			offset += JOURNAL_STRLEN.size
+			values.append(data[offset:offset + length].decode("utf-8"))
+			offset += length
+		if (len(data) - offset) % 2 != 0:
+			raise BackException("corrupted game journal")
+
+		codes = struct.unpack_from(">%dH" % ((len(data) - offset) // 2),data,offset)
+		entries = []
+		idx = 0
+		try:
+			for entryIdx in range(0,count):
+				end = idx + 2 + codes[idx + 1]
+				entries.append((codes[idx],) + tuple([values[code] for code in codes[idx + 2:end]]))
+				idx = end
+		except IndexError:
+			raise BackException("corrupted game journal")
+		if idx != len(codes):
+			raise BackException("corrupted game journal")
+		journal.entries = entries
+		return journal
+
+# Returns the entries of a version 1 or 2 journal, starting at <offset>
+def decodeEntriesV2(data,offset,count):
+	entries = []
+	for idx in range(0,count):
+		action, numArgs = JOURNAL_ENTRY.unpack_from(data,offset)
+		offset += JOURNAL_ENTRY.size
+		entry = [action]
+		for argIdx in range(0,numArgs):
+			tag = data[offset]
+			offset += 1
+			if tag == ARG_NONE:
+				entry.append(None)
+			elif tag == ARG_FALSE:
+				entry.append(False)
+			elif tag == ARG_TRUE:
+				entry.append(True)
+			elif tag == ARG_STR:
+				length, = JOURNAL_STRLEN.unpack_from(data,offset)
+				offset += JOURNAL_STRLEN.size
+				entry.append(data[offset:offset + length].decode("utf-8"))
+				offset += length
+			else:
+				raise BackException("corrupted game journal")
+		entries.append(tuple(entry))
+	return entries
@@ -12,6 +12,7 @@
 
 from utils import *
 from globals import *
+from cards import *
 
 # Defines a Player object
 class Player:
@@ -19,15 +20,16 @@ class Player:
 	# A player also holds a hand of cards, a checklist used
 	# for identifying suspects and a message that would 
 	# be displayed to the UI
-	def __init__(self,playerId,logger):
-		self.logger = logger
+	__slots__ = ("playerId","suspect","message","messageColor","catalog","checklist","state","fakeAF")
+
+	def __init__(self,playerId,catalog=None):
 		self.playerId = playerId
 		self.suspect = None
 		self.message = ""
 		self.messageColor = "blue" # Setting to default for now
-		self.checklist = []
+		self.catalog = getCardCatalog() if catalog == None else catalog
+		self.checklist = 0 # mask of the cards seen, see CardCatalog
 		self.state = PLAYER_INITIAL # It is assumed that when a player is made, he's automatically thrown to in play
-		self.logger.log("Added player %s" % playerId)
 		self.fakeAF = False
 	
 	def __str__(self):
@@ -51,7 +53,7 @@ class Player:
 	# Updates the player's personal message for UI
 	def updateMessage(self,message,color="blue"):
 		self.message = message
-		self.color = color
+		self.messageColor = color
 	
 	# Reverts message attributes to initial settings
 	def resetMessage(self):
@@ -65,24 +67,16 @@ class Player:
 	# The checklist will contain all the seen stuff in all categories,
 	# will be sorted out when it needs to be returned
 	def updateChecklist(self,evidence):
-		if not (evidence in self.checklist):
-			self.checklist.append(evidence)
+		self.checklist |= self.catalog.getBit(evidence)
+
+	# Checks off every card of the mask at once
+	def updateChecklistMask(self,mask):
+		self.checklist |= mask
 		
 	# Returns a dictionary object containing the suspects, weapons and rooms
-	# in a player's checklist
+	# in a player's checklist, in the order of the card catalog
 	def getChecklist(self):
-		checklist = {"suspects":[],"weapons":[],"rooms":[]}
-		for evidence in self.checklist:
-			if evidence in SUSPECTS:
-				checklist["suspects"].append(evidence)
-			
-			elif evidence in WEAPONS:
-				checklist["weapons"].append(evidence)
-			
-			elif evidence in ROOMS:
-				checklist["rooms"].append(evidence)
-				
-		return checklist
+		return self.catalog.getChecklist(self.checklist)
 		
 	# returns a Dictionary that comprises the Player's state to be sent
 	# the client UI handler.
@@ -106,20 +100,32 @@ class Player:
 	# Note: we assume that the selection is good.
 	# (ie. the player cannot select a suspect that is already choosen
 	def selectSuspect(self,suspect):
-		self.logger.log("Assigning %s to %s" % (suspect,self.playerId))
 		self.suspect = suspect
 
 # Wrapper for holding the list of Players registered in the game
 # In addition, a list of characters that are available are stored
 # in this class.
+# The players that picked a suspect and did not lose make up the turn
+# order, a ring following the order of SUSPECTS. It is kept up to date as
+# players pick their suspect, lose or leave, so that passing the turn
+# is a single lookup.
+# Players are also indexed by id and by suspect, so that every action
+# finds its player without scanning the list. The ids of the NPCs are
+# made up, they are only indexed by suspect.
+# The log lines about one player carry its id (see Logger.bind()).
 class PlayerList:
-	def __init__(self,logger):
+	def __init__(self,logger,catalog=None):
 		self.logger = logger
+		self.catalog = getCardCatalog() if catalog == None else catalog
 		self.players = []
 		self.fakePlayers = []
 		self.currentPlayer = None
 		self.availableCharacters = []
 		self.specialCounter = 0
+		self.turnNext = {}		# Player -> next Player in the turn order
+		self.turnPrev = {}		# Player -> previous Player in the turn order
+		self.playersById = {}		# playerId -> Player, NPCs excluded
+		self.playersBySuspect = {}	# suspect -> Player or NPC
 		for suspect in SUSPECTS:
 			self.availableCharacters.append(suspect)
 	
@@ -142,11 +148,15 @@ class PlayerList:
 	
 	# Starts a suggestion round
 	# Note that the player in this case is the caller player
-	def makeSuggestion(self,suggestion,gameboard):
-		for p in self.players:
+	# With <autoDisprove>, the first player after the accuser that can
+	# disprove the suggestion defends it (see resolveDisproval()), the
+	# accuser himself if nobody can.
+	def makeSuggestion(self,suggestion,gameboard,cardmanager=None,autoDisprove=False):
+		message = "%s suggest %s in %s with the %s!" % (suggestion.accuser.getSuspect(),suggestion.suspect,suggestion.room,suggestion.weapon)
+		for p in self.getPlayersInPlay():
 			# Lock all players
 			p.state = PLAYER_LOCKED
-			p.message = "%s suggest %s in %s with the %s!" % (suggestion.accuser.getSuspect(),suggestion.suspect,suggestion.room,suggestion.weapon)
+			p.message = message
 			
 		# Get the target player
 		target = self.getPlayerBySuspect2(suggestion.suspect)
@@ -154,8 +164,13 @@ class PlayerList:
 		# Move the target to suggestion room
 		gameboard.movePlayer(target,suggestion.room,force=True)
 		
+		if autoDisprove:
+			suggestion.disprovals = self.resolveDisproval(suggestion,cardmanager)
+			target = suggestion.getDefender()
+			if countCards(suggestion.getDisproval(target)) > 1:
+				target.message += " Disprove it with one of: %s" % ", ".join(self.catalog.getNames(suggestion.getDisproval(target)))
 		# If the target is a fake player, pick the next closest player
-		if (target.fakeAF):
+		elif (target.fakeAF):
 			fakeSuspect = target.getSuspect()
 			target = None
 			idx = SUSPECTS.index(fakeSuspect)
@@ -175,16 +190,39 @@ class PlayerList:
 		self.currentPlayer = target
 	
 	
+	# Returns the list of (Player, mask of the cards he may show) of the
+	# players that can disprove the suggestion, in turn order after the
+	# accuser. The hands come from the owner index of the CardManager.
+	# Players that lost still hold their cards, they may disprove too.
+	def resolveDisproval(self,suggestion,cardmanager):
+		ret = []
+		order = SUSPECTS.index(suggestion.accuser.getSuspect())
+		for step in range(1,len(SUSPECTS)):
+			player = self.playersBySuspect.get(SUSPECTS[(order + step) % len(SUSPECTS)])
+			if player != None and not player.fakeAF:
+				mask = cardmanager.getHandMask(player) & suggestion.mask
+				if mask != 0:
+					ret.append((player,mask))
+		return ret
+
 	# Ends a suggestion round
 	# Note that the player in this case is the target player
 	def endSuggestion(self,player,counter,suggestion,gameboard,casefile,cannotDisprove=False):
-		
+		# A resolved suggestion knows who can disprove it, and with which cards
+		if suggestion.disprovals != None:
+			mask = suggestion.getDisproval(player)
+			if player != suggestion.getDefender():
+				raise GameException(player,"it is up to %s to disprove the suggestion" % suggestion.getDefender().getID())
+			elif cannotDisprove and mask != 0:
+				raise GameException(player,"you can disprove the suggestion with %s" % " or ".join(self.catalog.getNames(mask)))
+			elif not cannotDisprove and self.catalog.getBit(counter) & mask == 0:
+				raise GameException(player,"you cannot disprove the suggestion with %s" % counter)
+
 		# The player cannot disprove the suggestion, we push the move back to the accuser,
 		# at this point the accuser may be able to make an accusation
 		if (cannotDisprove):
 			# Reenable all players
-			for p in self.players:
-				p.state = PLAYER_IN_PLAY
+			self.releasePlayers()
 			# pop the current player from buffer
 			self.currentPlayer = suggestion.accuser
 		else:
@@ -202,8 +240,7 @@ class PlayerList:
 			else:
 				self.specialCounter = 0
 				# Reenable all players
-				for p in self.players:
-					p.state = PLAYER_IN_PLAY
+				self.releasePlayers()
 				# pop the current player from the buffer
 				self.currentPlayer = suggestion.accuser
 				suggestion.accuser.message = "Your suggestion just got countered! %s pulled the %s card!" % (suggestion.suspect,counter)
@@ -214,6 +251,12 @@ class PlayerList:
 				# see the defending card
 				suggestion.accuser.updateChecklist(counter)
 	
+	# Releases the players locked by a suggestion. The players that lost
+	# may have been locked or made to defend, they go back to losing.
+	def releasePlayers(self):
+		for p in self.players:
+			p.state = PLAYER_IN_PLAY if p in self.turnNext else PLAYER_LOSE
+
 	# Returns true only if the current player is the given player
 	def hasTurn(self,player):
 		return player == self.currentPlayer
@@ -223,43 +266,87 @@ class PlayerList:
 		return self.currentPlayer
 	
 	# Picks the next player to have a turn, this is based on the character suspects picked in the game
+	# A current player that lost or left is followed by the player next
+	# to his suspect in the turn order
 	def nextCurrentPlayer(self):
-		# Get all the characters that are being used
-		charactersInGame = self.getCharactersInGame()
-	
-		# Lets be fancy
-		charIdx = list(map(lambda c : SUSPECTS.index(c), charactersInGame))
-		charIdx.sort()
-		charactersInGame = list(map(lambda i : SUSPECTS[i], charIdx))
-	
-		# Determine the index of the current player in respect to the SUSPECTS list
-		foundIdx = 0
-		found = False
-		while (foundIdx < len(charactersInGame)) and (not found):
-			# Breaks when the suspect of current player is found in the SUSPECTS list
-			if (self.currentPlayer.getSuspect() == charactersInGame[foundIdx]):
-				found = True
-			else:
-				foundIdx += 1
-		# Increment in the index and modulo if necessary
-		idx = (foundIdx + 1) % len(charactersInGame)
-		candidate = None
-		
-		# Loop through the SUSPECTS list, the next player who has
-		# a turn is based on the next character in the list
-		while (idx < len(charactersInGame)) and (candidate == None):
-			# At this point, we've wrapped around around the 
-			# SUSPECTS list, but we couldn't find the next player
-			if idx == foundIdx:	
-				raise BackException("could not find the next player based on SUSPECT list")
-			else:
-				# Determine if the suspect is being used by a player
-				candidate = self.getPlayerBySuspect(charactersInGame[idx])
-				# Else, increment the index
-				idx = (idx + 1) % len(charactersInGame)
-		
-		self.logger.log("Determined the next player: %s" % str(candidate))
+		candidate = self.turnNext.get(self.currentPlayer)
+		if candidate == None and self.currentPlayer != None:
+			candidate = self.getTurnSuccessor(self.currentPlayer.getSuspect())
+		self.logger.info("Determined the next player: %s",candidate)
 		self.currentPlayer = candidate
+
+	# Returns the players in the turn order, starting from the first
+	# suspect of SUSPECTS that is played
+	def getPlayersInPlay(self):
+		ret = []
+		first = self.getTurnSuccessor(None)
+		player = first
+		while player != None:
+			ret.append(player)
+			player = self.turnNext[player]
+			if player == first:
+				break
+		return ret
+
+	# Returns the player of the turn order that follows the suspect, the
+	# first one if <suspect> is None. None if the turn order is empty.
+	# Only the players in the turn order are looked at, a game with few
+	# players does not pay for the suspects nobody picked.
+	def getTurnSuccessor(self,suspect):
+		order = -1 if suspect == None else TURN_ORDER[suspect]
+		ret = None
+		closest = len(SUSPECTS)
+		for player in self.turnNext:
+			distance = (TURN_ORDER[player.getSuspect()] - order - 1) % len(SUSPECTS)
+			if distance == 0:
+				return player
+			elif distance < closest:
+				ret = player
+				closest = distance
+		return ret
+
+	# Puts the player in the turn order, by the order of his suspect
+	def joinTurnOrder(self,player):
+		after = self.getTurnSuccessor(player.getSuspect())
+		if after == None:
+			self.turnNext[player] = player
+			self.turnPrev[player] = player
+		else:
+			before = self.turnPrev[after]
+			self.turnNext[before] = player
+			self.turnPrev[player] = before
+			self.turnNext[player] = after
+			self.turnPrev[after] = player
+
+	# Takes the player out of the turn order, if he is in it
+	def leaveTurnOrder(self,player):
+		if player in self.turnNext:
+			before = self.turnPrev.pop(player)
+			after = self.turnNext.pop(player)
+			if after != player:
+				self.turnNext[before] = after
+				self.turnPrev[after] = before
+
+	# Rebuilds the indexes and the turn order from the players and NPCs,
+	# ie. after they were restored from a snapshot
+	def rebuildIndexes(self):
+		self.turnNext = {}
+		self.turnPrev = {}
+		self.playersById = {}
+		self.playersBySuspect = {}
+		for player in self.players + self.fakePlayers:
+			if not player.fakeAF:
+				self.playersById[player.playerId] = player
+			if player.getSuspect() != None:
+				self.playersBySuspect[player.getSuspect()] = player
+		for player in self.players:
+			if player.getSuspect() != None and player.state != PLAYER_LOSE:
+				self.joinTurnOrder(player)
+
+	# The player lost the game, he no longer gets a turn
+	def losePlayer(self,player):
+		player.state = PLAYER_LOSE
+		self.leaveTurnOrder(player)
 	
 	# Sets up the starting player for the game
 	def startGame(self):
@@ -269,12 +356,8 @@ class PlayerList:
 			raise GameException("all","need at most %d players to play the game, only found %d" % (MAX_PLAYERS,len(self.players)))
 		else:
 			# Find the starting player based on the order of suspects
-			startPlayer = None
-			idx = 0
-			while (startPlayer == None) and idx < len(SUSPECTS):
-				startPlayer = self.getPlayerBySuspect(SUSPECTS[idx])
-				idx += 1
-			self.logger.log("setting first player: %s" % startPlayer)
+			startPlayer = self.getTurnSuccessor(None)
+			self.logger.info("setting first player: %s",startPlayer)
 			self.currentPlayer = startPlayer
 	
 	# Adds a Player to the PlayerList with playerId
@@ -283,10 +366,12 @@ class PlayerList:
 	def addPlayer(self,playerId):
 		newPlayer = None
 		if self.getPlayer(playerId) == None:
-			newPlayer = Player(playerId,self.logger)
+			newPlayer = Player(playerId,self.catalog)
 			self.players.append(newPlayer)
+			self.playersById[playerId] = newPlayer
+			self.logger.bind(player=playerId).info("Added player %s",playerId)
 		else:
-			self.logger.log("Cannot add %s, player already exists" % playerId)
+			self.logger.bind(player=playerId).warning("Cannot add %s, player already exists",playerId)
 		return newPlayer
 	
 	# Returns a list of all players in the playerlist
@@ -311,27 +396,24 @@ class PlayerList:
 		
 	# Returns the Player object based on playerId string
 	def getPlayer(self,playerId):
-		target = None
-		for player in self.players:
-			if player.playerId == playerId:
-				target = player
-		return target
+		return self.playersById.get(playerId)
 
 	# This must be called when the player has started the game,
 	# players should no longer be able to select new characters
 	def lockAvailableCharacters(self):
-		self.logger.log("Available characters lockdown")
-		self.logger.log("Assigning fake ass people to play the game")
+		self.logger.info("Available characters lockdown")
+		self.logger.info("Assigning fake ass people to play the game")
 		# What's left over is the leftover characters, they cannot move for now bruh
 		# So create fake players as a standin
 		idx = 0
 		for s in self.availableCharacters:
-			self.logger.log("creating fake player for the %s piece of shit" % s)
+			self.logger.info("creating fake player for the %s piece of shit",s)
 			id = "asshole%d" % idx
-			fakeMeOut = Player(id,self.logger)
+			fakeMeOut = Player(id,self.catalog)
 			fakeMeOut.selectSuspect(s)
 			fakeMeOut.fakeAF = True
 			self.fakePlayers.append(fakeMeOut)
+			self.playersBySuspect[s] = fakeMeOut
 			idx += 1
 		
 		# Blow away all available characters that can be picked
@@ -357,28 +439,25 @@ class PlayerList:
 	# Returns the Player object that has the suspect name,
 	# If no Player could be found, None is returned
 	def getPlayerBySuspect(self,suspect):
-		ret = None
-		for player in self.players:
-			if player.getSuspect() == suspect:
-				ret = player
+		ret = self.playersBySuspect.get(suspect)
+		if ret != None and ret.fakeAF:
+			ret = None
 		return ret
 	
 	# Returns all players, including fake ones
 	def getPlayerBySuspect2(self,suspect):
-		ret = self.getPlayerBySuspect(suspect)
-		# Get the fake people
-		if ret == None:
-			for p in self.fakePlayers:
-				if p.getSuspect() == suspect:
-					ret = p
-		return ret
+		return self.playersBySuspect.get(suspect)
 		
 	# Removes the player from the playerlist and returns the player object
 	def removePlayer(self,playerId):
 		target = self.getPlayer(playerId)
 		if target != None: # TODO this might need to be verified
-			self.logger.log("Removing player %s" % playerId)
+			self.logger.bind(player=playerId).info("Removing player %s",playerId)
 			self.players.remove(target)
+			self.leaveTurnOrder(target)
+			del self.playersById[playerId]
+			if self.playersBySuspect.get(target.getSuspect()) == target:
+				del self.playersBySuspect[target.getSuspect()]
 		return target
 
 	# Assigns the suspect to the player. If the suspect is already assigned
@@ -389,9 +468,14 @@ class PlayerList:
 		if suspect not in self.availableCharacters:
 			raise GameException(playerId,("%s has already been picked" % suspect))
 		elif suspect in SUSPECTS:
+			self.logger.bind(player=playerId).info("Assigning %s to %s",suspect,playerId)
+			self.leaveTurnOrder(player)
+			self.playersBySuspect.pop(player.getSuspect(),None)
 			player.selectSuspect(suspect) 				# Assign the player to the suspect
+			self.playersBySuspect[suspect] = player
+			self.joinTurnOrder(player)
 			self.availableCharacters.remove(suspect)	# Remove the suspect from the list of available characters
-			self.logger.log("Available characters: %s" % (self.availableCharacters))
+			self.logger.debug("Available characters: %s",self.availableCharacters)
 		else:
 			raise GameException(playerId,("%s is not a suspect name" % suspect))
 
@@ -402,18 +486,20 @@ class PlayerList:
 # versus WHAT HAPPENS UNDER THE HOOD. If a class is fucked, then we can
 # at least narrow down the shit.
 class Suggestion:
+	__slots__ = ("accuser","suspect","weapon","room","catalog","mask","disprovals")
 
 	# Note that all parameters MUST be strings.
-	def __init__(self,accuser,suspect,weapon,room,logger):
+	# The suggested cards are also held as a mask of the card catalog.
+	# The logger is only used to log the suggestion, it is not kept.
+	def __init__(self,accuser,suspect,weapon,room,logger,catalog=None):
 		if suspect.__class__ != str:
-			raise GameError("make sure suspect in Suggestion is a string")
+			raise BackException("make sure suspect in Suggestion is a string")
 		if weapon.__class__ != str:
-			raise GameError("make sure weapon in Suggestion is a string")
+			raise BackException("make sure weapon in Suggestion is a string")
 		if room.__class__ != str:
-			raise GameError("make sure room in Suggestion is a string")
+			raise BackException("make sure room in Suggestion is a string")
 			
-		self.logger = logger
-		self.logger.log("spawned Suggestion %s %s %s" % (suspect,weapon,room))
+		logger.info("spawned Suggestion %s %s %s",suspect,weapon,room)
 		
 		# This is the player object that made the suggestion
 		self.accuser = accuser
@@ -421,6 +507,22 @@ class Suggestion:
 		self.suspect = suspect
 		self.weapon = weapon
 		self.room = room
+		self.catalog = getCardCatalog() if catalog == None else catalog
+		self.mask = self.catalog.getTripleMask(suspect,weapon,room)
+		self.disprovals = None # see PlayerList.resolveDisproval(), None if not resolved
+
+	# Returns the mask of the cards the player may show to disprove the
+	# resolved suggestion, 0 if he cannot
+	def getDisproval(self,player):
+		for defender, mask in self.disprovals:
+			if defender == player:
+				return mask
+		return 0
+
+	# Returns the player that must disprove the resolved suggestion: the
+	# first one that can, the accuser if nobody can
+	def getDefender(self):
+		return self.accuser if len(self.disprovals) == 0 else self.disprovals[0][0]
 	
 	# This returns True if the Suggestion can be countered
 	# False otherwise. The counter object can be either
@@ -428,6 +530,10 @@ class Suggestion:
 	# the suspect player can hold a card of himself, ergo
 	# he has an alibi.)
 	def counter(self,counter):
+		# Names that are not cards of their category can only be
+		# compared by name
+		if countCards(self.mask) == 3:
+			return (self.catalog.getBit(counter) & self.mask) != 0
 		ret = False
 		if counter == self.suspect:
 			ret = True
@@ -439,17 +545,18 @@ class Suggestion:
 	
 # Class definition of an Accusation. See Suggestion.
 class Accusation:
+	__slots__ = ("accuser","suspect","weapon","room","catalog","mask")
+
 	# Note that all parameters MUST be strings.
-	def __init__(self,accuser,suspect,weapon,room,logger):
+	def __init__(self,accuser,suspect,weapon,room,logger,catalog=None):
 		if suspect.__class__ != str:
-			raise GameError("make sure suspect in Accusation is a string")
+			raise BackException("make sure suspect in Accusation is a string")
 		if weapon.__class__ != str:
-			raise GameError("make sure weapon in Accusation is a string")
+			raise BackException("make sure weapon in Accusation is a string")
 		if room.__class__ != str:
-			raise GameError("make sure room in Accusation is a string")
+			raise BackException("make sure room in Accusation is a string")
 			
-		self.logger = logger
-		self.logger.log("spawned Accusation %s %s %s" % (suspect,weapon,room))
+		logger.info("spawned Accusation %s %s %s",suspect,weapon,room)
 		
 		# This is a player object that created the accusation
 		self.accuser = accuser
@@ -457,6 +564,8 @@ class Accusation:
 		self.suspect = suspect
 		self.weapon = weapon
 		self.room = room
+		self.catalog = getCardCatalog() if catalog == None else catalog
+		self.mask = self.catalog.getTripleMask(suspect,weapon,room)
 	
 	def __str__(self):
 		return "%s in the %s with the %s" % (self.suspect,self.room,self.weapon)
@@ -467,6 +576,10 @@ class Accusation:
 	# the target player can hold a card of himself, ergo
 	# he has an alibi.)
 	def counter(self,counter):
+		# Names that are not cards of their category can only be
+		# compared by name
+		if countCards(self.mask) == 3:
+			return (self.catalog.getBit(counter) & self.mask) != 0
 		ret = False
 		if counter == self.suspect:
 			ret = True
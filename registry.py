@@ -0,0 +1,142 @@
+#!/usr/bin/python3
+################################################################################
+# File:            registry.py
+# Subcomponent:    Clueless/Backend
+# Language:        python3
+# Author:          Nate Lao (nlao1@jh.edu)
+# Date Created:    10/18/2026
+# Description:
+#			Owns every Game instance hosted by one server process. Games are
+#			created, looked up and retired by a game id. The id space is
+#			split over a fixed number of shards, each with its own lock, and
+#			every game has its own lock for dispatching interface calls, so
+#			work on one game never blocks another.
+#
+################################################################################
+
+import threading
+import uuid
+
+from utils import *
+from globals import *
+from game import Game
+from instruments import GameInstruments
+
+# Number of shards the game ids are spread over. A power of two keeps
+# the shard selection to a hash and a mask.
+REGISTRY_SHARDS = 64
+
+# A hosted game and the lock that serializes calls made against it
+class GameEntry:
+	def __init__(self,gameId,game):
+		self.gameId = gameId
+		self.game = game
+		self.lock = threading.Lock()
+
+# One slice of the game id space
+class RegistryShard:
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.entries = {}		# gameId -> GameEntry
+
+# Holds every Game instance in the process keyed by the game id.
+# The shard locks only guard the id -> game mapping; calls into a game
+# are serialized by the game's own lock (see dispatch()).
+class GameRegistry:
+	# If <instrument> is True every game is created with its instruments
+	# turned on, see getInstruments().
+	def __init__(self,shards=REGISTRY_SHARDS,logger=None,instrument=False):
+		if shards <= 0 or (shards & (shards - 1)) != 0:
+			raise BackException("the number of registry shards must be a power of two")
+		self.mask = shards - 1
+		self.shards = [RegistryShard() for idx in range(0,shards)]
+		# Every hosted game logs through a child of this logger tagged
+		# with its game id
+		self.logger = Logger() if logger == None else logger
+		self.instrument = instrument
+		self.retired = GameInstruments() # instruments of the retired games
+		self.retiredLock = threading.Lock()
+
+	def __len__(self):
+		count = 0
+		for shard in self.shards:
+			count += len(shard.entries)
+		return count
+
+	def __contains__(self,gameId):
+		return gameId in self.getShard(gameId).entries
+
+	# Returns the shard responsible for the game id
+	def getShard(self,gameId):
+		return self.shards[hash(gameId) & self.mask]
+
+	# Creates a new Game and registers it.
+	# If no game id is given a unique one is generated.
+	# The seed of the game may be given to replay a game, and the
+	# BoardLayout to play on another board than the classic one.
+	# Returns the game id of the new game.
+	def createGame(self,gameId=None,seed=None,autoDisprove=False,layout=None):
+		if gameId == None:
+			gameId = uuid.uuid4().hex
+		entry = GameEntry(gameId,Game(self.logger.bind(game=gameId),seed,autoDisprove,layout))
+		if self.instrument:
+			entry.game.enableInstruments()
+		shard = self.getShard(gameId)
+		with shard.lock:
+			if gameId in shard.entries:
+				raise BackException("game %s already exists" % gameId)
+			shard.entries[gameId] = entry
+		return gameId
+
+	# Returns the Game instance registered under the game id,
+	# If no game could be found, None is returned
+	def getGame(self,gameId):
+		entry = self.getShard(gameId).entries.get(gameId)
+		return None if entry == None else entry.game
+
+	# Removes the game from the registry and returns the Game instance
+	# If no game could be found, None is returned
+	def retireGame(self,gameId):
+		shard = self.getShard(gameId)
+		with shard.lock:
+			entry = shard.entries.pop(gameId,None)
+		if entry == None:
+			return None
+		# Wait for any call in flight on the game to finish
+		with entry.lock:
+			if entry.game.instruments != None:
+				with self.retiredLock:
+					self.retired.merge(entry.game.instruments)
+			return entry.game
+
+	# Calls the interface method <method> of the game with the given
+	# arguments, keyword ones included, while holding the game's lock.
+	# Returns whatever the method returns.
+	def dispatch(self,gameId,method,*args,**kwargs):
+		entry = self.getShard(gameId).entries.get(gameId)
+		if entry == None:
+			raise GameException("all","game %s does not exist" % gameId)
+		with entry.lock:
+			return getattr(entry.game,method)(*args,**kwargs)
+
+	# Returns a list of the game ids of every hosted game
+	def getGameIds(self):
+		ret = []
+		for shard in self.shards:
+			with shard.lock:
+				ret.extend(shard.entries.keys())
+		return ret
+
+	# Returns the GameInstruments adding up every game hosted so far,
+	# retired ones included. Empty unless the registry instruments games.
+	def getInstruments(self):
+		ret = GameInstruments()
+		with self.retiredLock:
+			ret.merge(self.retired)
+		for shard in self.shards:
+			with shard.lock:
+				entries = list(shard.entries.values())
+			for entry in entries:
+				if entry.game.instruments != None:
+					ret.merge(entry.game.instruments)
+		return ret
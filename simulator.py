@@ -0,0 +1,320 @@
+#!/usr/bin/python3
+################################################################################
+# File:            simulator.py
+# Subcomponent:    Clueless/Backend
+# Language:        python3
+# Author:          Nate Lao (nlao1@jh.edu)
+# Date Created:    10/18/2026
+# Description:
+#			Headless game simulator. Drives Game instances end to end with
+#			bot players and no server, over a pool of worker processes, and
+#			reports the throughput, the length of the games and the win
+#			rates. Used to load test the backend and to tune the rules.
+#			Usage: python3 simulator.py --games 1000 --players 4 [--board 5]
+#
+################################################################################
+
+import argparse
+import concurrent.futures
+import os
+import random
+import time
+
+from utils import *
+from globals import *
+from game import Game
+from gameboard import getGridLayout, getTopology
+
+# Number of actions after which a game is abandoned as unfinished
+MAX_ACTIONS = 2000
+
+# What a bot knows of the game: the latest payload it was sent on every
+# channel, as a client would see it, and the topology of the board
+class BotView:
+	def __init__(self,playerId,topology=None):
+		self.playerId = playerId
+		self.topology = getTopology() if topology == None else topology
+		self.rooms = self.topology.layout.rooms	# in the order of the layout, see pickAccusation()
+		self.roomNames = self.topology.roomNames	# for membership tests
+		self.payloads = {}		# channel -> latest payload
+		self.pending = False	# True while the bot's suggestion is in play
+		self.stale = 0			# suggestions made since the checklist last changed
+
+	def get(self,channel,default=None):
+		return self.payloads.get(channel,default)
+
+	# Returns the cards of the category that the bot has not seen yet
+	def getUnseen(self,category,cards):
+		seen = self.get(CHANNEL_CHECKLISTS,{}).get(category,[])
+		return [card for card in cards if card not in seen]
+
+	# Returns the position of the bot and the occupants of every position
+	# by id (see Gameboard.occupants), read from the gameboard payload
+	def getBoard(self):
+		suspect = self.get(CHANNEL_PLAYERSTATES)["suspect"]
+		occupants = [()] * len(self.topology.positions)
+		loc = None
+		for name, suspects in self.get(CHANNEL_GAMEBOARD,{}).items():
+			if len(suspects) > 0:
+				position = self.topology.locsByName[name]
+				occupants[position.id] = suspects
+				if suspect in suspects:
+					loc = position
+		return loc, occupants
+
+# Base bot policy: plays at random, and accuses once its checklist
+# leaves at most <confidence> suspect, weapon and room combinations.
+# Only one player defends a suggestion, so some cards may never be
+# shown: after <patience> suggestions without news the bot takes its
+# chances. A policy only picks actions, the simulator plays them. Every
+# pick gets the view of the bot and the random number generator of the
+# simulator, seeded with the seed of the game (see playGame()).
+class BotPolicy:
+	name = "random"
+	confidence = 2
+	patience = 6
+
+	# Returns the name of the location to move to, None to pass the turn
+	def pickMove(self,view,rng):
+		options = view.get(CHANNEL_MOVE_OPTIONS,[])
+		return rng.choice(options) if len(options) > 0 else None
+
+	# Returns the suspect and weapon to suggest
+	def pickSuggestion(self,view,rng):
+		menu = view.get(CHANNEL_SUGGESTION_OPTIONS)
+		return rng.choice(menu["suspects"]), rng.choice(menu["weapons"])
+
+	# Returns the card to disprove with, among the cards of the hand that
+	# counter the suggestion. None if the list is empty.
+	def pickDisproval(self,view,cards,rng):
+		return rng.choice(cards) if len(cards) > 0 else None
+
+	# Returns the suspect, weapon and room to accuse, None to wait
+	def pickAccusation(self,view,rng):
+		suspects = view.getUnseen("suspects",SUSPECTS)
+		weapons = view.getUnseen("weapons",WEAPONS)
+		rooms = view.getUnseen("rooms",view.rooms)
+		if self.isReady(view,len(suspects) * len(weapons) * len(rooms)):
+			return rng.choice(suspects), rng.choice(weapons), rng.choice(rooms)
+		return None
+
+	# Returns True if the bot accuses with <combinations> suspect, weapon
+	# and room combinations left by its checklist
+	def isReady(self,view,combinations):
+		return combinations <= self.confidence or view.stale >= self.patience
+
+# Plays its checklist: heads for rooms it has not seen and suggests
+# suspects and weapons it has not seen. A blind accusation is a loss
+# but for one chance in the combinations left, so the bot waits
+# <patience> suggestions without news for every one of them.
+class ChecklistPolicy(BotPolicy):
+	name = "checklist"
+	confidence = 1
+	patience = 1
+
+	def pickMove(self,view,rng):
+		options = view.get(CHANNEL_MOVE_OPTIONS,[])
+		unseen = view.getUnseen("rooms",[option for option in options if option in view.roomNames])
+		if len(unseen) > 0:
+			return rng.choice(unseen)
+		# Keep walking the passageways rather than staying in a known room
+		passageways = [option for option in options if option not in view.roomNames]
+		if len(passageways) > 0:
+			return rng.choice(passageways)
+		return BotPolicy.pickMove(self,view,rng)
+
+	def pickSuggestion(self,view,rng):
+		menu = view.get(CHANNEL_SUGGESTION_OPTIONS)
+		suspects = view.getUnseen("suspects",menu["suspects"])
+		weapons = view.getUnseen("weapons",menu["weapons"])
+		suspect = rng.choice(suspects) if len(suspects) > 0 else rng.choice(menu["suspects"])
+		weapon = rng.choice(weapons) if len(weapons) > 0 else rng.choice(menu["weapons"])
+		return suspect, weapon
+
+	def isReady(self,view,combinations):
+		return combinations <= self.confidence or view.stale >= self.patience * combinations
+
+# Plays its checklist, but when no room it has not seen is one move away
+# it takes the shortest way to the closest one, around the occupied
+# passageways (see BoardTopology.planRoute())
+class PlannerPolicy(ChecklistPolicy):
+	name = "planner"
+
+	def pickMove(self,view,rng):
+		options = view.get(CHANNEL_MOVE_OPTIONS,[])
+		unseen = view.getUnseen("rooms",[option for option in options if option in view.roomNames])
+		if len(unseen) > 0:
+			return rng.choice(unseen)
+		topology = view.topology
+		loc, occupants = view.getBoard()
+		if loc != None and loc is not topology.initial:
+			distances = topology.getDistances()[loc.id]
+			targets = [topology.locsByName[name] for name in view.getUnseen("rooms",topology.layout.rooms)]
+			targets.sort(key=lambda room: distances[room.id])
+			for target in targets:
+				move, turns = topology.planRoute(loc,target,occupants)
+				if move != None and move.getName() in options:
+					return move.getName()
+		return ChecklistPolicy.pickMove(self,view,rng)
+
+# Every policy the simulator knows, by name
+POLICIES = {
+	BotPolicy.name       : BotPolicy,
+	ChecklistPolicy.name : ChecklistPolicy,
+	PlannerPolicy.name   : PlannerPolicy
+}
+
+# Outcome of a set of games, merged across the workers
+class SimulationStats:
+	def __init__(self,numPlayers=0):
+		self.games = 0
+		self.finished = 0
+		self.turns = 0			# moves and passes, in every game
+		self.actions = 0		# every call to a processor, in every game
+		self.seats = {}			# policy name -> seats played
+		self.wins = {}			# policy name -> games won
+		self.seatWins = [0] * numPlayers # turn order position -> games won
+		self.elapsed = 0.0		# wall time of the whole simulation
+
+	def merge(self,other):
+		self.games += other.games
+		self.finished += other.finished
+		self.turns += other.turns
+		self.actions += other.actions
+		for name in other.seats:
+			self.seats[name] = self.seats.get(name,0) + other.seats[name]
+		for name in other.wins:
+			self.wins[name] = self.wins.get(name,0) + other.wins[name]
+		for idx in range(0,len(other.seatWins)):
+			self.seatWins[idx] += other.seatWins[idx]
+
+	def __str__(self):
+		games = max(self.games,1)
+		ret = ""
+		ret += "games           : %d (%d finished)\n" % (self.games,self.finished)
+		ret += "games/sec       : %.1f\n" % (self.games / self.elapsed if self.elapsed > 0 else 0.0)
+		ret += "turns per game  : %.1f\n" % (self.turns / float(games))
+		ret += "actions per game: %.1f\n" % (self.actions / float(games))
+		for name in sorted(self.seats.keys()):
+			ret += "win rate %-10s: %.3f\n" % (name,self.wins.get(name,0) / float(self.seats[name]))
+		for idx in range(0,len(self.seatWins)):
+			ret += "win rate seat %d : %.3f\n" % (idx,self.seatWins[idx] / float(games))
+		return ret
+
+# Plays one game with a bot per player, the seats take the policies in
+# turn. The game is played on the BoardLayout if one is given.
+# Returns the Game, the policy of every player and the number of turns
+# played.
+def playGame(seed,numPlayers,policies,maxActions=MAX_ACTIONS,autoDisprove=False,layout=None):
+	rng = random.Random(seed)
+	g = Game(Logger(level=LOG_OFF),seed,autoDisprove,layout)
+	bots = {}
+	for idx in range(0,numPlayers):
+		playerId = "bot%d" % idx
+		g.addPlayer(playerId)
+		g.selectSuspect(playerId,SUSPECTS[idx])
+		bots[playerId] = (BotView(playerId,g.gameboard.topology),POLICIES[policies[idx % len(policies)]]())
+	g.startGame()
+
+	turns = 0
+	for step in range(0,maxActions):
+		if g.state == STATE_END:
+			break
+		# Deliver what changed, the way the server pushes a cycle
+		cycle = g.getCycle(deltaOnly=True)
+		for channel in CHANNELS:
+			for entry in cycle[channel]:
+				view = bots[entry[PLAYER_ID]][0]
+				if channel == CHANNEL_CHECKLISTS and view.payloads.get(channel) != entry[PAYLOAD]:
+					view.stale = 0
+				view.payloads[channel] = entry[PAYLOAD]
+		playerId = cycle["gamestate"]["currentPlayerId"]
+		view, policy = bots[playerId]
+		view.payloads[CHANNEL_GAMEBOARD] = cycle[CHANNEL_GAMEBOARD]
+		status = view.get(CHANNEL_PLAYERSTATES)["status"]
+
+		if status == PLAYER_DEFEND:
+			suggestion = cycle["gamestate"]["suggestion"]
+			counters = [card for card in view.get(CHANNEL_CARDLISTS)["cardList"] if card in suggestion.values()]
+			card = policy.pickDisproval(view,counters,rng)
+			g.disproveSuggestion(playerId,card,None,card == None)
+		elif status == PLAYER_SUGGEST:
+			suspect, weapon = policy.pickSuggestion(view,rng)
+			view.pending = True
+			view.stale += 1
+			g.proposeSuggestion(playerId,suspect,weapon)
+		else:
+			accusation = policy.pickAccusation(view,rng)
+			move = None if view.pending else policy.pickMove(view,rng)
+			if accusation != None:
+				g.proposeAccusation(playerId,accusation[0],accusation[1],accusation[2])
+			elif move != None:
+				turns += 1
+				g.selectMove(playerId,move)
+			else:
+				# Nobody could disprove the suggestion, the turn is over
+				turns += 1
+				g.passTurn(playerId)
+			view.pending = False
+	return g, bots, turns
+
+# Plays the games seeded <seed> + start up to <seed> + stop, the first
+# seat of every game rotates over the policies. Returns the SimulationStats.
+def runBatch(start,stop,seed,numPlayers,policies,maxActions=MAX_ACTIONS,autoDisprove=False,layout=None):
+	stats = SimulationStats(numPlayers)
+	for idx in range(start,stop):
+		rotated = [policies[(seat + idx) % len(policies)] for seat in range(0,numPlayers)]
+		g, bots, turns = playGame(seed + idx,numPlayers,rotated,maxActions,autoDisprove,layout)
+		stats.games += 1
+		stats.turns += turns
+		stats.actions += len(g.journal)
+		for name in rotated:
+			stats.seats[name] = stats.seats.get(name,0) + 1
+		if g.state == STATE_END:
+			stats.finished += 1
+			players = g.playerlist.getPlayers()
+			winners = [p for p in players if p.state == PLAYER_WIN]
+			if len(winners) == 0:
+				winners = [p for p in players if p.state != PLAYER_LOSE]
+			for winner in winners:
+				seat = players.index(winner)
+				stats.wins[rotated[seat]] = stats.wins.get(rotated[seat],0) + 1
+				stats.seatWins[seat] += 1
+	return stats
+
+# Plays <games> games of <numPlayers> bots over <workers> processes
+# (all CPUs if None, in this process if 1). Returns the SimulationStats.
+def simulate(games,numPlayers=4,policies=None,seed=0,workers=None,maxActions=MAX_ACTIONS,autoDisprove=False,layout=None):
+	policies = list(POLICIES.keys()) if policies == None else policies
+	for name in policies:
+		if name not in POLICIES:
+			raise BackException("unknown bot policy %s" % name)
+	workers = (os.cpu_count() or 1) if workers == None else workers
+	stats = SimulationStats(numPlayers)
+	start = time.perf_counter()
+	if workers <= 1:
+		stats.merge(runBatch(0,games,seed,numPlayers,policies,maxActions,autoDisprove,layout))
+	else:
+		# A few batches per worker keeps them all busy until the end
+		size = max(1,games // (workers * 4))
+		with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+			futures = [pool.submit(runBatch,idx,min(idx + size,games),seed,numPlayers,policies,maxActions,autoDisprove,layout)
+				for idx in range(0,games,size)]
+			for future in futures:
+				stats.merge(future.result())
+	stats.elapsed = time.perf_counter() - start
+	return stats
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Plays Clueless games with bot players")
+	parser.add_argument("--games",type=int,default=1000)
+	parser.add_argument("--players",type=int,default=4)
+	parser.add_argument("--policies",default=",".join(POLICIES.keys()),help="comma separated bot policies, given to the seats in turn")
+	parser.add_argument("--seed",type=int,default=0)
+	parser.add_argument("--workers",type=int,default=None,help="worker processes, all CPUs by default")
+	parser.add_argument("--max-actions",type=int,default=MAX_ACTIONS)
+	parser.add_argument("--auto-disprove",action="store_true",help="let the games disprove suggestions")
+	parser.add_argument("--board",type=int,default=None,help="play on a N x N board instead of the classic one")
+	args = parser.parse_args()
+	layout = None if args.board == None else getGridLayout(args.board)
+	print(simulate(args.games,args.players,args.policies.split(","),args.seed,args.workers,args.max_actions,args.auto_disprove,layout),end="")
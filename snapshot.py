@@ -0,0 +1,260 @@
+#!/usr/bin/python3
+################################################################################
+# File:            snapshot.py
+# Subcomponent:    Clueless/Backend
+# Language:        python3
+# Author:          Nate Lao (nlao1@jh.edu)
+# Date Created:    10/18/2026
+# Description:
+#			Contains the binary snapshot of a game, used to checkpoint games
+#			and to hand them off between processes. See Game.snapshot() and
+#			Game.restore().
+#
+################################################################################
+
+import struct
+
+from utils import *
+from globals import *
+from cards import *
+from players import *
+from gameboard import BoardLayout
+
+# Binary layout, all integers are big endian:
+#   header    : magic "CLS", version (u8), seed (u64), game state (u8),
+#               defense counter (u8), available suspects (u8 mask over SUSPECTS),
+#               flags (u8, SNAPSHOT_AUTO_DISPROVE if the game disproves
+#               suggestions, SNAPSHOT_LAYOUT if it is not played on the
+#               classic board). Version 1 snapshots have no flags.
+#   layout    : the BoardLayout of the game (see BoardLayout.encode()), only
+#               with SNAPSHOT_LAYOUT
+#   players   : number of players (u8), number of NPCs (u8), then one record
+#               per player followed by one per NPC:
+#                   id (str), suspect (u8), state (u8), checklist (card mask),
+#                   message (str), message color (str)
+#               The card mask is an unsigned integer of one byte per 8 cards
+#               of the catalog, 8 bytes at least (a u64 on the classic board).
+#   turn      : index of the current player in the records above (u8)
+#   board     : number of placed players (u8), then (player index (u8),
+#               position id (u8)) pairs in the order of the board occupancy
+#   cards     : case file suspect, weapon and room card ids (u8 each), then
+#               for every player the size of his hand (u8) and its card ids
+#   suggestion: flag (u8), then the accuser index (u8) and the suspect,
+#               weapon and room (card)
+# A str is its utf-8 length (u16) and bytes. A card is its id in the card
+# catalog (u8), or NONE_ID followed by a str for a name outside of it.
+# NONE_ID stands for "nothing" wherever an index or id is expected, so a
+# board of NONE_ID positions or cards or more cannot be snapshot.
+SNAPSHOT_MAGIC = b"CLS"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = struct.Struct(">3sBQBBBB")
+SNAPSHOT_HEADER_V1 = struct.Struct(">3sBQBBB")
+SNAPSHOT_AUTO_DISPROVE = 0x01
+SNAPSHOT_LAYOUT = 0x02
+SNAPSHOT_U8 = struct.Struct(">B")
+SNAPSHOT_U16 = struct.Struct(">H")
+SNAPSHOT_PAIR = struct.Struct(">BB")
+SNAPSHOT_TRIPLE = struct.Struct(">BBB")
+SNAPSHOT_PLAYER = struct.Struct(">BB")
+SNAPSHOT_MASK_SIZE = 8
+NONE_ID = 0xFF
+
+# Every enumerated value is stored as its index in these lists
+GAME_STATES = [STATE_INITIAL,STATE_STARTED,STATE_MOVE,STATE_MOVED,STATE_SUGGESTION,STATE_ACCUSATION,STATE_END]
+PLAYER_STATES = [PLAYER_INITIAL,PLAYER_IN_PLAY,PLAYER_SUGGEST,PLAYER_DEFEND,PLAYER_MOVE,PLAYER_MOVED,PLAYER_WIN,PLAYER_LOSE,PLAYER_LOCKED]
+
+# Returns the header of a snapshot as (seed, game state, defense counter,
+# available suspects, flags, board layout, size of the header). The layout
+# is None for the classic board.
+def readSnapshotHeader(data):
+	magic, version = data[0:3], data[3]
+	if magic != SNAPSHOT_MAGIC or version not in (1,SNAPSHOT_VERSION):
+		raise BackException("not a version %d game snapshot" % SNAPSHOT_VERSION)
+	if version == 1:
+		magic, version, seed, state, counter, available = SNAPSHOT_HEADER_V1.unpack_from(data,0)
+		return seed, state, counter, available, 0, None, SNAPSHOT_HEADER_V1.size
+	magic, version, seed, state, counter, available, flags = SNAPSHOT_HEADER.unpack_from(data,0)
+	layout = None
+	size = SNAPSHOT_HEADER.size
+	if flags & SNAPSHOT_LAYOUT:
+		layout, size = BoardLayout.decode(data,size)
+	return seed, state, counter, available, flags, layout, size
+
+# Returns the number of bytes of a card mask of the catalog
+def getMaskSize(catalog):
+	return max(SNAPSHOT_MASK_SIZE,(len(catalog.names) + 7) // 8)
+
+# Returns the seed stored in a snapshot
+def getSnapshotSeed(data):
+	return readSnapshotHeader(data)[0]
+
+# Returns the keyword arguments of Game() for the game of a snapshot
+def getSnapshotOptions(data):
+	seed, state, counter, available, flags, layout, size = readSnapshotHeader(data)
+	return {"seed" : seed, "autoDisprove" : (flags & SNAPSHOT_AUTO_DISPROVE) != 0, "layout" : layout}
+
+# Returns the snapshot of the game as bytes
+def writeSnapshot(game):
+	playerlist = game.playerlist
+	catalog = game.cardmanager.catalog
+	maskSize = getMaskSize(catalog)
+	chunks = []
+	if len(game.gameboard.getAllPositions()) >= NONE_ID or len(catalog.names) >= NONE_ID:
+		raise BackException("the board is too large to be snapshot")
+
+	def putStr(value):
+		data = value.encode("utf-8")
+		chunks.append(SNAPSHOT_U16.pack(len(data)))
+		chunks.append(data)
+
+	def putCard(name):
+		idx = catalog.ids.get(name)
+		if idx == None:
+			chunks.append(SNAPSHOT_U8.pack(NONE_ID))
+			putStr(name)
+		else:
+			chunks.append(SNAPSHOT_U8.pack(idx))
+
+	def cardId(card):
+		return NONE_ID if card == None else catalog.ids[card.name]
+
+	available = 0
+	for suspect in playerlist.getAvailableCharacters():
+		available |= 1 << SUSPECTS.index(suspect)
+	flags = SNAPSHOT_AUTO_DISPROVE if game.autoDisprove else 0
+	if game.layout != None:
+		flags |= SNAPSHOT_LAYOUT
+	chunks.append(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC,SNAPSHOT_VERSION,game.seed,
+		GAME_STATES.index(game.state),playerlist.specialCounter,available,flags))
+	if game.layout != None:
+		chunks.append(game.layout.encode())
+
+	# Players and NPCs
+	everyone = playerlist.getPlayers() + playerlist.fakePlayers
+	index = {}
+	for idx in range(0,len(everyone)):
+		index[everyone[idx]] = idx
+	chunks.append(SNAPSHOT_PAIR.pack(len(playerlist.getPlayers()),len(playerlist.fakePlayers)))
+	for player in everyone:
+		putStr(player.playerId)
+		suspect = NONE_ID if player.suspect == None else SUSPECTS.index(player.suspect)
+		chunks.append(SNAPSHOT_PLAYER.pack(suspect,PLAYER_STATES.index(player.state)))
+		chunks.append(player.checklist.to_bytes(maskSize,"big"))
+		putStr(player.message)
+		putStr(player.messageColor)
+	current = playerlist.getCurrentPlayer()
+	chunks.append(SNAPSHOT_U8.pack(NONE_ID if current == None else index[current]))
+
+	# Board occupancy
+	placed = []
+	for position in game.gameboard.getAllPositions():
+		for player in game.gameboard.getPlayers(position):
+			placed.append(SNAPSHOT_PAIR.pack(index[player],position.id))
+	chunks.append(SNAPSHOT_U8.pack(len(placed)))
+	chunks.extend(placed)
+
+	# Case file and hands, in the order they were dealt
+	casefile = game.cardmanager.casefile
+	if casefile == None:
+		chunks.append(SNAPSHOT_TRIPLE.pack(NONE_ID,NONE_ID,NONE_ID))
+	else:
+		chunks.append(SNAPSHOT_TRIPLE.pack(cardId(casefile.suspectCard),cardId(casefile.weaponCard),cardId(casefile.roomCard)))
+	for player in playerlist.getPlayers():
+		hand = game.cardmanager.getCards(player)
+		chunks.append(SNAPSHOT_U8.pack(len(hand)))
+		chunks.append(bytes([cardId(card) for card in hand]))
+
+	# Suggestion in play
+	suggestion = game.suggestion
+	if suggestion == None:
+		chunks.append(SNAPSHOT_U8.pack(0))
+	else:
+		chunks.append(SNAPSHOT_PAIR.pack(1,index[suggestion.accuser]))
+		putCard(suggestion.suspect)
+		putCard(suggestion.weapon)
+		putCard(suggestion.room)
+
+	return b"".join(chunks)
+
+# Loads the snapshot into <game>, a Game that was just created with the
+# options of the snapshot (see getSnapshotOptions())
+def readSnapshot(game,data):
+	playerlist = game.playerlist
+	cardmanager = game.cardmanager
+	catalog = cardmanager.catalog
+	maskSize = getMaskSize(catalog)
+	offset = [0]
+
+	def take(fmt):
+		values = fmt.unpack_from(data,offset[0])
+		offset[0] += fmt.size
+		return values
+
+	def getStr():
+		length, = take(SNAPSHOT_U16)
+		value = data[offset[0]:offset[0] + length].decode("utf-8")
+		offset[0] += length
+		return value
+
+	def getCard():
+		idx, = take(SNAPSHOT_U8)
+		return getStr() if idx == NONE_ID else catalog.names[idx]
+
+	seed, state, counter, available, flags, layout, offset[0] = readSnapshotHeader(data)
+	game.state = GAME_STATES[state]
+	playerlist.specialCounter = counter
+	playerlist.availableCharacters = [SUSPECTS[idx] for idx in range(0,len(SUSPECTS)) if available & (1 << idx)]
+
+	# Players and NPCs
+	numPlayers, numFakes = take(SNAPSHOT_PAIR)
+	everyone = []
+	for idx in range(0,numPlayers + numFakes):
+		player = Player(getStr(),catalog)
+		suspect, pstate = take(SNAPSHOT_PLAYER)
+		player.suspect = None if suspect == NONE_ID else SUSPECTS[suspect]
+		player.state = PLAYER_STATES[pstate]
+		player.checklist = int.from_bytes(data[offset[0]:offset[0] + maskSize],"big")
+		offset[0] += maskSize
+		player.message = getStr()
+		player.messageColor = getStr()
+		player.fakeAF = (idx >= numPlayers)
+		everyone.append(player)
+	playerlist.players = everyone[:numPlayers]
+	playerlist.fakePlayers = everyone[numPlayers:]
+	playerlist.rebuildIndexes()
+	current, = take(SNAPSHOT_U8)
+	playerlist.currentPlayer = None if current == NONE_ID else everyone[current]
+
+	# Board occupancy
+	numPlaced, = take(SNAPSHOT_U8)
+	positions = game.gameboard.getAllPositions()
+	for idx in range(0,numPlaced):
+		player, position = take(SNAPSHOT_PAIR)
+		game.gameboard.placePlayer(everyone[player],positions[position])
+
+	# Case file and hands
+	suspect, weapon, room = take(SNAPSHOT_TRIPLE)
+	if suspect != NONE_ID:
+		cards = [cardmanager.cards[suspect],cardmanager.cards[weapon],cardmanager.cards[room]]
+		cardmanager.casefile = CaseFile(cards[0],cards[1],cards[2])
+		for card in cards:
+			card.assignTo(cardmanager.casefile)
+	for player in playerlist.getPlayers():
+		size, = take(SNAPSHOT_U8)
+		for card in data[offset[0]:offset[0] + size]:
+			cardmanager.cards[card].assignTo(player)
+		offset[0] += size
+
+	# Suggestion in play
+	flag, = take(SNAPSHOT_U8)
+	if flag:
+		accuser, = take(SNAPSHOT_U8)
+		suspect = getCard()
+		weapon = getCard()
+		room = getCard()
+		game.suggestion = Suggestion(everyone[accuser],suspect,weapon,room,game.logger,catalog)
+		if game.autoDisprove:
+			game.suggestion.disprovals = playerlist.resolveDisproval(game.suggestion,cardmanager)
+
+	if offset[0] != len(data):
+		raise BackException("trailing bytes after the game snapshot")
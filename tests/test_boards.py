@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+# Functional Regression test for the board variants
+import sys
+sys.path.append('..')
+
+from testing_utils import *
+from game import *
+from journal import *
+
+# Returns a started game of the variant with <numPlayers> players
+def variantGame(layout,seed,numPlayers=3):
+	g = Game(Logger(level=LOG_OFF),seed,layout=layout)
+	for idx in range(0,numPlayers):
+		g.addPlayer("player%d" % idx)
+		g.selectSuspect("player%d" % idx,SUSPECTS[idx])
+	g.startGame()
+	return g
+
+# A 5x5 board: 25 rooms, 40 passageways, the secret passages join the
+# opposite corners
+layout = getGridLayout(5)
+topology = getTopology(layout)
+assertTrue(topology is getTopology(getGridLayout(5)))
+assertTrue(topology is not getTopology())
+assertTrue(topology.dimension == 5)
+assertTrue(len(topology.rooms) == 25 and len(topology.passageways) == 40)
+assertTrue(topology.roomsByCoor[(4,4)].secretpassage is topology.roomsByCoor[(0,0)])
+assertTrue(topology.roomsByCoor[(0,4)].secretpassage is topology.roomsByCoor[(4,0)])
+
+# The suspects start on distinct passageways along the edge of the board
+starts = list(topology.initialPassageways.values())
+assertTrue(len(set(starts)) == len(SUSPECTS))
+for pway in starts:
+	coordinates = [pway.roomA.getX(),pway.roomA.getY(),pway.roomB.getX(),pway.roomB.getY()]
+	assertTrue(0 in coordinates or 4 in coordinates)
+
+# The rooms of the board are the room cards of the game
+g = variantGame(layout,4)
+assertTrue(g.gameboard.dimension == 5)
+assertTrue(g.cardmanager.catalog.getNames(g.cardmanager.catalog.roomMask) == list(layout.rooms))
+assertTrue(g.cardmanager.casefile.roomCard.name in layout.rooms)
+assertTrue(list(g.buildAccusationOptions(g.playerlist.getCurrentPlayer())["rooms"]) == list(layout.rooms))
+scarlet = g.playerlist.getPlayerBySuspect("Miss Scarlet")
+assertTrue(g.gameboard.getMoveOptions(scarlet) == [topology.initialPassageways["Miss Scarlet"]])
+assertTrue("Room A1" in str(g) and "Room E5" in str(g))
+
+# The layout goes along with the journal and the snapshot
+g.selectMove("player0",topology.initialPassageways["Miss Scarlet"].getName())
+journal = Journal.decode(g.journal.encode())
+assertTrue(journal.layout == layout)
+assertTrue(Game.replay(journal).gameboard.getGameboard() == g.gameboard.getGameboard())
+r = Game.restore(g.snapshot(),Logger(level=LOG_OFF))
+assertTrue(r.layout == layout)
+assertTrue(r.snapshot() == g.snapshot())
+
+# An 8x8 board has more cards than a u64 checklist could hold
+g = variantGame(getGridLayout(8),4)
+player = g.playerlist.getPlayer("player1")
+player.updateChecklistMask(g.cardmanager.catalog.getMask(["Room H8","Rope"]))
+r = Game.restore(g.snapshot(),Logger(level=LOG_OFF))
+assertTrue("Room H8" in r.playerlist.getPlayer("player1").getChecklist()["rooms"])
+
+# The classic board is not written out
+g = variantGame(None,4)
+assertTrue(g.layout == None)
+assertTrue(Journal.decode(g.journal.encode()).layout == None)
+assertTrue(g.cardmanager.catalog is getCardCatalog())
+
+# Secret passages and starting passageways may be chosen
+layout = getGridLayout(4,secretPassages=[("Room B2","Room C3")],initial=[(0,1),(1,2),(2,3),(3,7),(7,11),(11,15)])
+topology = getTopology(layout)
+assertTrue(topology.roomsByCoor[(1,1)].secretpassage is topology.roomsByCoor[(2,2)])
+assertTrue(topology.roomsByCoor[(0,0)].secretpassage == None)
+assertTrue(topology.initialPassageways["Professor Plum"].getName() == "Room D3-Room D4")
+
+# Layouts that cannot make a board
+def invalid(layout):
+	try:
+		BoardTopology(layout)
+		assertTrue(False)
+	except BackException:
+		assertTrue(True)
+invalid(BoardLayout(ROOMS[:8]))
+invalid(BoardLayout(ROOMS,[("Study","Attic")]))
+invalid(BoardLayout(ROOMS,SECRET_PASSAGES,INITIAL[:5]))
+invalid(BoardLayout(ROOMS,SECRET_PASSAGES,[(0,4)] + INITIAL[1:]))
+invalid(BoardLayout(ROOMS,SECRET_PASSAGES,[(2,5)] + INITIAL[1:]))
+invalid(BoardLayout(["Hall"] + ROOMS[1:]))
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+# Validates the cached global payloads against freshly built ones
+import sys
+sys.path.append('..')
+
+from testing_utils import *
+from game import *
+
+# The cached payloads and their encodings must match a fresh build
+def compare(g):
+	assertTrue(g.getGamestate() == g.buildGamestate())
+	assertTrue(g.getGameboard() == g.gameboard.getGameboard())
+	assertTrue(g.getGamestateEncoded() == encodePayload(g.buildGamestate()))
+	assertTrue(g.getGameboardEncoded() == encodePayload(g.gameboard.getGameboard()))
+
+g = Game(seed=2020)
+compare(g)
+g.addPlayer("Bob")
+compare(g)
+g.addPlayer("Nancy")
+g.addPlayer("Rose")
+g.selectSuspect("Bob","Colonel Mustard")
+compare(g)
+g.selectSuspect("Nancy","Miss Scarlet")
+g.selectSuspect("Rose","Professor Plum")
+compare(g)
+g.startGame()
+compare(g)
+
+# Polling without any action hands out the same objects
+gamestate = g.getGamestate()
+encoded = g.getGameboardEncoded()
+assertTrue(g.getGamestate() is gamestate)
+assertTrue(g.getGameboardEncoded() is encoded)
+
+g.selectMove("Nancy","Hall-Lounge")
+compare(g)
+assertFalse(g.getGamestate() is gamestate)
+g.selectMove("Nancy","Hall") # rejected, not her turn
+compare(g)
+g.selectMove("Bob","Dining Room-Lounge")
+g.selectMove("Rose","Library-Study")
+compare(g)
+g.passTurn("Nancy")
+compare(g)
+g.selectMove("Nancy","Hall")
+compare(g)
+g.startSuggestion("Nancy")
+compare(g)
+g.proposeSuggestion("Nancy","Colonel Mustard","Rope")
+compare(g)
+g.disproveSuggestion("Bob",None,None,True)
+compare(g)
+g.startAccusation("Bob")
+compare(g)
+g.proposeAccusation("Bob","Miss Scarlet","Rope","Hall")
+compare(g)
+g.removePlayer("Rose")
+compare(g)
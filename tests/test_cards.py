@@ -12,9 +12,9 @@ from players import *
 from utils import *
 l = Logger()
 
-p = Player("Ash",l)
-p1 = Player("loser",l)
-c = Card("Blue Eyes White Dragon",l)
+p = Player("Ash")
+p1 = Player("loser")
+c = Card("Blue Eyes White Dragon")
 
 assertTrue(c.getOwner() == CARD_UNASSIGNED)
 assertTrue(c.isUnassigned())
@@ -29,3 +29,70 @@ try:
 except:
 	assertTrue(True)
 
+
+# Dealing: the case file gets one card of each type, the rest is dealt
+# around the table and indexed by owner
+pl = PlayerList(l)
+for name in ["Ash","Misty","Brock","Gary"]:
+	pl.addPlayer(name)
+cm = CardManager(l)
+cm.loadCaseFile()
+cm.assign(pl)
+assertTrue(len(cm.getAvailableCards()) == 0)
+assertTrue(len(cm.getCards(cm.casefile)) == 3)
+sizes = [len(cm.getCards(p)) for p in pl.getPlayers()]
+assertTrue(sizes == [5,5,4,4])
+for p in pl.getPlayers():
+	assertTrue(all(card.getOwner() == p for card in cm.getCards(p)))
+	assertTrue(cm.getCardNames(p) == [card.getName() for card in cm.getCards(p)])
+assertTrue(cm.getCards(p1) == [])
+
+# Checklists are masks, sorted out by category when returned
+p.updateChecklist("Rope")
+p.updateChecklist("Miss Scarlet")
+p.updateChecklist("Rope")
+p.updateChecklist("Blue Eyes White Dragon")
+p.updateChecklistMask(getCardCatalog().getMask(["Kitchen","Candlestick"]))
+assertTrue(p.getChecklist() == {"suspects":["Miss Scarlet"],"weapons":["Candlestick","Rope"],"rooms":["Kitchen"]})
+assertTrue(Card("Rope").isWeapon())
+assertFalse(Card("Rope").isRoom())
+
+# A game deals the same cards from the same seed
+def dealt(seed):
+	g = Game(seed=seed)
+	for name, suspect in [("Ash","Miss Scarlet"),("Misty","Mrs White"),("Brock","Mr Green")]:
+		g.addPlayer(name)
+		g.selectSuspect(name,suspect)
+	g.startGame()
+	hands = [g.cardmanager.getCardNames(p) for p in g.playerlist.getPlayers()]
+	return hands, g.cardmanager.getCardNames(g.cardmanager.casefile)
+assertTrue(dealt(1234) == dealt(1234))
+assertFalse(dealt(1234) == dealt(4321))
+assertTrue(Game(seed=99).seed == 99)
+
+# The option menus are built once and shared
+catalog = getCardCatalog()
+menu = catalog.getAccusationMenu()
+assertTrue(menu is catalog.getAccusationMenu())
+assertTrue(list(menu["suspects"]) == SUSPECTS and list(menu["weapons"]) == WEAPONS and list(menu["rooms"]) == ROOMS)
+assertTrue(menu.getEncoded() == encodePayload({"suspects":SUSPECTS,"weapons":WEAPONS,"rooms":ROOMS}))
+kitchen = catalog.getSuggestionMenu("Kitchen")
+assertTrue(kitchen is catalog.getSuggestionMenu("Kitchen"))
+assertTrue(kitchen["rooms"] == ("Kitchen",))
+assertFalse(kitchen is catalog.getSuggestionMenu("Hall"))
+try:
+	kitchen["rooms"] = ("Hall",)
+	assertTrue(False)
+except BackException:
+	assertTrue(kitchen["rooms"] == ("Kitchen",))
+
+# Per game objects are slotted, and do not hold a logger
+assertFalse(hasattr(c,"__dict__") or hasattr(p,"__dict__"))
+assertFalse(hasattr(Game(l).gameboard.rooms[0],"__dict__"))
+try:
+	p.color = "red"
+	assertTrue(False)
+except AttributeError:
+	assertTrue(p.messageColor == "blue")
+p.updateMessage("hi","red")
+assertTrue(p.messageColor == "red")
@@ -0,0 +1,38 @@
+#!/usr/bin/python3
+# Functional Regression test for the cold start of a worker: importing the
+# backend and creating a game must not load the slow modules, nor start
+# the log thread
+import sys
+sys.path.append('..')
+
+import os
+import subprocess
+
+from testing_utils import *
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)),'..')
+
+# Runs the code in a new interpreter and returns the modules it loaded
+# among the slow ones
+def loaded(code):
+	code += "\nimport sys\nprint(' '.join(m for m in ['json','re','threading','queue','random'] if m in sys.modules))"
+	done = subprocess.run([sys.executable,"-c",code],cwd=ROOT,capture_output=True,text=True)
+	assertTrue(done.returncode == 0)
+	return done.stdout.split()
+
+# A new game with two players that picked their suspects
+GAME = """
+import game
+g = game.Game(game.Logger(level=game.LOG_OFF))
+g.addPlayer('Bob')
+g.selectSuspect('Bob','Miss Scarlet')
+g.addPlayer('Nancy')
+g.selectSuspect('Nancy','Mr Green')
+"""
+
+assertTrue(loaded("import game") == [])
+assertTrue(loaded(GAME + "g.getCycle()") == [])
+
+# The slow modules come in once they are needed
+assertTrue(loaded(GAME + "g.startGame()\nassert g.state != game.STATE_INITIAL") == ["random"])
+assertTrue(loaded(GAME + "g.getGamestateEncoded()") == ["json","re"])
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+# Validates that getCycle() matches the nine separate senders
+import sys
+sys.path.append('..')
+
+from testing_utils import *
+from game import *
+
+# Calls the nine senders the way the server loop does
+def nineCalls(g):
+	return {
+		"gamestate"                : g.getGamestate(),
+		"gameboard"                : g.getGameboard(),
+		CHANNEL_PLAYERSTATES       : g.getPlayerstates(),
+		CHANNEL_MOVE_OPTIONS       : g.getMoveOptions(),
+		CHANNEL_SUGGESTION_OPTIONS : g.getSuggestionOptions(),
+		CHANNEL_ACCUSATION_OPTIONS : g.getAccusationOptions(),
+		CHANNEL_CHECKLISTS         : g.getChecklists(),
+		CHANNEL_CARDLISTS          : g.getCardlists(),
+		CHANNEL_MESSAGES           : g.getMessages()
+	}
+
+# Drops the DIRTY flags, they depend on what was sent before
+def payloads(cycle):
+	ret = {}
+	for key in cycle:
+		if key in CHANNELS:
+			ret[key] = [(elem[PLAYER_ID],elem[PAYLOAD]) for elem in cycle[key]]
+		else:
+			ret[key] = cycle[key]
+	return ret
+
+# The payloads must match, messages are checked separately since
+# they are reset as soon as they are sent
+def compare(g):
+	expected = payloads(nineCalls(g))
+	actual = payloads(g.getCycle())
+	assertTrue(sorted(expected.keys()) == sorted(actual.keys()))
+	for key in expected:
+		if key != CHANNEL_MESSAGES:
+			assertTrue(expected[key] == actual[key])
+
+g = Game()
+compare(g)
+g.addPlayer("Bob")
+g.addPlayer("Nancy")
+g.addPlayer("Rose")
+g.selectSuspect("Bob","Colonel Mustard")
+g.selectSuspect("Nancy","Miss Scarlet")
+g.selectSuspect("Rose","Professor Plum")
+compare(g)
+g.startGame()
+compare(g)
+g.selectMove("Nancy","Hall-Lounge")
+g.selectMove("Bob","Dining Room-Lounge")
+g.selectMove("Rose","Library-Study")
+g.selectMove("Nancy","Hall")
+compare(g)
+
+# Messages are sent once and cleared, like getMessages()
+g.selectMove("Bob","Hall")
+cycle = g.getCycle(deltaOnly=True)
+assertTrue([elem[PLAYER_ID] for elem in cycle[CHANNEL_MESSAGES]] == ["Bob"])
+cycle = g.getCycle(deltaOnly=True)
+assertTrue(cycle[CHANNEL_MESSAGES][0][PAYLOAD]["message"] == "")
+cycle = g.getCycle(deltaOnly=True)
+assertTrue(cycle[CHANNEL_MESSAGES] == [])
+assertTrue(cycle[CHANNEL_CARDLISTS] == [])
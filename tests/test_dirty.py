@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+# Functional Regression test for the dirty tracking of the targeted senders
+import sys
+sys.path.append('..')
+
+from testing_utils import *
+from game import *
+
+def dirtyIds(data):
+	return [elem[PLAYER_ID] for elem in data if elem[DIRTY]]
+
+g = Game()
+g.addPlayer("Bob")
+g.addPlayer("Nancy")
+
+# Everything is dirty the first time around, and clean afterwards
+assertTrue(dirtyIds(g.getPlayerstates()) == ["Bob","Nancy"])
+assertTrue(dirtyIds(g.getPlayerstates()) == [])
+assertTrue(len(g.getPlayerstates()) == 2)
+assertTrue(g.getPlayerstates(deltaOnly=True) == [])
+
+# Only the player that picked a suspect changed
+g.selectSuspect("Bob","Colonel Mustard")
+assertTrue(dirtyIds(g.getPlayerstates()) == ["Bob"])
+
+g.selectSuspect("Nancy","Miss Scarlet")
+g.startGame()
+for sender in [g.getPlayerstates,g.getMoveOptions,g.getChecklists,g.getCardlists,g.getMessages]:
+	sender()
+	assertTrue(sender(deltaOnly=True) == [])
+
+# A move changes the mover and everyone's move options
+g.selectMove("Nancy","Hall-Lounge")
+assertTrue(dirtyIds(g.getPlayerstates()) == ["Nancy"])
+assertTrue(dirtyIds(g.getMoveOptions()) == ["Bob","Nancy"])
+assertTrue(g.getCardlists(deltaOnly=True) == [])
+
+# A message is sent once, then cleared on the next cycle
+g.selectMove("Nancy","Hall")
+messages = g.getMessages(deltaOnly=True)
+assertTrue([elem[PLAYER_ID] for elem in messages] == ["Nancy"])
+messages = g.getMessages(deltaOnly=True)
+assertTrue(messages[0][PAYLOAD]["message"] == "")
+assertTrue(g.getMessages(deltaOnly=True) == [])
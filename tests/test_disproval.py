@@ -0,0 +1,141 @@
+#!/usr/bin/python3
+# Functional Regression test for the suggestion disproval resolver and the
+# auto-disprove mode
+import sys
+sys.path.append('..')
+
+from testing_utils import *
+from game import *
+from journal import *
+
+NAMES = ["Bob","Nancy","Rose","Carl"]
+
+# Returns a started game with auto-disprove, Bob has the turn
+def autoGame(seed,numPlayers=4):
+	g = Game(Logger(level=LOG_OFF),seed,autoDisprove=True)
+	for idx in range(0,numPlayers):
+		g.addPlayer(NAMES[idx])
+		g.selectSuspect(NAMES[idx],SUSPECTS[idx])
+	g.startGame()
+	return g
+
+# Makes Bob suggest the cards, from the room of the suggestion
+def suggest(g,suspect,weapon,room):
+	bob = g.playerlist.getPlayer("Bob")
+	g.gameboard.movePlayer(bob,room,force=True)
+	bob.state = PLAYER_SUGGEST
+	g.proposeSuggestion("Bob",suspect,weapon)
+
+# Returns the names of the cards of the player in the category
+def held(g,name,cards):
+	return [card for card in g.cardmanager.getCardNames(g.playerlist.getPlayer(name)) if card in cards]
+
+# Nobody can disprove the case file, the turn stays with Bob
+g = autoGame(1)
+casefile = g.cardmanager.casefile
+suggest(g,casefile.suspectCard.name,casefile.weaponCard.name,casefile.roomCard.name)
+assertTrue(g.suggestion == None)
+assertTrue(g.state == STATE_STARTED)
+assertTrue(g.playerlist.getCurrentPlayer().getID() == "Bob")
+assertTrue(g.playerlist.getPlayer("Bob").message == "Nobody can disprove your suggestion!")
+assertTrue(len(g.journal) == 10)
+
+# A single card is shown right away, by the first player after Bob that
+# holds one, and the turn moves on
+for seed in range(0,100):
+	g = autoGame(seed)
+	if len(held(g,"Rose",WEAPONS)) > 0:
+		break
+casefile = g.cardmanager.casefile
+weapon = held(g,"Rose",WEAPONS)[0]
+suggest(g,casefile.suspectCard.name,weapon,casefile.roomCard.name)
+assertTrue(g.suggestion == None)
+assertTrue(weapon in g.playerlist.getPlayer("Bob").getChecklist()["weapons"])
+assertTrue(g.playerlist.getCurrentPlayer().getID() == "Nancy")
+assertTrue(g.playerlist.getPlayer("Rose").state == PLAYER_IN_PLAY)
+
+# The resolver lists every player that can disprove, in turn order
+g = autoGame(2)
+casefile = g.cardmanager.casefile
+suspect = (held(g,"Carl",SUSPECTS) + [casefile.suspectCard.name])[0]
+weapon = (held(g,"Nancy",WEAPONS) + [casefile.weaponCard.name])[0]
+suggestion = Suggestion(g.playerlist.getPlayer("Bob"),suspect,weapon,casefile.roomCard.name,g.logger)
+disprovals = g.playerlist.resolveDisproval(suggestion,g.cardmanager)
+expected = [name for name in ["Nancy","Carl"] if len(held(g,name,[suspect,weapon])) > 0]
+assertTrue([player.getID() for player, mask in disprovals] == expected)
+
+# A defender with a choice is told which cards he may show, and cannot
+# claim he has none
+for seed in range(0,100):
+	g = autoGame(seed,2)
+	suspects = held(g,"Nancy",SUSPECTS)
+	weapons = held(g,"Nancy",WEAPONS)
+	if len(suspects) > 0 and len(weapons) > 0:
+		break
+casefile = g.cardmanager.casefile
+suggest(g,suspects[0],weapons[0],casefile.roomCard.name)
+nancy = g.playerlist.getPlayer("Nancy")
+assertTrue(g.playerlist.getCurrentPlayer() == nancy)
+assertTrue(nancy.state == PLAYER_DEFEND)
+assertTrue(suspects[0] in nancy.message and weapons[0] in nancy.message)
+
+# The defense survives a snapshot
+r = Game.restore(g.snapshot(),Logger(level=LOG_OFF))
+assertTrue(r.autoDisprove)
+assertTrue(r.suggestion.getDisproval(r.playerlist.getPlayer("Nancy")) == g.suggestion.getDisproval(nancy))
+
+g.disproveSuggestion("Nancy",None,None,True)
+assertTrue(g.suggestion != None)
+assertTrue(nancy.state == PLAYER_DEFEND)
+
+# Nobody else may disprove it in her place, the accuser included
+g.disproveSuggestion("Bob",None,None,True)
+assertTrue(g.suggestion != None)
+assertTrue(nancy.state == PLAYER_DEFEND)
+
+# Nor show a card of the suggestion that she does not hold
+g.disproveSuggestion("Nancy",casefile.roomCard.name,None,False)
+assertTrue(g.suggestion != None)
+assertTrue(nancy.state == PLAYER_DEFEND)
+assertTrue(casefile.roomCard.name not in g.playerlist.getPlayer("Bob").getChecklist()["rooms"])
+g.disproveSuggestion("Nancy",weapons[0],None,False)
+assertTrue(g.suggestion == None)
+assertTrue(weapons[0] in g.playerlist.getPlayer("Bob").getChecklist()["weapons"])
+
+# A later player holding a card of the suggestion cannot show it in
+# place of the defender
+for seed in range(0,100):
+	r = autoGame(seed,3)
+	suspects = held(r,"Nancy",SUSPECTS)
+	weapons = held(r,"Nancy",WEAPONS)
+	rooms = held(r,"Rose",ROOMS)
+	if len(suspects) > 0 and len(weapons) > 0 and len(rooms) > 0:
+		break
+suggest(r,suspects[0],weapons[0],rooms[0])
+r.disproveSuggestion("Rose",rooms[0],None,False)
+assertTrue(r.suggestion != None)
+assertTrue(r.playerlist.getCurrentPlayer().getID() == "Nancy")
+assertTrue(rooms[0] not in r.playerlist.getPlayer("Bob").getChecklist()["rooms"])
+
+# The journal keeps the mode, the replayed game plays out the same (the
+# board differs, suggest() moves Bob behind the journal's back)
+def players(g):
+	return [(p.playerId,p.state,p.message,p.checklist) for p in g.playerlist.getPlayers()]
+journal = Journal.decode(g.journal.encode())
+assertTrue(journal.autoDisprove)
+assertTrue(players(Game.replay(journal)) == players(g))
+
+# Version 1 journals are still read
+old = JOURNAL_HEADER_V1.pack(JOURNAL_MAGIC,1,7,0)
+assertTrue(Journal.decode(old).seed == 7 and not Journal.decode(old).autoDisprove)
+
+# Without auto-disprove, the suggested suspect defends as before
+g = Game(Logger(level=LOG_OFF),1)
+for idx in range(0,3):
+	g.addPlayer(NAMES[idx])
+	g.selectSuspect(NAMES[idx],SUSPECTS[idx])
+g.startGame()
+casefile = g.cardmanager.casefile
+suggest(g,"Mrs White",casefile.weaponCard.name,casefile.roomCard.name)
+assertTrue(g.playerlist.getCurrentPlayer().getID() == "Rose")
+assertTrue(g.suggestion.disprovals == None)
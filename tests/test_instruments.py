@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+# Functional Regression test for the instrumentation of the Game methods
+import sys
+sys.path.append('..')
+
+from testing_utils import *
+from game import *
+from registry import *
+from instruments import *
+
+# Games are not instrumented unless asked
+g = Game(seed=1)
+assertTrue(g.instruments == None)
+assertTrue("getCycle" not in g.__dict__)
+
+i = g.enableInstruments()
+assertTrue(g.enableInstruments() is i)
+g.addPlayer("Bob")
+g.addPlayer("Nancy")
+g.selectSuspect("Bob","Colonel Mustard")
+g.startGame() # Nancy has no suspect
+g.selectSuspect("Nancy","Miss Scarlet")
+g.startGame()
+g.getCycle()
+stats = i.getStats()
+assertTrue(stats["addPlayer"]["calls"] == 2)
+assertTrue(stats["startGame"]["calls"] == 2)
+assertTrue(stats["startGame"]["gameErrors"] == 1)
+assertTrue(stats["selectSuspect"]["gameErrors"] == 0)
+assertTrue(stats["getGamestate"]["calls"] == 1) # through getCycle
+assertTrue(0 < stats["getCycle"]["p50Us"] <= stats["getCycle"]["p99Us"] <= stats["getCycle"]["maxUs"])
+assertTrue("removePlayer" not in stats)
+
+# Keyword arguments go through to the method
+assertTrue(len(g.getCycle(deltaOnly=True)[CHANNEL_PLAYERSTATES]) == 0)
+assertTrue(len(g.getCycle(deltaOnly=False)[CHANNEL_PLAYERSTATES]) == 2)
+assertTrue(i.getStats()["getCycle"]["calls"] == 3)
+
+# A BackException escapes the method and is counted
+def broken(player,choice,force=False):
+	raise BackException("broken board")
+g.gameboard.movePlayer = broken
+try:
+	g.selectMove(g.playerlist.getCurrentPlayer().getID(),"Hall")
+	assertTrue(False)
+except BackException:
+	assertTrue(i.getStats()["selectMove"]["backErrors"] == 1)
+
+# Histograms
+m = MethodStats()
+for elapsed in [1500] * 98 + [30000,4000000]:
+	m.observe(elapsed)
+assertTrue(m.getQuantile(0.5) == 2000)
+assertTrue(m.getQuantile(0.99) == 50000)
+assertTrue(m.getQuantile(1.0) == 4000000)
+
+# Prometheus text
+text = i.getPrometheus()
+assertTrue('clueless_game_calls_total{method="startGame"} 2' in text)
+assertTrue('clueless_game_errors_total{method="startGame",type="GameException"} 1' in text)
+assertTrue('clueless_game_latency_seconds_bucket{method="startGame",le="+Inf"} 2' in text)
+assertTrue(text.endswith("\n"))
+
+# The registry adds up every game, retired ones included
+r = GameRegistry(instrument=True)
+a = r.createGame()
+b = r.createGame()
+r.dispatch(a,"addPlayer","Bob")
+r.dispatch(b,"addPlayer","Bob")
+r.dispatch(b,"getGamestate")
+r.retireGame(b)
+stats = r.getInstruments().getStats()
+assertTrue(stats["addPlayer"]["calls"] == 2)
+assertTrue(stats["getGamestate"]["calls"] == 1)
+assertTrue(GameRegistry().getInstruments().getStats() == {})
@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+# Functional Regression test for the action journal and replays
+import sys
+sys.path.append('..')
+
+from testing_utils import *
+from game import *
+from journal import *
+
+# Everything a client could see of the game, plus the case file
+def state(g):
+	cycle = g.getCycle()
+	for key in CHANNELS:
+		cycle[key] = [(elem[PLAYER_ID],elem[PAYLOAD]) for elem in cycle[key]]
+	casefile = g.cardmanager.casefile
+	return cycle, None if casefile == None else casefile.mask
+
+g = Game(seed=2020)
+g.addPlayer("Bob")
+g.addPlayer("Nancy")
+g.addPlayer("Rose")
+g.selectSuspect("Bob","Colonel Mustard")
+g.selectSuspect("Nancy","Miss Scarlet")
+g.selectSuspect("Rose","Professor Plum")
+g.startGame()
+g.selectMove("Nancy","Hall-Lounge")
+g.selectMove("Nancy","Hall") # rejected, not her turn
+g.selectMove("Bob","Dining Room-Lounge")
+g.selectMove("Rose","Library-Study")
+g.selectMove("Nancy","Hall")
+g.proposeSuggestion("Nancy","Colonel Mustard","Rope")
+g.disproveSuggestion("Bob","Kitchen",None,False)
+assertTrue(len(g.journal) == 14)
+assertTrue(g.journal.entries[0] == (ACTION_ADD_PLAYER,"Bob"))
+assertTrue(g.journal.entries[-1] == (ACTION_DISPROVE_SUGGESTION,"Bob","Kitchen",None,False))
+
+# A replay rebuilds the same game, down to its journal
+# (state() consumes the pending messages, so it is taken once)
+expected = state(g)
+r = Game.replay(g.journal)
+assertTrue(r.seed == g.seed)
+assertTrue(r.journal.entries == g.journal.entries)
+assertTrue(state(r) == expected)
+
+# The binary form holds the same journal
+data = g.journal.encode()
+j = Journal.decode(data)
+assertTrue(j.seed == 2020)
+assertTrue(j.entries == g.journal.entries)
+assertTrue(state(Game.replay(j)) == expected)
+
+try:
+	Journal.decode(b"XXX" + data[3:])
+	assertTrue(False)
+except BackException:
+	assertTrue(True)
+
+# Every string is stored once, in the table of the journal
+assertTrue(data.count(b"Nancy") == 1 and data.count(b"Bob") == 1)
+try:
+	Journal.decode(data[:-1])
+	assertTrue(False)
+except BackException:
+	assertTrue(True)
+
+# Version 2 journals are still read
+old = JOURNAL_HEADER.pack(JOURNAL_MAGIC,2,7,0,1) + JOURNAL_ENTRY.pack(ACTION_ADD_PLAYER,1) \
+	+ bytes((ARG_STR,)) + JOURNAL_STRLEN.pack(3) + b"Bob"
+assertTrue(Journal.decode(old).entries == [(ACTION_ADD_PLAYER,"Bob")])
+
+# A replay without messages plays out the same, nobody has a message
+r = Game.replay(j,messages=False)
+assertTrue(r.journal.entries == g.journal.entries)
+assertTrue([p.message for p in r.playerlist.getPlayers()] == ["","",""])
+assertTrue(r.gameboard.getGameboard() == Game.replay(j).gameboard.getGameboard())
+
+# Actions that raised in the game are skipped by the replay, they do not
+# stop it
+g = Game(Logger(level=LOG_OFF),seed=7)
+g.addPlayer("Bob")
+g.addPlayer("Nancy")
+g.selectSuspect("Bob","Miss Scarlet")
+def crash(action):
+	try:
+		action()
+		assertTrue(False)
+	except AttributeError:
+		assertTrue(True)
+crash(lambda: g.selectSuspect("Nancy","Miss Scarlet")) # already picked
+g.selectSuspect("Nancy","Mrs White")
+g.startGame()
+crash(lambda: g.selectMove("nobody","Hall"))
+assertTrue(len(g.journal) == 7)
+expected = state(g)
+r = Game.replay(Journal.decode(g.journal.encode()))
+assertTrue(state(r) == expected)
+assertTrue(r.journal.entries == g.journal.entries)
+
+# Arguments that cannot be journaled are refused before the action runs,
+# the journal can still be encoded
+size = len(g.journal)
+for action in [lambda: g.passTurn(12),lambda: g.disproveSuggestion("Bob",None,3,True)]:
+	try:
+		action()
+		assertTrue(False)
+	except BackException:
+		assertTrue(True)
+assertTrue(len(g.journal) == size)
+assertTrue(Journal.decode(g.journal.encode()).entries == g.journal.entries)
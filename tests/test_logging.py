@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+# Functional Regression test for the logging pipeline
+import sys
+sys.path.append('..')
+
+import os
+import tempfile
+
+from testing_utils import *
+from utils import *
+
+path = os.path.join(tempfile.mkdtemp(),"log","backend.log")
+sink = LogSink(path,maxBytes=1024,backups=2)
+l = Logger(sink,game="g1")
+
+# Nothing is opened until the first record
+assertFalse(os.path.exists(path))
+
+l.log("hello")
+l.bind(player="Bob").log("bye")
+sink.flush()
+lines = open(path).read().splitlines()
+assertTrue(len(lines) == 2)
+assertTrue(lines[0].endswith("[game=g1] hello"))
+assertTrue(lines[1].endswith("[game=g1] [player=Bob] bye"))
+
+# Messages below the level are dropped without being formatted
+class Explosive:
+	def __str__(self):
+		raise Exception("formatted a dropped message")
+quiet = Logger(sink,level=LOG_WARNING)
+quiet.debug("never %s",Explosive())
+quiet.info("never %s",Explosive())
+quiet.warning("kept %s","warning")
+assertFalse(quiet.isEnabledFor(LOG_INFO))
+assertTrue(quiet.bind(game="g2").level == LOG_WARNING)
+sink.flush()
+lines = open(path).read().splitlines()
+assertTrue(len(lines) == 3)
+assertTrue(lines[2].endswith("kept warning"))
+
+# The log rotates once it grows past maxBytes, keeping <backups> old logs
+for idx in range(0,200):
+	l.log("filler line %d" % idx)
+	if idx % 20 == 0:
+		sink.flush()
+sink.close()
+assertTrue(os.path.exists(path + ".1"))
+assertTrue(os.path.exists(path + ".2"))
+assertFalse(os.path.exists(path + ".3"))
+assertTrue(os.path.getsize(path + ".1") < 2048)
+assertTrue(open(path).read().splitlines()[-1].endswith("filler line 199"))
+
+# The log lines about a player carry its id
+from game import *
+path = os.path.join(tempfile.mkdtemp(),"backend.log")
+sink = LogSink(path)
+g = Game(Logger(sink,LOG_INFO,game="g3"),seed=1)
+g.addPlayer("Bob")
+g.selectSuspect("Bob","Colonel Mustard")
+g.removePlayer("Bob")
+sink.close()
+lines = open(path).read().splitlines()
+assertTrue(any(line.endswith("[game=g3] [player=Bob] Added player Bob") for line in lines))
+assertTrue(any(line.endswith("[game=g3] [player=Bob] Assigning Colonel Mustard to Bob") for line in lines))
+assertTrue(any(line.endswith("[game=g3] [player=Bob] Removing player Bob") for line in lines))
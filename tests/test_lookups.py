@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+# Functional Regression test for the player lookups by id and by suspect
+import sys
+sys.path.append('..')
+
+from testing_utils import *
+from game import *
+
+g = Game(Logger(level=LOG_OFF),seed=5)
+pl = g.playerlist
+g.addPlayer("Bob")
+g.addPlayer("Nancy")
+g.addPlayer("Rose")
+assertTrue(pl.getPlayer("Bob").getID() == "Bob")
+assertTrue(pl.getPlayer("Nobody") == None)
+assertTrue(pl.getPlayerBySuspect("Miss Scarlet") == None)
+
+# Picking another suspect frees the previous one
+g.selectSuspect("Bob","Miss Scarlet")
+g.selectSuspect("Bob","Mrs White")
+g.selectSuspect("Nancy","Colonel Mustard")
+g.selectSuspect("Rose","Mr Green")
+assertTrue(pl.getPlayerBySuspect("Miss Scarlet") == None)
+assertTrue(pl.getPlayerBySuspect("Mrs White") == pl.getPlayer("Bob"))
+
+# The NPCs are only found by suspect, and only by getPlayerBySuspect2()
+npcs = list(pl.getAvailableCharacters())
+g.startGame()
+assertTrue(len(npcs) == 2)
+for suspect in npcs:
+	assertTrue(pl.getPlayerBySuspect(suspect) == None)
+	assertTrue(pl.getPlayerBySuspect2(suspect).fakeAF)
+assertTrue(pl.getPlayer(pl.getPlayerBySuspect2(npcs[0]).getID()) == None)
+assertTrue(pl.getPlayerBySuspect2("Colonel Mustard") == pl.getPlayer("Nancy"))
+
+# Leaving players are dropped from both indexes
+g.removePlayer("Rose")
+assertTrue(pl.getPlayer("Rose") == None)
+assertTrue(pl.getPlayerBySuspect2("Mr Green") == None)
+
+# A restored game rebuilds the indexes
+r = Game.restore(g.snapshot(),Logger(level=LOG_OFF))
+assertTrue(r.playerlist.getPlayer("Bob").getSuspect() == "Mrs White")
+assertTrue(r.playerlist.getPlayerBySuspect2(npcs[0]).fakeAF)
+assertTrue(r.playerlist.getPlayer("Rose") == None)
@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+# Functional Regression test for the game registry
+import sys
+sys.path.append('..')
+
+from testing_utils import *
+from registry import *
+
+r = GameRegistry(shards=4)
+
+a = r.createGame("a")
+b = r.createGame()
+assertTrue(a == "a")
+assertTrue(len(r) == 2)
+assertTrue("a" in r)
+assertTrue(r.getGame(a) != r.getGame(b))
+
+# game ids are unique
+try:
+	r.createGame("a")
+	assertTrue(False)
+except BackException:
+	assertTrue(True)
+
+# calls are routed to the right game
+r.dispatch(a,"addPlayer","Bob")
+assertTrue(r.getGame(a).playerlist.getPlayer("Bob") != None)
+assertTrue(r.getGame(b).playerlist.getPlayer("Bob") == None)
+assertTrue(r.dispatch(a,"getGamestate")["game_has_begun"] == False)
+
+# keyword arguments go through as well
+assertTrue(len(r.dispatch(a,"getCycle",deltaOnly=False)[CHANNEL_PLAYERSTATES]) == 1)
+assertTrue(len(r.dispatch(a,"getCycle",deltaOnly=True)[CHANNEL_PLAYERSTATES]) == 0)
+
+# retired games are gone
+g = r.retireGame(a)
+assertTrue(g != None)
+assertTrue(r.getGame(a) == None)
+assertTrue(r.retireGame(a) == None)
+assertTrue(len(r) == 1)
+
+try:
+	r.dispatch(a,"getGamestate")
+	assertTrue(False)
+except GameException:
+	assertTrue(True)
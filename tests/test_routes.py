@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+# Functional Regression test for the distance table and the route planner
+import sys
+sys.path.append('..')
+
+from testing_utils import *
+from game import *
+
+g = Game(Logger(level=LOG_OFF),seed=3)
+for name, suspect in [("Bob","Miss Scarlet"),("Nancy","Colonel Mustard"),("Rose","Mrs White")]:
+	g.addPlayer(name)
+	g.selectSuspect(name,suspect)
+g.startGame()
+board = g.gameboard
+topology = board.topology
+loc = board.getLoc
+
+# Distances of the empty board, the secret passages are a single move
+assertTrue(topology.getDistance(loc("Study"),loc("Study")) == 0)
+assertTrue(topology.getDistance(loc("Study"),loc("Hall")) == 2)
+assertTrue(topology.getDistance(loc("Study"),loc("Kitchen")) == 1)
+assertTrue(topology.getDistance(loc("Hall"),loc("Kitchen")) == 3)
+assertTrue(topology.getDistance(loc("Hall-Lounge"),loc("Dining Room")) == 3)
+assertTrue(topology.getDistances()[topology.initial.id] == None)
+
+# From INITIAL the way starts with the opening passageway
+bob = g.playerlist.getPlayer("Bob")
+assertTrue(board.planRoute(bob,loc("Hall")) == (loc("Hall-Lounge"),2))
+assertTrue(board.planRoute(bob,loc("Kitchen")) == (loc("Hall-Lounge"),5))
+
+# Once on the board, the next move of a shortest way
+g.selectMove("Bob","Hall-Lounge")
+assertTrue(board.planRoute(bob,loc("Hall")) == (loc("Hall"),1))
+assertTrue(board.planRoute(bob,loc("Conservatory")) == (loc("Lounge"),2))
+assertTrue(board.planRoute(bob,loc("Hall-Lounge")) == (None,0))
+
+# An occupied passageway is gone around, when it can be
+nancy = g.playerlist.getPlayer("Nancy")
+board.movePlayer(bob,"Hall",force=True)
+board.movePlayer(nancy,"Billiard Room-Hall",force=True)
+move, turns = board.planRoute(bob,loc("Billiard Room"))
+assertTrue(turns == 6 and move in [loc("Hall-Study"),loc("Hall-Lounge")])
+assertTrue(board.planRoute(bob,loc("Billiard Room-Hall")) == (None,None))
+rose = g.playerlist.getPlayer("Rose")
+board.movePlayer(rose,"Hall-Study",force=True)
+board.movePlayer(g.playerlist.fakePlayers[0],"Hall-Lounge",force=True)
+assertTrue(board.planRoute(bob,loc("Kitchen")) == (None,None))
+
+# The next move is always one of the move options, here the way goes
+# through the Conservatory and its secret passage
+board.movePlayer(bob,"Study",force=True)
+move, turns = board.planRoute(bob,loc("Lounge"))
+assertTrue(move in board.getMoveOptions(bob) and turns == 5)
+assertTrue(move == loc("Library-Study"))
+
+# Larger boards
+layout = getGridLayout(8)
+topology = getTopology(layout)
+corner = topology.roomsByCoor[(0,0)]
+assertTrue(topology.getDistance(corner,topology.roomsByCoor[(7,7)]) == 1)
+assertTrue(topology.getDistance(corner,topology.roomsByCoor[(6,7)]) == 3)
+assertTrue(topology.getDistance(corner,topology.roomsByCoor[(7,0)]) == 14)
+assertTrue(topology.getDistance(corner,topology.roomsByCoor[(3,4)]) == 14)
+occupants = [()] * len(topology.positions)
+move, turns = topology.planRoute(corner,topology.roomsByCoor[(1,0)],occupants)
+assertTrue(move is topology.passagewaysByRooms[frozenset((corner,topology.roomsByCoor[(1,0)]))] and turns == 2)
+occupants[move.id] = ("someone",)
+move, turns = topology.planRoute(corner,topology.roomsByCoor[(1,0)],occupants)
+assertTrue(turns == 6)
+
+# Bots that plan their way play games to the end
+from simulator import *
+stats = simulate(4,numPlayers=3,policies=["planner"],seed=7,workers=1,layout=getGridLayout(5))
+assertTrue(stats.finished == 4)
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+# Functional Regression test for the game simulator
+import sys
+sys.path.append('..')
+
+import os
+import subprocess
+
+from testing_utils import *
+from simulator import *
+
+# Bots play games to the end
+stats = simulate(6,numPlayers=3,seed=7,workers=1)
+assertTrue(stats.games == 6)
+assertTrue(stats.finished == 6)
+assertTrue(stats.turns > 0 and stats.actions > stats.turns)
+assertTrue(sum(stats.seats.values()) == 18)
+assertTrue(sum(stats.seatWins) >= 6)
+
+# The same seed plays the same games, in another process too: the picks
+# must not depend on the hash seed of the strings
+again = simulate(6,numPlayers=3,seed=7,workers=1)
+assertTrue((again.turns,again.actions,again.wins) == (stats.turns,stats.actions,stats.wins))
+script = "from simulator import *; s = simulate(6,numPlayers=3,seed=7,workers=1); print(repr((s.turns,s.actions,sorted(s.wins.items()))))"
+hashSeed = "2" if os.environ.get("PYTHONHASHSEED") == "1" else "1"
+output = subprocess.check_output([sys.executable,"-c",script],cwd=os.path.join(os.path.dirname(os.path.abspath(__file__)),".."),env=dict(os.environ,PYTHONHASHSEED=hashSeed))
+assertTrue(output.decode().strip() == repr((stats.turns,stats.actions,sorted(stats.wins.items()))))
+
+# A single game ends with a winner
+g, bots, turns = playGame(3,4,["checklist"])
+assertTrue(g.state == STATE_END)
+assertTrue(sorted(bots.keys()) == ["bot0","bot1","bot2","bot3"])
+
+# Games that disprove suggestions by themselves need fewer actions
+auto = simulate(6,numPlayers=3,seed=7,workers=1,autoDisprove=True)
+assertTrue(auto.finished == 6)
+assertTrue(auto.actions < stats.actions)
+
+# Bots that play their checklist win more than the ones playing at random
+duel = simulate(30,numPlayers=4,policies=["checklist","random"],seed=0,workers=1)
+assertTrue(duel.finished == 30)
+assertTrue(duel.seats["checklist"] == duel.seats["random"])
+assertTrue(duel.wins.get("checklist",0) > 2 * duel.wins.get("random",0))
+
+try:
+	simulate(1,policies=["cheater"],workers=1)
+	assertTrue(False)
+except BackException:
+	assertTrue(True)
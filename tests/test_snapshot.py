@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+# Functional Regression test for game snapshots
+import sys
+sys.path.append('..')
+
+from testing_utils import *
+from game import *
+from snapshot import *
+
+# Everything a client could see of the game, plus the case file and hands
+def state(g):
+	cycle = g.getCycle()
+	for key in CHANNELS:
+		cycle[key] = [(elem[PLAYER_ID],elem[PAYLOAD]) for elem in cycle[key]]
+	casefile = g.cardmanager.casefile
+	hands = [g.cardmanager.getCardNames(player) for player in g.playerlist.getPlayers()]
+	return cycle, None if casefile == None else casefile.mask, hands
+
+# A game that was not started yet
+g = Game(seed=2020)
+g.addPlayer("Bob")
+g.addPlayer("Nancy")
+g.selectSuspect("Bob","Colonel Mustard")
+data = g.snapshot()
+r = Game.restore(data)
+assertTrue(r.seed == 2020)
+assertTrue(r.snapshot() == data)
+assertTrue(state(r) == state(g))
+
+# The restored game starts like the original would
+g.startGame()
+r.startGame()
+assertTrue(state(r) == state(g))
+
+# A game in the middle of a suggestion
+g = Game(seed=2020)
+g.addPlayer("Bob")
+g.addPlayer("Nancy")
+g.addPlayer("Rose")
+g.selectSuspect("Bob","Colonel Mustard")
+g.selectSuspect("Nancy","Miss Scarlet")
+g.selectSuspect("Rose","Professor Plum")
+g.startGame()
+g.selectMove("Nancy","Hall-Lounge")
+g.selectMove("Bob","Dining Room-Lounge")
+g.selectMove("Rose","Library-Study")
+g.selectMove("Nancy","Hall")
+g.proposeSuggestion("Nancy","Colonel Mustard","Rope")
+data = g.snapshot()
+assertTrue(len(data) < 512)
+r = Game.restore(data)
+assertTrue(r.snapshot() == data)
+assertTrue(r.suggestion.accuser.getID() == "Nancy")
+assertTrue(r.gameboard.getPlayerLoc(r.playerlist.getPlayer("Bob")).getName() == "Hall")
+assertTrue(len(r.playerlist.fakePlayers) == 3)
+assertTrue(state(r) == state(g))
+
+# Both games keep playing the same way
+g.disproveSuggestion("Bob",None,None,True)
+r.disproveSuggestion("Bob",None,None,True)
+assertTrue(state(r) == state(g))
+assertTrue(r.snapshot() == g.snapshot())
+
+try:
+	Game.restore(b"XXX" + data[3:])
+	assertTrue(False)
+except BackException:
+	assertTrue(True)
@@ -22,7 +22,7 @@ assertFalse(s.counter("fork"))
 assertFalse(s.counter("restroom"))
 
 
-c = CaseFile(Card("Bob",l),Card("spoon",l),Card("bathroom",l),l)
+c = CaseFile(Card("Bob"),Card("spoon"),Card("bathroom"))
 a = Accusation(None,"Bob","spoon","bathroom",l)
 
 assertTrue(a.counter("Bob"))
@@ -41,3 +41,15 @@ assertFalse(a.checkCasefile(c))
 a = Accusation(None,"Martha","spoon","bathroom",l)
 assertFalse(a.checkCasefile(c))
 
+
+# Cards of the catalog are compared as masks
+s = Suggestion(None,"Miss Scarlet","Rope","Hall",l)
+assertTrue(s.counter("Rope"))
+assertTrue(s.counter("Hall"))
+assertFalse(s.counter("Kitchen"))
+assertFalse(s.counter("spoon"))
+
+c = CaseFile(Card("Mr Green"),Card("Knife"),Card("Study"))
+assertTrue(Accusation(None,"Mr Green","Knife","Study",l).checkCasefile(c))
+assertFalse(Accusation(None,"Mr Green","Rope","Study",l).checkCasefile(c))
+assertFalse(Accusation(None,"Knife","Mr Green","Study",l).checkCasefile(c))
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+# Functional Regression test for the turn order of the players
+import sys
+sys.path.append('..')
+
+from testing_utils import *
+from game import *
+
+# Returns the suspects of the turn order, starting from the current player
+def order(g):
+	pl = g.playerlist
+	ret = []
+	player = pl.getCurrentPlayer()
+	for idx in range(0,len(pl.turnNext)):
+		ret.append(player.getSuspect())
+		player = pl.turnNext[player]
+	return ret
+
+# The turn order follows SUSPECTS, not the order in which players joined
+g = Game(Logger(level=LOG_OFF),seed=3)
+g.addPlayer("Bob")
+g.addPlayer("Nancy")
+g.addPlayer("Rose")
+g.addPlayer("Carl")
+g.selectSuspect("Bob","Mrs Peacock")
+g.selectSuspect("Nancy","Colonel Mustard")
+g.selectSuspect("Rose","Miss Scarlet")
+g.selectSuspect("Carl","Mr Green")
+g.startGame()
+assertTrue(order(g) == ["Miss Scarlet","Colonel Mustard","Mr Green","Mrs Peacock"])
+assertTrue(g.playerlist.getCurrentPlayer().getID() == "Rose")
+assertTrue([p.getID() for p in g.playerlist.getPlayersInPlay()] == ["Rose","Nancy","Carl","Bob"])
+
+g.passTurn("Rose")
+assertTrue(g.playerlist.getCurrentPlayer().getID() == "Nancy")
+g.passTurn("Nancy")
+g.passTurn("Carl")
+g.passTurn("Bob")
+assertTrue(g.playerlist.getCurrentPlayer().getID() == "Rose")
+
+# A player that loses leaves the turn order, the turn goes to the next suspect
+casefile = g.cardmanager.casefile
+wrong = [s for s in SUSPECTS if s != casefile.suspectCard.name][0]
+g.passTurn("Rose")
+g.proposeAccusation("Nancy",wrong,casefile.weaponCard.name,casefile.roomCard.name)
+assertTrue(g.playerlist.getPlayer("Nancy").state == PLAYER_LOSE)
+assertTrue(g.playerlist.getCurrentPlayer().getID() == "Carl")
+assertTrue(order(g) == ["Mr Green","Mrs Peacock","Miss Scarlet"])
+
+# The last suspect of the order wraps around to the first one
+g.passTurn("Carl")
+g.proposeAccusation("Bob",wrong,casefile.weaponCard.name,casefile.roomCard.name)
+assertTrue(g.playerlist.getCurrentPlayer().getID() == "Rose")
+assertTrue(order(g) == ["Miss Scarlet","Mr Green"])
+
+# A suggestion does not bring the losers back into play
+g.playerlist.getPlayer("Rose").state = PLAYER_SUGGEST
+g.proposeSuggestion("Rose","Mr Green","Rope")
+g.disproveSuggestion("Carl",None,None,True)
+assertTrue(g.playerlist.getPlayer("Nancy").state == PLAYER_LOSE)
+assertTrue(g.playerlist.getPlayer("Bob").state == PLAYER_LOSE)
+
+# A restored game has the same turn order
+r = Game.restore(g.snapshot(),Logger(level=LOG_OFF))
+assertTrue(order(r) == order(g))
+
+# A player that leaves is taken out of the turn order
+g.removePlayer("Carl")
+assertTrue(order(g) == ["Miss Scarlet"])
+g.passTurn("Rose")
+assertTrue(g.playerlist.getCurrentPlayer().getID() == "Rose")
+
+# The last player standing wins
+g = Game(Logger(level=LOG_OFF),seed=3)
+g.addPlayer("Bob")
+g.addPlayer("Nancy")
+g.selectSuspect("Bob","Miss Scarlet")
+g.selectSuspect("Nancy","Colonel Mustard")
+g.startGame()
+casefile = g.cardmanager.casefile
+g.proposeAccusation("Bob",wrong,casefile.weaponCard.name,casefile.roomCard.name)
+assertTrue(g.state == STATE_END)
+assertTrue(g.playerlist.getCurrentPlayer().getID() == "Nancy")
+
+# Picking another suspect moves the player in the turn order
+g = Game(Logger(level=LOG_OFF),seed=3)
+g.addPlayer("Bob")
+g.addPlayer("Nancy")
+g.selectSuspect("Bob","Professor Plum")
+g.selectSuspect("Nancy","Mrs White")
+g.selectSuspect("Bob","Miss Scarlet")
+g.startGame()
+assertTrue(order(g) == ["Miss Scarlet","Mrs White"])
+
+# A player that lost may still have to defend a suggestion, he goes back
+# to losing afterwards
+g = Game(Logger(level=LOG_OFF),seed=3)
+for name, suspect in [("Bob","Miss Scarlet"),("Nancy","Colonel Mustard"),("Rose","Mrs White")]:
+	g.addPlayer(name)
+	g.selectSuspect(name,suspect)
+g.startGame()
+casefile = g.cardmanager.casefile
+wrong = [s for s in SUSPECTS if s != casefile.suspectCard.name][0]
+g.proposeAccusation("Bob",wrong,casefile.weaponCard.name,casefile.roomCard.name)
+g.playerlist.getPlayer("Nancy").state = PLAYER_SUGGEST
+g.proposeSuggestion("Nancy","Miss Scarlet","Rope")
+assertTrue(g.playerlist.getPlayer("Bob").state == PLAYER_DEFEND)
+g.disproveSuggestion("Bob",None,None,True)
+assertTrue(g.playerlist.getPlayer("Bob").state == PLAYER_LOSE)
+assertTrue(g.playerlist.getPlayer("Rose").state == PLAYER_IN_PLAY)
+assertTrue(order(g) == ["Colonel Mustard","Mrs White"])
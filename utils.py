@@ -9,20 +9,273 @@
 #			Contains the utility class declarations for Clueless.
 #
 ################################################################################			
+# json, queue, threading and atexit are slow to import and only needed
+# once a payload is encoded or a record is logged, they are imported
+# where they are used so that importing the backend stays cheap.
+import os
+import sys
+import time
+
 from globals import *
 
+# Process-wide log writer shared by every Logger.
+# Records are pushed on a queue and written by a background thread, so
+# logging never waits on the disk. The thread drains whatever is queued,
+# writes it in one go and flushes once per batch. The file is opened in
+# append mode and rotated once it grows past maxBytes:
+# backend.log -> backend.log.1 -> ... -> backend.log.<backups>
+# Nothing is opened or started until the first record comes in.
+class LogSink:
+	def __init__(self,path=LOG_FILE,maxBytes=LOG_MAX_BYTES,backups=LOG_BACKUPS):
+		import queue
+		import threading
+		self.path = path
+		self.maxBytes = maxBytes
+		self.backups = backups
+		self.queue = queue.SimpleQueue()
+		self.thread = None
+		self.lock = threading.Lock()
+		self.file = None
+
+	# Queues a record, a (timestamp, level, prefix, message) tuple
+	def put(self,record):
+		if self.thread == None:
+			self.start()
+		self.queue.put(record)
+
+	# Starts the writer thread
+	def start(self):
+		import atexit
+		import threading
+		with self.lock:
+			if self.thread == None:
+				self.thread = threading.Thread(target=self.run,name="clueless-log",daemon=True)
+				self.thread.start()
+				atexit.register(self.close)
+
+	# Blocks until every record queued so far is on disk
+	def flush(self):
+		import threading
+		if self.thread != None:
+			done = threading.Event()
+			self.queue.put(done)
+			done.wait()
+
+	# Writes out what is left and stops the writer thread
+	def close(self):
+		if self.thread != None:
+			self.queue.put(None)
+			self.thread.join()
+			self.thread = None
+
+	# Writer thread loop
+	def run(self):
+		import queue
+		import threading
+		running = True
+		while running:
+			batch = [self.queue.get()]
+			while len(batch) < LOG_BATCH:
+				try:
+					batch.append(self.queue.get_nowait())
+				except queue.Empty:
+					break
+			lines = []
+			waiters = []
+			for record in batch:
+				if record == None:
+					running = False
+				elif isinstance(record,threading.Event):
+					waiters.append(record)
+				else:
+					stamp, level, prefix, msg = record
+					lines.append("%s.%03d %-7s %s%s\n" % (time.strftime("%Y-%m-%d %H:%M:%S",time.localtime(stamp)),int(stamp * 1000) % 1000,LOG_LEVEL_NAMES.get(level,level),prefix,msg))
+			if len(lines) > 0:
+				self.write("".join(lines))
+			for done in waiters:
+				done.set()
+		if self.file != None:
+			self.file.close()
+			self.file = None
+
+	def write(self,text):
+		try:
+			if self.file != None and self.file.tell() >= self.maxBytes:
+				self.rotate()
+			if self.file == None:
+				os.makedirs(os.path.dirname(self.path),exist_ok=True)
+				self.file = open(self.path,'a')
+			self.file.write(text)
+			self.file.flush()
+		except OSError as err:
+			sys.stderr.write("could not write to %s: %s\n" % (self.path,err))
+
+	def rotate(self):
+		self.file.close()
+		self.file = None
+		for idx in range(self.backups - 1,0,-1):
+			if os.path.exists("%s.%d" % (self.path,idx)):
+				os.replace("%s.%d" % (self.path,idx),"%s.%d" % (self.path,idx + 1))
+		if self.backups > 0:
+			os.replace(self.path,"%s.1" % self.path)
+		else:
+			os.remove(self.path)
+
+# The sink shared by every Logger of the process
+SHARED_SINK = None
+
+# Returns the process-wide LogSink, creating it on first use
+def getLogSink():
+	global SHARED_SINK
+	if SHARED_SINK == None:
+		SHARED_SINK = LogSink()
+	return SHARED_SINK
+
 # Define and initialize a logger object.
-# There will be only one logger for each python file.
+# Loggers are cheap handles on the process-wide LogSink, every game
+# creates its own. Context fields (ie. game=<gameId>, player=<playerId>)
+# are prepended to every message, see bind().
+# Messages below the level of the Logger are dropped. The message is only
+# formatted with its arguments once it passed the level check, so hot
+# paths should pass them separately:
+#     logger.debug("getting choices for %s",room)
 # Log files will be pushed to /opt/clueless/log/backend.log
 class Logger:
-	def __init__(self):
-		if not DEBUG:
-			self.file = open(LOG_FILE,'w+')
-	def log(self,msg):
+	def __init__(self,sink=None,level=LOG_LEVEL,**context):
+		self.sink = sink
+		self.level = level
+		self.context = context
+		self.prefix = ""
+		for key in context:
+			self.prefix += "[%s=%s] " % (key,context[key])
+
+	# Returns a new Logger on the same sink and level with extra context fields.
+	# A Logger that is off has no use for them, it is returned as is.
+	def bind(self,**context):
+		if self.level >= LOG_OFF:
+			return self
+		fields = dict(self.context)
+		fields.update(context)
+		return Logger(self.sink,self.level,**fields)
+
+	def setLevel(self,level):
+		self.level = level
+
+	# Returns True if messages of the level are logged
+	def isEnabledFor(self,level):
+		return level >= self.level
+
+	def emit(self,level,msg,args):
+		if args:
+			msg = msg % args
 		if DEBUG:
-			print(msg)
+			print(self.prefix + msg)
 		else:
-			self.file.write("%s\n" % msg)
+			if self.sink == None:
+				self.sink = getLogSink()
+			self.sink.put((time.time(),level,self.prefix,msg))
+
+	def debug(self,msg,*args):
+		if LOG_DEBUG >= self.level:
+			self.emit(LOG_DEBUG,msg,args)
+
+	def info(self,msg,*args):
+		if LOG_INFO >= self.level:
+			self.emit(LOG_INFO,msg,args)
+
+	def warning(self,msg,*args):
+		if LOG_WARNING >= self.level:
+			self.emit(LOG_WARNING,msg,args)
+
+	def error(self,msg,*args):
+		if LOG_ERROR >= self.level:
+			self.emit(LOG_ERROR,msg,args)
+
+	# Logs at the INFO level
+	def log(self,msg,*args):
+		if LOG_INFO >= self.level:
+			self.emit(LOG_INFO,msg,args)
+
+# Keeps per-player, per-channel version counters for the targeted senders.
+# Mutating processors bump the channels they may have changed, either for
+# a single player or for everyone. A sender asks whether the entry of a
+# player moved on since it was last sent; asking also marks it as sent.
+# A player that was never sent anything on a channel is always dirty.
+class DirtyTracker:
+	def __init__(self):
+		self.epochs = {}		# channel -> counter bumped for all players
+		self.versions = {}		# (channel,playerId) -> counter bumped for one player
+		self.sent = {}			# (channel,playerId) -> (epoch,version) last sent
+
+	# Marks the channels as changed for the player, or for every player
+	# if no playerId is given
+	def bump(self,channels,playerId=None):
+		for channel in channels:
+			if playerId == None:
+				self.epochs[channel] = self.epochs.get(channel,0) + 1
+			else:
+				key = (channel,playerId)
+				self.versions[key] = self.versions.get(key,0) + 1
+
+	# Returns True if the channel changed for the player since the last
+	# time it was checked, and records the current version as sent
+	def check(self,channel,playerId):
+		key = (channel,playerId)
+		current = (self.epochs.get(channel,0),self.versions.get(key,0))
+		if self.sent.get(key) == current:
+			return False
+		self.sent[key] = current
+		return True
+
+	# Returns the number of times the channel changed for every player
+	def getEpoch(self,channel):
+		return self.epochs.get(channel,0)
+
+	# Drops everything known about a player
+	def forget(self,playerId):
+		for channel in CHANNELS:
+			key = (channel,playerId)
+			self.versions.pop(key,None)
+			self.sent.pop(key,None)
+
+# The compact JSON encoder of the payloads
+PAYLOAD_ENCODER = None
+
+# Returns the payload encoded the way it is sent to the clients
+def encodePayload(payload):
+	global PAYLOAD_ENCODER
+	if PAYLOAD_ENCODER == None:
+		import json
+		PAYLOAD_ENCODER = json.JSONEncoder(separators=(",",":"))
+	return PAYLOAD_ENCODER.encode(payload).encode("utf-8")
+
+# A payload shared by every game and player that asks for it, so it is
+# built once and may never change. Its lists are held as tuples, and it
+# is encoded once, the first time it is asked for (see getEncoded()).
+class FrozenDict(dict):
+	def __init__(self,*args,**kwargs):
+		dict.__init__(self,*args,**kwargs)
+		self.encoded = None
+
+	# Returns the bytes of encodePayload() of the payload
+	def getEncoded(self):
+		if self.encoded == None:
+			self.encoded = encodePayload(self)
+		return self.encoded
+
+	def __reduce__(self):
+		return (FrozenDict,(dict(self),))
+
+	def frozen(self,*args,**kwargs):
+		raise BackException("shared payloads cannot be modified")
+
+	__setitem__ = frozen
+	__delitem__ = frozen
+	clear = frozen
+	pop = frozen
+	popitem = frozen
+	setdefault = frozen
+	update = frozen
 
 # Custom error and exception classes
 